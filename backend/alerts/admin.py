@@ -0,0 +1,20 @@
+from django.contrib import admin
+from .models import AlertMatch, SavedSearch
+
+# Register your models here.
+
+
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "name", "anchor", "frequency", "is_active", "last_notified_at")
+    search_fields = ("name", "query", "user__email")
+    list_filter = ("frequency", "is_active")
+    raw_id_fields = ("user", "place")
+    readonly_fields = ("anchor",)
+
+
+class AlertMatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "search", "job", "matched_at", "notified_at")
+    raw_id_fields = ("search", "job")
+
+admin.site.register(SavedSearch, SavedSearchAdmin)
+admin.site.register(AlertMatch, AlertMatchAdmin)
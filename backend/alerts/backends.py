@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class BaseAlertBackend:
+    """Delivers job alert digests; subclasses implement send()"""
+
+    def send(self, digests):
+        """Deliver ``digests``, dicts with user, searches and jobs keys"""
+        raise NotImplementedError
+
+
+class FileBackend(BaseAlertBackend):
+    """Append digests as JSON lines to one file per day under ``path``
+
+    Like Django's file email backend, for development and for handing
+    digests to a mailer that tails the directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.JOB_ALERTS_FILE_PATH)
+
+    def send(self, digests):
+        self.path.mkdir(parents=True, exist_ok=True)
+        filename = self.path / f"alerts-{timezone.now():%Y-%m-%d}.jsonl"
+        with open(filename, "a", encoding="utf-8") as stream:
+            for digest in digests:
+                stream.write(json.dumps(digest, default=str) + "\n")
+        return len(digests)
+
+
+def get_backend(path=None, **kwargs):
+    return import_string(path or settings.JOB_ALERTS_BACKEND)(**kwargs)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from .backends import get_backend
+from .models import AlertMatch, SavedSearch
+
+# How long a search waits between digests
+INTERVALS = {
+    "instant": timedelta(0),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+}
+
+
+def due_searches(now):
+    """Active searches with pending matches whose interval has passed"""
+    searches = SavedSearch.objects.filter(is_active=True, matches__notified_at__isnull=True).distinct()
+    return [
+        search for search in searches.select_related("user")
+        if search.last_notified_at is None or search.last_notified_at + INTERVALS[search.frequency] <= now
+    ]
+
+
+def digest(user, searches, matches):
+    return {
+        "user": {"id": user.pk, "email": user.email, "username": user.username},
+        "searches": [
+            {
+                "id": search.pk,
+                "name": str(search),
+                "jobs": [
+                    {
+                        "id": match.job_id,
+                        "slug": match.job.slug,
+                        "title": match.job.title,
+                        "company": match.job.company,
+                        "location": match.job.location,
+                        "matched_at": match.matched_at.isoformat(),
+                    }
+                    for match in matches if match.search_id == search.pk
+                ],
+            }
+            for search in searches
+            if any(match.search_id == search.pk for match in matches)
+        ],
+    }
+
+
+def send_digests(backend=None, now=None):
+    """Send one digest per user covering all of their due searches
+
+    Matches of jobs that were closed since are dropped. Matches are marked
+    notified in the same transaction that hands the digests to the backend,
+    so a failing backend leaves them pending. Returns the number of digests.
+    """
+    backend = backend or get_backend()
+    now = now or timezone.now()
+    searches = due_searches(now)
+    if not searches:
+        return 0
+
+    with transaction.atomic():
+        pending = list(
+            AlertMatch.objects.filter(search__in=searches, notified_at__isnull=True)
+            .select_related("job").order_by("-matched_at")
+        )
+        matches = [match for match in pending if match.job.is_active and match.job.status == "published"]
+        by_user = {}
+        for search in searches:
+            by_user.setdefault(search.user, []).append(search)
+        digests = []
+        for user, user_searches in by_user.items():
+            search_ids = {search.pk for search in user_searches}
+            user_matches = [match for match in matches if match.search_id in search_ids]
+            if user_matches:
+                digests.append(digest(user, user_searches, user_matches))
+        # Only the matches read above: ones the matcher adds meanwhile wait
+        # for the next digest
+        AlertMatch.objects.filter(pk__in=[match.pk for match in pending]).update(notified_at=now)
+        SavedSearch.objects.filter(pk__in=[search.pk for search in searches]).update(last_notified_at=now)
+        backend.send(digests)
+    return len(digests)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from alerts.backends import get_backend
+from alerts.digests import send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Send a digest of pending saved-search matches to every user with a "
+        "search that is due. Matches are recorded by consume_job_events "
+        "alerts --handler alerts.matching.handle_job_events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", default=None, help="Dotted path, defaults to JOB_ALERTS_BACKEND")
+
+    def handle(self, *args, **options):
+        sent = send_digests(backend=get_backend(options["backend"]))
+        self.stdout.write(self.style.SUCCESS(f"{sent} digests sent"))
@@ -0,0 +1,106 @@
+from django.db import router
+from jobs.models import Job
+from jobs.skills import canonical_skill
+from .models import AlertMatch, SavedSearch
+from .tasks import send_alert_digests
+
+# Outbox events after which a job may newly match a search
+MATCH_EVENTS = {"created", "activated", "updated"}
+
+
+def job_keys(job):
+    """Every anchor a search matching ``job`` could be indexed under"""
+    keys = {"*", f"job_type:{job.job_type}", f"employement_type:{job.employement_type}"}
+    if job.experience_level:
+        keys.add(f"experience_level:{job.experience_level}")
+    if job.place_id:
+        keys.add(f"place:{job.place_id}")
+    keys.update(f"skill:{skill}" for skill in filter(None, map(canonical_skill, job.skills or [])))
+    return keys
+
+
+def matches(search, job):
+    """Whether ``job`` satisfies every criterion of ``search``"""
+    for field in ["job_type", "employement_type", "experience_level"]:
+        if getattr(search, field) and getattr(search, field) != getattr(job, field):
+            return False
+
+    if search.place_id:
+        if search.place_id != job.place_id:
+            return False
+    elif search.location and search.location.casefold() not in job.location.casefold():
+        return False
+
+    if search.min_experience is not None and job.experience < search.min_experience:
+        return False
+    if search.max_experience is not None and job.experience > search.max_experience:
+        return False
+
+    # Same overlap rule as the job list's ?min_salary=
+    if search.min_salary is not None:
+        if job.salary_max is not None:
+            if job.salary_max < search.min_salary:
+                return False
+        elif job.salary_min is None:
+            return False
+
+    job_skills = {canonical_skill(skill) for skill in job.skills or []}
+    if not {canonical_skill(skill) for skill in search.skills or []} <= job_skills:
+        return False
+
+    if search.query:
+        text = " ".join(
+            [job.title, job.company, job.location, job.description, *map(str, job.skills or [])]
+        ).casefold()
+        if not all(term in text for term in search.query.casefold().split()):
+            return False
+    return True
+
+
+def match_jobs(jobs):
+    """Record an AlertMatch for each active saved search each job satisfies
+
+    Candidates come from one query on the anchor index, so a job is only
+    checked against the searches whose most selective predicate it meets.
+    Returns the number of new matches; ones already recorded are skipped.
+    """
+    jobs = [job for job in jobs if job.is_active and job.status == "published"]
+    if not jobs:
+        return 0
+    keys = set().union(*map(job_keys, jobs))
+    candidates = {}
+    for search in SavedSearch.objects.filter(is_active=True, anchor__in=keys):
+        candidates.setdefault(search.anchor, []).append(search)
+
+    found = []
+    for job in jobs:
+        for key in job_keys(job):
+            for search in candidates.get(key, []):
+                if search.user_id != job.employer_id and matches(search, job):
+                    found.append(AlertMatch(search=search, job=job))
+    if not found:
+        return 0
+
+    # Re-published or edited jobs keep their earlier matches
+    recorded = set(
+        AlertMatch.objects.filter(
+            job__in={match.job_id for match in found}, search__in={match.search_id for match in found}
+        ).values_list("search_id", "job_id")
+    )
+    new = [match for match in found if (match.search_id, match.job_id) not in recorded]
+    AlertMatch.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+def handle_job_events(events, stdout):
+    """consume_job_events handler for the "alerts" consumer
+
+        manage.py consume_job_events alerts --handler alerts.matching.handle_job_events --follow
+    """
+    job_ids = {event.job_id for event in events if event.event_type in MATCH_EVENTS}
+    jobs = Job.objects.using(router.db_for_write(Job)).filter(pk__in=job_ids)
+    count = match_jobs(jobs)
+    if count:
+        stdout.write(f"{count} new alert matches")
+        # Instant alerts go out now; send_digests skips searches not yet due
+        send_alert_digests.enqueue()
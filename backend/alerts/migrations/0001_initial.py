@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 09:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0018_job_event_outbox'),
+        ('locations', '0002_load_gazetteer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('query', models.CharField(blank=True, max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('job_type', models.CharField(blank=True, choices=[('onsite', 'Onsite'), ('remote', 'Remote'), ('hybrid', 'Hybrid')], max_length=20)),
+                ('employement_type', models.CharField(blank=True, choices=[('full_time', 'Full_Time'), ('part_time', 'Part_Time'), ('internship', 'Internship'), ('freelance', 'Freelance'), ('contract', 'Contract'), ('permanent', 'Permanent'), ('temporary', 'Temporary')], max_length=25)),
+                ('experience_level', models.CharField(blank=True, choices=[('fresher', 'Fresher'), ('entry_level', 'Entry_level'), ('junior', 'Junior'), ('mid', 'Mid'), ('senior', 'Senior'), ('lead', 'Lead'), ('manager', 'Manager'), ('director', 'Director'), ('executive', 'Executive')], max_length=20)),
+                ('min_experience', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_experience', models.PositiveIntegerField(blank=True, null=True)),
+                ('min_salary', models.PositiveIntegerField(blank=True, null=True)),
+                ('skills', models.JSONField(blank=True, default=list)),
+                ('frequency', models.CharField(choices=[('instant', 'Instant'), ('daily', 'Daily'), ('weekly', 'Weekly')], default='daily', max_length=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('anchor', models.CharField(editable=False, max_length=150)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_notified_at', models.DateTimeField(blank=True, null=True)),
+                ('place', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='saved_searches', to='locations.location')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AlertMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matched_at', models.DateTimeField(auto_now_add=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_matches', to='jobs.job')),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='alerts.savedsearch')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['anchor', 'is_active'], name='alerts_search_anchor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertmatch',
+            index=models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['search'], name='alerts_match_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='alertmatch',
+            constraint=models.UniqueConstraint(fields=('search', 'job'), name='alerts_match_search_job_uniq'),
+        ),
+    ]
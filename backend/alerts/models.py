@@ -0,0 +1,105 @@
+from django.db import models
+from django.db.models import Count
+from jobs.models import Job, Skill
+from jobs.skills import canonical_skill
+from locations.geocoding import geocode
+from locations.models import Location
+from users.models import User
+
+# Create your models here.
+
+
+class SavedSearch(models.Model):
+    """A jobseeker's job search, re-run against newly published jobs
+
+    The criteria are the JobSearchSerializer fields. ``anchor`` is the
+    search's most selective equality predicate, the inverted index key
+    alerts.matching uses to find candidate searches for a job.
+    """
+    FREQUENCY_CHOICES = [
+        ("instant", "Instant"),
+        ("daily", "Daily"),
+        ("weekly", "Weekly"),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_searches")
+    name = models.CharField(max_length=100, blank=True)
+    query = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    # Geocoded from location; None when it isn't a known place
+    place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name="saved_searches")
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES, blank=True)
+    employement_type = models.CharField(max_length=25, choices=Job.EMPLOYMENT_TYPES, blank=True)
+    experience_level = models.CharField(max_length=20, choices=Job.EXPERIENCE_LEVELS, blank=True)
+    min_experience = models.PositiveIntegerField(null=True, blank=True)
+    max_experience = models.PositiveIntegerField(null=True, blank=True)
+    min_salary = models.PositiveIntegerField(null=True, blank=True)
+    skills = models.JSONField(default=list, blank=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default="daily")
+    is_active = models.BooleanField(default=True)
+    anchor = models.CharField(max_length=150, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            # Candidate lookup: active searches under a set of anchors
+            models.Index(fields=["anchor", "is_active"], name="alerts_search_anchor_idx"),
+        ]
+    
+    def __str__(self):
+        return self.name or f"Saved search {self.pk}"
+    
+    def save(self, *args, **kwargs):
+        place = geocode(self.location) if self.location else None
+        self.place_id = place.id if place else None
+        self.anchor = self.index_key()
+        super().save(*args, **kwargs)
+    
+    def index_key(self):
+        """The most selective predicate a matching job must satisfy
+
+        Of the search's skills, the one the fewest jobs list when the search
+        is saved (skills no job lists yet count as zero, ties go
+        alphabetically); then the place, then experience_level,
+        employement_type and job_type. Searches with only free-text or range
+        criteria go under "*" and are checked against every published job.
+        """
+        skills = sorted(set(filter(None, (canonical_skill(skill) for skill in self.skills or []))))
+        if len(skills) > 1:
+            job_counts = dict(
+                Skill.objects.filter(canonical_name__in=skills)
+                .annotate(job_count=Count("job_skills"))
+                .values_list("canonical_name", "job_count")
+            )
+            skills.sort(key=lambda skill: job_counts.get(skill, 0))
+        if skills:
+            return f"skill:{skills[0]}"
+        if self.place_id:
+            return f"place:{self.place_id}"
+        for field in ["experience_level", "employement_type", "job_type"]:
+            if getattr(self, field):
+                return f"{field}:{getattr(self, field)}"
+        return "*"
+
+
+class AlertMatch(models.Model):
+    """A job that matched a saved search, waiting for the next digest"""
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name="matches")
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="alert_matches")
+    matched_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["search", "job"], name="alerts_match_search_job_uniq"),
+        ]
+        indexes = [
+            # Pending matches of the searches due for a digest
+            models.Index(
+                fields=["search"], condition=models.Q(notified_at__isnull=True), name="alerts_match_pending_idx"
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.search_id} -> {self.job_id}"
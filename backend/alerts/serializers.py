@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from jobs.serializers import JobSearchSerializer
+from .models import SavedSearch
+
+
+class SavedSearchSerializer(JobSearchSerializer, serializers.ModelSerializer):
+    """A saved search; its criteria are validated as JobSearchSerializer's"""
+    # Bounded like the model's columns, which JobSearchSerializer isn't
+    query = serializers.CharField(required=False, allow_blank=True, max_length=255)
+    location = serializers.CharField(required=False, allow_blank=True, max_length=255)
+    skills = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+    # Here is_active switches the alert on and off, not a job filter
+    is_active = None
+    pending_matches = serializers.IntegerField(read_only=True, default=0)
+    
+    class Meta:
+        model = SavedSearch
+        fields = [
+            "id", "name", *[name for name in JobSearchSerializer._declared_fields if name != "is_active"],
+            "frequency", "is_active", "pending_matches", "created_at", "last_notified_at",
+        ]
+        read_only_fields = ["created_at", "last_notified_at"]
+    
+    def validate(self, data):
+        min_experience = data.get("min_experience", getattr(self.instance, "min_experience", None))
+        max_experience = data.get("max_experience", getattr(self.instance, "max_experience", None))
+        if min_experience is not None and max_experience is not None and min_experience > max_experience:
+            raise serializers.ValidationError({
+                "max_experience": "max_experience must not be less than min_experience"
+            })
+        return data
@@ -0,0 +1,7 @@
+from django.tasks import task
+from .digests import send_digests
+
+
+@task
+def send_alert_digests():
+    return send_digests()
@@ -0,0 +1,112 @@
+from django.test import SimpleTestCase, TestCase
+
+from jobs.models import Job
+from users.models import User
+from .matching import match_jobs, matches
+from .models import AlertMatch, SavedSearch
+
+
+def job(**fields):
+    fields = {
+        "title": "Backend Engineer",
+        "description": "Build APIs in Django",
+        "company": "Acme",
+        "location": "Lahore, Pakistan",
+        "experience_level": "mid",
+        "job_type": "onsite",
+        "employement_type": "full_time",
+        "experience": 3,
+        "skills": ["Python", "PostgreSQL"],
+        "status": "published",
+        **fields,
+    }
+    return Job(**fields)
+
+
+class IndexKeyTests(SimpleTestCase):
+    def test_rarest_criterion_wins(self):
+        search = SavedSearch(skills=["  Rust"], experience_level="senior", job_type="remote")
+        self.assertEqual(search.index_key(), "skill:rust")
+        search.skills = []
+        self.assertEqual(search.index_key(), "experience_level:senior")
+        search.place_id = 7
+        self.assertEqual(search.index_key(), "place:7")
+
+    def test_free_text_only(self):
+        self.assertEqual(SavedSearch(query="python", min_salary=100000).index_key(), "*")
+        self.assertEqual(SavedSearch(skills=[" "]).index_key(), "*")
+
+
+class SkillIndexKeyTests(TestCase):
+    def test_least_listed_skill_wins(self):
+        employer = User.objects.create_user("employer@example.com", password="x", username="employer")
+        job(employer=employer, slug="a", skills=["Python", "Django"]).save()
+        job(employer=employer, slug="b", skills=["Python", "Django", "Celery"]).save()
+        job(employer=employer, slug="c", skills=["Python"]).save()
+
+        self.assertEqual(SavedSearch(skills=["python", "Django"]).index_key(), "skill:django")
+        self.assertEqual(SavedSearch(skills=["Celery", "Django", "Python"]).index_key(), "skill:celery")
+        # No job lists it yet
+        self.assertEqual(SavedSearch(skills=["Python", "Rust"]).index_key(), "skill:rust")
+
+
+class MatchesTests(SimpleTestCase):
+    def test_equality_criteria(self):
+        self.assertTrue(matches(SavedSearch(job_type="onsite", experience_level="mid"), job()))
+        self.assertFalse(matches(SavedSearch(job_type="remote"), job()))
+
+    def test_location(self):
+        self.assertTrue(matches(SavedSearch(location="lahore"), job()))
+        self.assertFalse(matches(SavedSearch(location="Karachi"), job()))
+        self.assertFalse(matches(SavedSearch(location="Lahore", place_id=1), job(place_id=2)))
+
+    def test_experience_range(self):
+        self.assertTrue(matches(SavedSearch(min_experience=2, max_experience=5), job()))
+        self.assertFalse(matches(SavedSearch(min_experience=4), job()))
+        self.assertFalse(matches(SavedSearch(max_experience=2), job()))
+
+    def test_salary_overlap(self):
+        search = SavedSearch(min_salary=100000)
+        self.assertTrue(matches(search, job(salary_min=80000, salary_max=120000)))
+        self.assertTrue(matches(search, job(salary_min=150000)))
+        self.assertFalse(matches(search, job(salary_min=50000, salary_max=80000)))
+        self.assertFalse(matches(search, job()))
+
+    def test_skills_ignore_case(self):
+        self.assertTrue(matches(SavedSearch(skills=["python", " postgresql "]), job()))
+        self.assertFalse(matches(SavedSearch(skills=["python", "go"]), job()))
+
+    def test_query_terms(self):
+        self.assertTrue(matches(SavedSearch(query="django acme"), job()))
+        self.assertTrue(matches(SavedSearch(query="postgresql"), job()))
+        self.assertFalse(matches(SavedSearch(query="django rails"), job()))
+
+
+class MatchJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user("employer@example.com", password="x", username="employer")
+        cls.seeker = User.objects.create_user("seeker@example.com", password="x", username="seeker")
+
+    def test_records_matches_once(self):
+        wanted = SavedSearch.objects.create(user=self.seeker, skills=["Python"])
+        SavedSearch.objects.create(user=self.seeker, skills=["Go"])
+        SavedSearch.objects.create(user=self.seeker, skills=["Python"], is_active=False)
+        posted = job(employer=self.employer)
+        posted.save()
+
+        self.assertEqual(match_jobs([posted]), 1)
+        # Already recorded
+        self.assertEqual(match_jobs([posted]), 0)
+        self.assertEqual(list(AlertMatch.objects.values_list("search", "job")), [(wanted.pk, posted.pk)])
+
+    def test_skips_own_and_unpublished_jobs(self):
+        SavedSearch.objects.create(user=self.employer, query="backend")
+        SavedSearch.objects.create(user=self.seeker, query="backend")
+        own = job(employer=self.employer)
+        own.save()
+        draft = job(employer=self.seeker, title="Backend Developer", status="draft")
+        draft.save()
+
+        self.assertEqual(match_jobs([own, draft]), 1)
+        self.assertEqual(AlertMatch.objects.get().job, own)
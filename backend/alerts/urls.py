@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import SavedSearchViewSet
+
+router = DefaultRouter()
+router.register(r'saved-searches', SavedSearchViewSet, basename='saved-search')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,39 @@
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from django.db.models import Count, Q
+from jobs.paginations import JobPagination
+from jobs.serializers import JobListSerializer
+from jobs.models import Job
+from .models import SavedSearch
+from .serializers import SavedSearchSerializer
+
+# Create your views here.
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """The requesting user's saved searches and the jobs they matched"""
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return (
+            SavedSearch.objects.filter(user=self.request.user)
+            .annotate(pending_matches=Count("matches", filter=Q(matches__notified_at__isnull=True)))
+            .order_by("-created_at")
+        )
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    @action(detail=True, methods=["get"])
+    def jobs(self, request, pk=None):
+        """Active jobs this search matched, newest match first"""
+        search = self.get_object()
+        queryset = (
+            Job.objects.filter(alert_matches__search=search, is_active=True)
+            .order_by("-alert_matches__matched_at")
+        )
+        
+        paginator = JobPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = JobListSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import Category
 
 # Register your models here.
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "slug", "parent", "depth", "position", "job_count")
+    search_fields = ("name", "slug")
+    list_filter = ("depth",)
+    prepopulated_fields = {"slug": ("name",)}
+    readonly_fields = ("depth", "job_count")
+
+admin.site.register(Category, CategoryAdmin)
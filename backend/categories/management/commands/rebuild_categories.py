@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from categories.models import Category, CategoryClosure
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the category closure table and depths from the parent links, "
+        "then recount active jobs per category. Category and Job saves keep "
+        "both current; run this after raw loads or bulk job updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--counts-only", action="store_true", help="Only recount jobs")
+
+    def handle(self, *args, **options):
+        if not options["counts_only"]:
+            with transaction.atomic():
+                links, depths = self.rebuild_closure()
+            self.stdout.write(self.style.SUCCESS(f"{links} closure rows, {depths} depths fixed"))
+
+        changed = Category.objects.rebuild_job_counts()
+        self.stdout.write(self.style.SUCCESS(f"{changed} category counts fixed"))
+
+    def rebuild_closure(self):
+        parents = dict(Category.objects.values_list("id", "parent_id"))
+        rows = []
+        depths = {}
+        for category_id in parents:
+            # Walk up to the root; the seen set guards against cycles
+            ancestor_id, depth, seen = category_id, 0, set()
+            while ancestor_id is not None and ancestor_id not in seen:
+                seen.add(ancestor_id)
+                rows.append(CategoryClosure(ancestor_id=ancestor_id, descendant_id=category_id, depth=depth))
+                ancestor_id, depth = parents.get(ancestor_id), depth + 1
+            depths[category_id] = depth - 1
+
+        CategoryClosure.objects.all().delete()
+        CategoryClosure.objects.bulk_create(rows, batch_size=5000)
+
+        changed = []
+        for category in Category.objects.only("id", "depth"):
+            if category.depth != depths[category.pk]:
+                category.depth = depths[category.pk]
+                changed.append(category)
+        Category.objects.bulk_update(changed, ["depth"])
+        return len(rows), len(changed)
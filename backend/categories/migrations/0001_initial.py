@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-19 09:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(blank=True, max_length=120, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('depth', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('job_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='categories.category')),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+                'ordering': ['depth', 'position', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='categories.category')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='categories.category')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('parent', 'name'), name='categories_category_parent_name_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='categoryclosure',
+            index=models.Index(fields=['descendant', 'ancestor'], name='categories_closure_desc_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='categoryclosure',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='categories_closure_pair_uniq'),
+        ),
+    ]
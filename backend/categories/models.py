@@ -1,3 +1,183 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils.text import slugify
 
 # Create your models here.
+
+
+class CategoryQuerySet(models.QuerySet):
+    def subtree(self, category):
+        """``category`` and all of its descendants"""
+        return self.filter(ancestor_links__ancestor=category)
+
+    def ancestors(self, category):
+        """Root-first path down to ``category``, itself included"""
+        return self.filter(descendant_links__descendant=category).order_by("depth")
+
+    def adjust_job_counts(self, deltas):
+        """Add ``{category_id: delta}`` to each category and all its ancestors
+
+        One UPDATE per changed category; a None key (uncategorized or
+        inactive job) is ignored.
+        """
+        for category_id, delta in deltas.items():
+            if category_id is not None and delta:
+                self.filter(descendant_links__descendant_id=category_id).update(
+                    job_count=models.F("job_count") + delta
+                )
+
+    def rebuild_job_counts(self):
+        """Recount active jobs per subtree from scratch; returns rows changed
+
+        For data written by paths that bypass Job signals (bulk imports,
+        queryset updates) or to repair drift.
+        """
+        from jobs.models import Job
+        direct = dict(
+            Job.objects.filter(is_active=True, category__isnull=False)
+            .order_by()
+            .values("category")
+            .annotate(total=models.Count("id"))
+            .values_list("category", "total")
+        )
+        totals = {}
+        for ancestor_id, descendant_id in CategoryClosure.objects.values_list("ancestor_id", "descendant_id"):
+            totals[ancestor_id] = totals.get(ancestor_id, 0) + direct.get(descendant_id, 0)
+
+        changed = []
+        for category in self.only("id", "job_count"):
+            if category.job_count != totals.get(category.pk, 0):
+                category.job_count = totals.get(category.pk, 0)
+                changed.append(category)
+        self.bulk_update(changed, ["job_count"])
+        return len(changed)
+
+
+class Category(models.Model):
+    """A node of the job category tree
+
+    Every ancestor/descendant pair is stored in CategoryClosure, so a whole
+    subtree is one indexed join. ``job_count`` is the number of active jobs
+    in this category and all of its descendants, kept up to date by the
+    Job signals in jobs.signals.
+    """
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=120, unique=True, blank=True)
+    parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, blank=True, related_name="children")
+    description = models.TextField(blank=True)
+    # Order among siblings
+    position = models.PositiveIntegerField(default=0)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    job_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CategoryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "categories"
+        ordering = ["depth", "position", "name"]
+        constraints = [
+            models.UniqueConstraint(fields=["parent", "name"], name="categories_category_parent_name_uniq"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if self.pk and self.parent_id and (
+            self.parent_id == self.pk
+            or CategoryClosure.objects.filter(ancestor_id=self.pk, descendant_id=self.parent_id).exists()
+        ):
+            raise ValidationError({"parent": "A category can't be moved under itself or its descendants"})
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = self.unique_slug()
+
+        created = self._state.adding
+        previous_parent, previous_depth = None, 0
+        if not created:
+            previous_parent, previous_depth = Category.objects.filter(pk=self.pk).values_list("parent_id", "depth").get()
+        moved = not created and previous_parent != self.parent_id
+        if moved:
+            self.clean()
+        self.depth = self.parent.depth + 1 if self.parent_id else 0
+
+        if not created and kwargs.get("update_fields") is None:
+            # job_count only changes through relative UPDATEs; never write
+            # back the possibly stale copy held by this instance
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "job_count"
+            ]
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                CategoryClosure.objects.bulk_create(
+                    [CategoryClosure(ancestor_id=self.pk, descendant_id=self.pk, depth=0)]
+                    + [
+                        CategoryClosure(ancestor_id=ancestor_id, descendant_id=self.pk, depth=depth + 1)
+                        for ancestor_id, depth in CategoryClosure.objects.filter(
+                            descendant_id=self.parent_id
+                        ).values_list("ancestor_id", "depth")
+                    ]
+                )
+            elif moved:
+                self.move_subtree(previous_parent, self.depth - previous_depth)
+
+    def unique_slug(self):
+        """slugify(name), numbered when another category already has it"""
+        base = slugify(self.name) or "category"
+        slug, number = base, 2
+        while Category.objects.filter(slug=slug).exclude(pk=self.pk).exists():
+            slug, number = f"{base}-{number}", number + 1
+        return slug
+
+    def move_subtree(self, previous_parent, depth_change):
+        """Re-link this subtree's closure rows after a parent change
+
+        Links from the old ancestors are dropped and the cross product of
+        the new ancestors and the subtree is inserted; depths and the old
+        and new ancestors' job counts follow.
+        """
+        subtree = list(
+            CategoryClosure.objects.filter(ancestor_id=self.pk).values_list("descendant_id", "depth")
+        )
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        job_count = Category.objects.filter(pk=self.pk).values_list("job_count", flat=True).get()
+
+        Category.objects.adjust_job_counts({previous_parent: -job_count})
+        CategoryClosure.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+        CategoryClosure.objects.bulk_create([
+            CategoryClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + depth + 1)
+            for ancestor_id, ancestor_depth in CategoryClosure.objects.filter(
+                descendant_id=self.parent_id
+            ).values_list("ancestor_id", "depth")
+            for descendant_id, depth in subtree
+        ])
+        Category.objects.adjust_job_counts({self.parent_id: job_count})
+
+        # The node itself was saved with its new depth
+        Category.objects.filter(pk__in=subtree_ids).exclude(pk=self.pk).update(
+            depth=models.F("depth") + depth_change
+        )
+
+
+class CategoryClosure(models.Model):
+    """One row per (ancestor, descendant) pair, (node, node, 0) included"""
+    ancestor = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="descendant_links")
+    descendant = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="ancestor_links")
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            # Also the index for "descendants of X"
+            models.UniqueConstraint(fields=["ancestor", "descendant"], name="categories_closure_pair_uniq"),
+        ]
+        indexes = [
+            # Ancestors of X, e.g. breadcrumbs and count propagation
+            models.Index(fields=["descendant", "ancestor"], name="categories_closure_desc_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
@@ -0,0 +1,56 @@
+from rest_framework import serializers
+from .models import Category
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    parent = serializers.SlugRelatedField(
+        slug_field="slug", queryset=Category.objects.all(), required=False, allow_null=True
+    )
+    
+    class Meta:
+        model = Category
+        fields = ["id", "name", "slug", "parent", "description", "position", "depth", "job_count"]
+        read_only_fields = ["depth", "job_count"]
+    
+    def validate(self, data):
+        """Reject moving a category under itself or one of its descendants"""
+        parent = data.get("parent")
+        if self.instance and parent and Category.objects.subtree(self.instance).filter(pk=parent.pk).exists():
+            raise serializers.ValidationError({
+                "parent": "A category can't be moved under itself or its descendants"
+            })
+        return data
+
+
+class CategoryDetailSerializer(CategorySerializer):
+    ancestors = serializers.SerializerMethodField()
+    children = serializers.SerializerMethodField()
+    
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ["ancestors", "children"]
+    
+    def get_ancestors(self, obj):
+        """Breadcrumbs from the root down to the parent"""
+        return list(
+            Category.objects.ancestors(obj).exclude(pk=obj.pk).values("id", "name", "slug")
+        )
+    
+    def get_children(self, obj):
+        return list(obj.children.values("id", "name", "slug", "job_count"))
+
+
+def build_tree(categories, hide_empty=False):
+    """Nest category dicts (ordered parents first) under their parents"""
+    nodes = {}
+    roots = []
+    for category in categories:
+        if hide_empty and not category["job_count"]:
+            continue
+        node = {**category, "children": []}
+        nodes[node["id"]] = node
+        parent_id = node.pop("parent_id")
+        if parent_id is None:
+            roots.append(node)
+        elif parent_id in nodes:
+            nodes[parent_id]["children"].append(node)
+    return roots
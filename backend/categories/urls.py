@@ -1,8 +1,10 @@
-from django.urls import path
-from django.conf.urls.static import static
-from . import views
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import CategoryViewSet
 
-urlpatterns = [
-    # path('', views.home, name='home'),
+router = DefaultRouter()
+router.register(r'categories', CategoryViewSet, basename='category')
 
+urlpatterns = [
+    path('', include(router.urls)),
 ]
@@ -1,3 +1,61 @@
-from django.shortcuts import render
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db.models import Q
+from django.utils import timezone
+from jobs.paginations import JobPagination
+from jobs.serializers import JobListSerializer
+from jobs.models import Job
+from .models import Category
+from .serializers import CategorySerializer, CategoryDetailSerializer, build_tree
 
 # Create your views here.
+
+class CategoryViewSet(viewsets.ModelViewSet):
+    """Category tree; anyone can browse, staff manage it"""
+    queryset = Category.objects.all()
+    lookup_field = "slug"
+    
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return CategoryDetailSerializer
+        return CategorySerializer
+    
+    def get_permissions(self):
+        if self.action in ["list", "retrieve", "jobs"]:
+            return [permissions.AllowAny()]
+        return [permissions.IsAdminUser()]
+    
+    def list(self, request, *args, **kwargs):
+        """The whole tree with active job counts, from one query
+
+        ?flat=true returns the nodes as a list instead; ?hide_empty=true
+        leaves out categories without active jobs.
+        """
+        hide_empty = request.query_params.get("hide_empty") in ["true", "1"]
+        if request.query_params.get("flat") in ["true", "1"]:
+            queryset = self.get_queryset().select_related("parent")
+            if hide_empty:
+                queryset = queryset.filter(job_count__gt=0)
+            return Response(CategorySerializer(queryset, many=True).data)
+        
+        categories = self.get_queryset().values(
+            "id", "name", "slug", "parent_id", "position", "depth", "job_count"
+        )
+        return Response(build_tree(categories, hide_empty=hide_empty))
+    
+    @action(detail=True, methods=["get"])
+    def jobs(self, request, slug=None):
+        """Active, unexpired jobs in this category or any of its descendants"""
+        category = self.get_object()
+        queryset = (
+            Job.objects.filter(is_active=True)
+            .filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=timezone.now()))
+            .in_category(category)
+            .order_by("-posted_date")
+        )
+        
+        paginator = JobPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = JobListSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
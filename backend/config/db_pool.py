@@ -0,0 +1,95 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def pool_metrics(alias="default", reset=True):
+    """Return wait time, in-use count and timeouts for a connection pool
+
+    Counters (requests, wait time, timeouts) are reset after reading when
+    ``reset`` is true, so every report covers the period since the last one.
+    Returns None when the alias is not pooled.
+    """
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+
+    stats = pool.pop_stats() if reset else pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+
+    return {
+        "pool_size": stats.get("pool_size", 0),
+        "pool_max": stats.get("pool_max", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "queued": stats.get("requests_queued", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / requests, 2) if requests else 0,
+        # psycopg_pool counts checkouts that failed, timeouts included
+        "timeouts": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def log_pool_metrics(alias, metrics):
+    """Default DB_POOL_METRICS_HOOK: one structured log line per report"""
+    logger.info("db pool %s", alias, extra={"db_alias": alias, "db_pool": metrics})
+
+
+def emit_pool_metrics(alias="default"):
+    metrics = pool_metrics(alias)
+    if metrics is not None:
+        import_string(settings.DB_POOL_METRICS_HOOK)(alias, metrics)
+    return metrics
+
+
+class PoolMetricsMiddleware:
+    """Report pool metrics through DB_POOL_METRICS_HOOK every DB_POOL_METRICS_INTERVAL seconds
+
+    Async capable; under ASGI only the periodic report runs in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.last_report = time.monotonic()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.report_due():
+            self.report()
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.report_due():
+            # Reading a pool may open it
+            await sync_to_async(self.report)()
+        return response
+
+    def report_due(self):
+        now = time.monotonic()
+        if now - self.last_report < settings.DB_POOL_METRICS_INTERVAL:
+            return False
+        self.last_report = now
+        return True
+
+    def report(self):
+        for alias in connections:
+            emit_pool_metrics(alias)
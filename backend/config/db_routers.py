@@ -0,0 +1,133 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from rest_framework.permissions import SAFE_METHODS
+
+# Reads only go to a replica inside a replica_reads() block, and never while
+# the client is pinned to the primary after one of its own writes.
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+PRIMARY_PIN_HEADER = "X-Primary-Pin"
+# Pins are signed and timestamped, so a client can't pin itself to the
+# primary for longer than REPLICA_STICKY_SECONDS after its last write
+_pin_signer = signing.TimestampSigner(salt="config.db_routers.primary_pin")
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Allow the router to send reads in this block to a replica"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Route opted-in reads to settings.DATABASE_REPLICAS, everything else to default"""
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and _replica_reads.get() and not _pinned_to_primary.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class PrimaryStickinessMiddleware:
+    """Pin a client to the primary for REPLICA_STICKY_SECONDS after it writes
+
+    The pin travels as a cookie for browser sessions and as the X-Primary-Pin
+    header (a signed token to echo back) for token-authenticated clients.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _pinned_to_primary.set(self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        # sync_to_async copies the context, so ORM calls in threads see the pin
+        token = _pinned_to_primary.set(self.is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        # ReplicaReadMixin marks POSTs that only read, see read_only_actions
+        writes = request.method not in SAFE_METHODS and not getattr(request, "is_read_only", False)
+        if writes and response.status_code < 400:
+            pin = _pin_signer.sign("primary")
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                pin,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+            response[PRIMARY_PIN_HEADER] = pin
+        return response
+
+    def is_pinned(self, request):
+        for pin in [request.headers.get(PRIMARY_PIN_HEADER), request.COOKIES.get(PRIMARY_PIN_COOKIE)]:
+            if not pin:
+                continue
+            try:
+                _pin_signer.unsign(pin, max_age=settings.REPLICA_STICKY_SECONDS)
+            except signing.BadSignature:
+                continue
+            return True
+        return False
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests of a DRF view from the read replicas
+
+    ViewSet actions listed in ``read_only_actions`` are treated as reads
+    whatever their method (a POST carrying a long list of ids, say): they
+    may use a replica and don't pin the client to the primary.
+    """
+
+    read_only_actions = ()
+
+    def reads_only(self, request):
+        if request.method in SAFE_METHODS:
+            return True
+        action = getattr(self, "action_map", {}).get(request.method.lower())
+        return action in self.read_only_actions
+
+    def dispatch(self, request, *args, **kwargs):
+        read_only = self.reads_only(request)
+        request.is_read_only = read_only
+        with replica_reads(read_only):
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import re
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from asgiref.sync import sync_to_async
+from django.core.paginator import AsyncPaginator, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def planner_estimate(queryset):
+    """PostgreSQL's row estimate for ``queryset``, or None when unavailable
+
+    An unfiltered table reads pg_class.reltuples (kept by ANALYZE and
+    autovacuum); anything else takes the top plan node's row estimate
+    from EXPLAIN, which plans the query without running it.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator and not query.is_sliced:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed once
+            return row[0] if row and row[0] >= 0 else None
+
+        sql, params = queryset.order_by().query.get_compiler(queryset.db).as_sql()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+_DATETIME = re.compile(r"^\d{4}-\d\d-\d\d[ T]\d\d:\d\d")
+
+
+def count_key(queryset):
+    """Cache key of ``queryset``'s count: its SQL, with datetimes bucketed
+
+    Listings filter on the current time (``expiry_date__gt=now``), so
+    every request compiles a new datetime parameter. Datetimes, and the
+    ISO strings some backends compile them to, are floored to
+    APPROXIMATE_COUNT_CACHE_TIMEOUT buckets so those requests share a key.
+    """
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    bucket = max(settings.APPROXIMATE_COUNT_CACHE_TIMEOUT, 1)
+    key_params = []
+    for param in params:
+        value = param
+        if isinstance(value, str) and _DATETIME.match(value):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        if isinstance(value, datetime):
+            param = ("datetime", int(value.timestamp() // bucket))
+        key_params.append(param)
+    return "approximate-count:" + hashlib.sha256(
+        f"{queryset.db}:{sql}:{key_params!r}".encode()
+    ).hexdigest()
+
+
+def approximate_count(queryset):
+    """Return (count, is_approximate) for ``queryset``
+
+    Above settings.APPROXIMATE_COUNT_THRESHOLD estimated rows the planner
+    estimate is returned as is; smaller or heavily filtered sets, and
+    databases without estimates, get an exact COUNT(*). Results for
+    filtered querysets are cached for APPROXIMATE_COUNT_CACHE_TIMEOUT
+    seconds, keyed by count_key, so a count can lag by up to two timeouts.
+    """
+    key = count_key(queryset)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    estimate = planner_estimate(queryset)
+    if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_THRESHOLD:
+        result = (estimate, True)
+    else:
+        result = (queryset.count(), False)
+    if queryset.query.where:
+        cache.set(key, result, settings.APPROXIMATE_COUNT_CACHE_TIMEOUT)
+    return result
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator whose count may be a planner estimate for large querysets
+
+    ``is_approximate`` tells whether ``count`` (and so ``num_pages``) is an
+    estimate. Used as DRF's django_paginator_class and as ModelAdmin.paginator.
+    """
+    is_approximate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return len(self.object_list)
+        count, self.is_approximate = approximate_count(self.object_list)
+        return count
+
+
+class ApproximateCountAsyncPaginator(AsyncPaginator):
+    """AsyncPaginator counterpart of ApproximateCountPaginator"""
+    is_approximate = False
+
+    async def acount(self):
+        if self._cache_acount is None:
+            if not hasattr(self.object_list, "query"):
+                return await super().acount()
+            self._cache_acount, self.is_approximate = await sync_to_async(approximate_count)(self.object_list)
+        return self._cache_acount
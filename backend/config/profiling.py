@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+# One profiled request at a time per process: tracemalloc is process-wide
+# and two samplers would slow each other's requests down
+_profiling = threading.Lock()
+
+
+def profile_index():
+    return Path(settings.PROFILING_ROOT) / "index.jsonl"
+
+
+def read_captures():
+    """Index entries of all captures, oldest first"""
+    index = profile_index()
+    if not index.exists():
+        return []
+    with index.open() as lines:
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+def read_stacks(capture):
+    """Collapsed stacks of one capture as a Counter of stack -> samples"""
+    stacks = Counter()
+    with (Path(settings.PROFILING_ROOT) / capture["file"]).open() as lines:
+        for line in lines:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds
+
+    Stacks are recorded in collapsed form, root first and joined by ";",
+    starting at ``root_frame`` (the frame that started the sampler), which
+    is what flamegraph.pl, speedscope and inferno read.
+    """
+
+    def __init__(self, interval, root_frame):
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.root_frame = root_frame
+        self.stacks = Counter()
+        self.labels = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = self.collapse(frame) if frame is not None else ""
+            if stack:
+                self.stacks[stack] += 1
+
+    def collapse(self, frame):
+        """The stack below root_frame, or "" when the thread isn't under it
+
+        An event loop thread runs other requests' coroutines too; only
+        samples passing through the profiled coroutine's frame count.
+        """
+        labels = []
+        while frame is not self.root_frame:
+            if frame is None:
+                return ""
+            labels.append(self.label(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def label(self, code):
+        # Per function, not per line, so captures aggregate cleanly
+        label = self.labels.get(code)
+        if label is None:
+            label = f"{code.co_qualname} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+
+def short_path(filename):
+    """``filename`` relative to the longest sys.path entry containing it"""
+    prefixes = [entry for entry in sys.path if entry and filename.startswith(entry + os.sep)]
+    if not prefixes:
+        return filename
+    return filename[len(max(prefixes, key=len)) + 1:]
+
+
+def is_staff_request(request):
+    """Whether a staff member sent ``request``, by session, token or JWT
+
+    Runs before the view, so API credentials are checked here with DRF's
+    authentication classes. request.user is left as it was.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    wrapped = Request(request)
+    for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication().authenticate(wrapped)
+        except APIException:
+            return False
+        if result is not None:
+            return result[0].is_staff
+    return False
+
+
+@contextmanager
+def sampling(root_frame):
+    """Stack-sample the current thread below ``root_frame`` during the block
+
+    Yields a dict holding started_at, and once the block exits duration,
+    peak (tracemalloc's peak traced memory, or None) and stacks.
+    """
+    result = {"started_at": timezone.now()}
+    tracing = settings.PROFILING_TRACEMALLOC and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    sampler = StackSampler(settings.PROFILING_INTERVAL / 1000, root_frame)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["duration"] = time.perf_counter() - start
+        sampler.stop()
+        result["peak"] = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        if tracing:
+            tracemalloc.stop()
+        result["stacks"] = sampler.stacks
+
+
+class ProfilingMiddleware:
+    """Stack-sample staff requests that ask for it, and a fraction of traffic
+
+    A staff request sent with an ``X-Profile: 1`` header is always
+    profiled and gets the capture's file name back in ``X-Profile-Capture``.
+    Other requests are profiled with probability PROFILING_SAMPLE_RATE.
+
+    A profiled request is stack-sampled every PROFILING_INTERVAL ms, with
+    the peak of tracemalloc's traced memory over the request when
+    PROFILING_TRACEMALLOC is on. The stacks are written in collapsed form
+    to PROFILING_ROOT/<view name>/<timestamp>.collapsed, and a summary line
+    is appended to PROFILING_ROOT/index.jsonl. manage.py request_profiles
+    lists and merges captures. A streaming response is profiled up to the
+    point its iterator is returned.
+
+    Under ASGI the event loop thread is sampled and only samples inside
+    the profiled request's coroutine are kept; work it hands to
+    sync_to_async threads isn't sampled, and the memory peak covers every
+    request in flight.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        requested = request.META.get(PROFILE_HEADER) == "1" and is_staff_request(request)
+        if not requested and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        if not _profiling.acquire(blocking=False):
+            return self.busy(self.get_response(request), requested)
+        try:
+            with sampling(sys._getframe()) as result:
+                response = self.get_response(request)
+            return self.finish(request, response, "header" if requested else "sample", result)
+        finally:
+            _profiling.release()
+
+    async def __acall__(self, request):
+        # Authenticating may query, so only requests asking for it pay the hop
+        requested = (
+            request.META.get(PROFILE_HEADER) == "1" and await sync_to_async(is_staff_request)(request)
+        )
+        if not requested and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return await self.get_response(request)
+        if not _profiling.acquire(blocking=False):
+            return self.busy(await self.get_response(request), requested)
+        try:
+            with sampling(sys._getframe()) as result:
+                response = await self.get_response(request)
+            return self.finish(request, response, "header" if requested else "sample", result)
+        finally:
+            _profiling.release()
+
+    def busy(self, response, requested):
+        if requested:
+            response["X-Profile-Capture"] = "busy"
+        return response
+
+    def finish(self, request, response, trigger, result):
+        try:
+            capture = self.save(request, response, trigger, result)
+        except OSError:
+            logger.exception("Could not save the profile of %s %s", request.method, request.path)
+            return response
+        if trigger == "header":
+            response["X-Profile-Capture"] = capture["file"]
+        return response
+
+    def save(self, request, response, trigger, result):
+        started_at, stacks = result["started_at"], result["stacks"]
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match else "unresolved"
+        root = Path(settings.PROFILING_ROOT)
+        file = f"{_UNSAFE.sub('_', endpoint)}/{started_at:%Y%m%d-%H%M%S-%f}-{os.getpid()}.collapsed"
+        (root / file).parent.mkdir(parents=True, exist_ok=True)
+        (root / file).write_text("".join(f"{stack} {count}\n" for stack, count in stacks.items()))
+
+        capture = {
+            "file": file,
+            "started_at": started_at.isoformat(),
+            "endpoint": endpoint,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "trigger": trigger,
+            "duration_ms": round(result["duration"] * 1000, 2),
+            "interval_ms": settings.PROFILING_INTERVAL,
+            "samples": sum(stacks.values()),
+            "peak_memory_bytes": result["peak"],
+        }
+        # One short write in append mode, so lines from several workers
+        # don't interleave
+        with profile_index().open("a") as index:
+            index.write(json.dumps(capture) + "\n")
+        return capture
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(Exception):
+    """The same query shape ran more often than allowed in one request (N+1)"""
+
+
+def fingerprint(sql):
+    """Reduce a query to its shape: literals and IN-list lengths are dropped"""
+    shape = _IN_LIST.sub("IN (...)", sql)
+    shape = _LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """Execute wrapper that counts, times and fingerprints every query"""
+
+    def __init__(self, repeat_threshold=None, raise_on_repeat=None):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.repeat_threshold = (
+            settings.SQL_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        )
+        self.raise_on_repeat = (
+            settings.SQL_REPEAT_RAISE if raise_on_repeat is None else raise_on_repeat
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            result = execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            shape = fingerprint(sql)
+            self.shapes[shape] += 1
+        # Only after a successful execute, so a database error isn't replaced
+        if self.raise_on_repeat and self.shapes[shape] > self.repeat_threshold:
+            raise RepeatedQueryError(
+                f"Query ran {self.shapes[shape]} times in one request "
+                f"(limit {self.repeat_threshold}): {shape}"
+            )
+        return result
+
+    @contextmanager
+    def record(self):
+        """Install the recorder on every configured database connection"""
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    def duplicates(self):
+        """Query shapes that ran more than once, most repeated first"""
+        return [
+            {
+                "fingerprint": hashlib.md5(shape.encode()).hexdigest()[:12],
+                "count": count,
+                "sql": shape[:300],
+            }
+            for shape, count in self.shapes.most_common()
+            if count > 1
+        ]
+
+    def server_timing(self):
+        duplicated = sum(count - 1 for count in self.shapes.values())
+        return (
+            f'db;desc="{self.count} queries";dur={self.duration * 1000:.2f}, '
+            f'db-dup;desc="{duplicated} duplicated"'
+        )
+
+    def report(self, request, response):
+        """Attach the Server-Timing header and log one structured record"""
+        response["Server-Timing"] = ", ".join(
+            value for value in (response.get("Server-Timing"), self.server_timing()) if value
+        )
+
+        match = getattr(request, "resolver_match", None)
+        logger.info(
+            "%s %s: %d queries in %.2f ms",
+            request.method, request.path, self.count, self.duration * 1000,
+            extra={
+                "sql": {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "status": response.status_code,
+                    "queries": self.count,
+                    "db_ms": round(self.duration * 1000, 2),
+                    "duplicates": self.duplicates()[:10],
+                },
+            },
+        )
+
+
+class QueryInstrumentationMiddleware:
+    """Record queries for every request, see QueryRecorder
+
+    Async capable, so native async views aren't adapted to sync for it.
+    The recorder is installed on the request's connection objects before
+    the view runs; sync_to_async ORM calls share them through the context.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        with recorder.record():
+            response = self.get_response(request)
+        recorder.report(request, response)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        with recorder.record():
+            response = await self.get_response(request)
+        recorder.report(request, response)
+        return response
+
+
+class QueryInstrumentationMixin:
+    """Per-view query instrumentation for DRF views
+
+    Views can tighten or loosen the repeated-query limit with
+    ``query_repeat_threshold``. Without QueryInstrumentationMiddleware the
+    mixin records and reports the view on its own.
+    """
+
+    query_repeat_threshold = None
+
+    def dispatch(self, request, *args, **kwargs):
+        recorder = getattr(request, "query_recorder", None)
+        if recorder is not None:
+            if self.query_repeat_threshold is not None:
+                recorder.repeat_threshold = self.query_repeat_threshold
+            return super().dispatch(request, *args, **kwargs)
+
+        recorder = QueryRecorder(repeat_threshold=self.query_repeat_threshold)
+        request.query_recorder = recorder
+        with recorder.record():
+            response = super().dispatch(request, *args, **kwargs)
+        recorder.report(request, response)
+        return response
@@ -11,8 +11,9 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,8 +51,11 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'categories',
+    'locations',
     'users',
     'jobs',
+    'alerts',
+    'taskqueue',
 ]
 
 
@@ -71,6 +75,11 @@ CORS_ALLOW_HEADERS = [
     'origin',
     'user-agent',
     'x-requested-with',
+    'x-primary-pin',
+]
+
+CORS_EXPOSE_HEADERS = [
+    'x-primary-pin',
 ]
 
 REST_FRAMEWORK = {
@@ -86,6 +95,7 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'config.query_instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -93,8 +103,94 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.profiling.ProfilingMiddleware',
 ]
 
+# Per-request SQL instrumentation
+# In DEBUG and under the test runner a query shape repeating more than
+# SQL_REPEAT_THRESHOLD times in one request raises RepeatedQueryError.
+SQL_REPEAT_THRESHOLD = config('SQL_REPEAT_THRESHOLD', default=10, cast=int)
+SQL_REPEAT_RAISE = config('SQL_REPEAT_RAISE', default=DEBUG or 'test' in sys.argv, cast=bool)
+
+# Per-job daily rollups (jobs.stats)
+# Counter increments are buffered per process and upserted into
+# JobDailyStats once this many (job, day) rows are pending, and at most
+# JOB_STATS_FLUSH_INTERVAL seconds after the first buffered increment.
+JOB_STATS_BATCH_SIZE = config('JOB_STATS_BATCH_SIZE', default=100, cast=int)
+JOB_STATS_FLUSH_INTERVAL = config('JOB_STATS_FLUSH_INTERVAL', default=10, cast=int)
+
+# Paginated counts (config.pagination)
+# Listings whose planner estimate reaches APPROXIMATE_COUNT_THRESHOLD rows
+# report the estimate instead of running COUNT(*); counts of filtered
+# listings are cached for APPROXIMATE_COUNT_CACHE_TIMEOUT seconds.
+APPROXIMATE_COUNT_THRESHOLD = config('APPROXIMATE_COUNT_THRESHOLD', default=10000, cast=int)
+APPROXIMATE_COUNT_CACHE_TIMEOUT = config('APPROXIMATE_COUNT_CACHE_TIMEOUT', default=30, cast=int)
+
+# Rendered job detail cache (jobs.detail_cache)
+# Keyed by job id and slug, dropped on Job save/delete; views/applicants
+# are read live on every hit.
+JOB_DETAIL_CACHE = config('JOB_DETAIL_CACHE', default='default')
+JOB_DETAIL_CACHE_TIMEOUT = config('JOB_DETAIL_CACHE_TIMEOUT', default=3600, cast=int)
+# Ids plus slugs accepted by /jobs/batch/, whose list entries share the cache
+JOB_BATCH_MAX_SIZE = config('JOB_BATCH_MAX_SIZE', default=300, cast=int)
+
+# Live job stream (jobs.stream)
+# Server-sent events at /async/jobs/stream/. Each process follows the job
+# outbox (woken by NOTIFY on PostgreSQL, otherwise polling every
+# JOB_STREAM_POLL_INTERVAL seconds); clients more than JOB_STREAM_BUFFER
+# messages behind are reset.
+JOB_STREAM_POLL_INTERVAL = config('JOB_STREAM_POLL_INTERVAL', default=5, cast=float)
+JOB_STREAM_HEARTBEAT = config('JOB_STREAM_HEARTBEAT', default=15, cast=int)
+JOB_STREAM_BUFFER = config('JOB_STREAM_BUFFER', default=100, cast=int)
+
+# Sitemaps and syndication feeds (jobs.feeds)
+# generate_feeds writes them to FEEDS_ROOT, published under FEEDS_URL;
+# job links point at the frontend on SITE_URL.
+SITE_URL = config('SITE_URL', default='http://localhost:3000')
+FEEDS_ROOT = config('FEEDS_ROOT', default=os.path.join(BASE_DIR, 'feeds'))
+FEEDS_URL = config('FEEDS_URL', default='http://localhost:8000/feeds/')
+FEEDS_CACHE_SECONDS = config('FEEDS_CACHE_SECONDS', default=3600, cast=int)
+
+# Admin job imports (jobs.tasks.import_job_feed)
+# Uploaded feeds wait under JOB_IMPORTS_ROOT for a task worker, which
+# writes each import's report next to its feed. Reports quote row
+# contents, so keep this out of MEDIA_ROOT and any other public root.
+JOB_IMPORTS_ROOT = config('JOB_IMPORTS_ROOT', default=os.path.join(BASE_DIR, 'job-imports'))
+
+# Saved-search job alerts (alerts)
+# send_job_alerts hands each user's digest to JOB_ALERTS_BACKEND; the
+# file backend appends them as JSON lines under JOB_ALERTS_FILE_PATH.
+JOB_ALERTS_BACKEND = config('JOB_ALERTS_BACKEND', default='alerts.backends.FileBackend')
+JOB_ALERTS_FILE_PATH = config('JOB_ALERTS_FILE_PATH', default=os.path.join(BASE_DIR, 'alerts-outbox'))
+
+# Background tasks (django.tasks)
+# Enqueued tasks are rows in taskqueue.QueuedTask, run by manage.py
+# run_worker; TASKS_BACKEND=django.tasks.backends.immediate.ImmediateBackend
+# runs them inline instead.
+TASKS = {
+    'default': {
+        'BACKEND': config('TASKS_BACKEND', default='taskqueue.backends.DatabaseBackend'),
+        'QUEUES': config('TASKS_QUEUES', default='default', cast=Csv()),
+        'OPTIONS': {
+            'MAX_ATTEMPTS': config('TASKS_MAX_ATTEMPTS', default=3, cast=int),
+            'RETRY_BACKOFF': config('TASKS_RETRY_BACKOFF', default=10, cast=int),
+            'RETRY_BACKOFF_MAX': config('TASKS_RETRY_BACKOFF_MAX', default=3600, cast=int),
+            'STALE_AFTER': config('TASKS_STALE_AFTER', default=3600, cast=int),
+        },
+    },
+}
+
+# Request profiling (config.profiling)
+# Staff requests with an "X-Profile: 1" header, plus a PROFILING_SAMPLE_RATE
+# fraction of all traffic, are stack-sampled every PROFILING_INTERVAL ms.
+# Flamegraph-ready collapsed stacks are written under PROFILING_ROOT; list
+# and merge them with manage.py request_profiles.
+PROFILING = config('PROFILING', default=True, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_INTERVAL = config('PROFILING_INTERVAL', default=5, cast=float)
+PROFILING_TRACEMALLOC = config('PROFILING_TRACEMALLOC', default=True, cast=bool)
+PROFILING_ROOT = config('PROFILING_ROOT', default=os.path.join(BASE_DIR, 'profiles'))
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -129,6 +225,74 @@ DATABASES = {
     }
 }
 
+# DB_PROFILE=sqlite is a local stand-in for the multi-database setup: a
+# primary plus a "replica" alias opened on the same SQLite file, enough to
+# exercise the replica router without two Postgres servers.
+DB_PROFILE = config('DB_PROFILE', default='postgres')
+
+if DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
+# Connection pooling (psycopg 3)
+# Every worker process owns its own pool, so it is sized from the number of
+# threads a single worker serves requests with, not from the whole fleet.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_WORKER_THREADS = config('DB_POOL_WORKER_THREADS', default=4, cast=int)
+DB_POOL_METRICS_HOOK = config('DB_POOL_METRICS_HOOK', default='config.db_pool.log_pool_metrics')
+DB_POOL_METRICS_INTERVAL = config('DB_POOL_METRICS_INTERVAL', default=60, cast=int)
+
+if DB_POOL and DB_PROFILE == 'postgres':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    # Run psycopg_pool's check_connection on every checkout
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=min(2, DB_POOL_WORKER_THREADS), cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=DB_POOL_WORKER_THREADS, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'name': 'default',
+        },
+    }
+    MIDDLEWARE.append('config.db_pool.PoolMetricsMiddleware')
+
+# Read replicas
+# DB_REPLICA_HOSTS is a comma separated list of host[:port] entries that share
+# the primary's name and credentials. Reads opted in with
+# config.db_routers.ReplicaReadMixin are spread across them.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+for index, replica in enumerate(DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+if DB_PROFILE == 'sqlite':
+    # The test database is a shared-cache in-memory one; read_uncommitted
+    # lets the mirror see the test's open transaction instead of failing
+    # with "table is locked". It has no effect on the file database.
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'OPTIONS': {'init_command': 'PRAGMA read_uncommitted = true'},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['config.db_routers.ReplicaRouter']
+    MIDDLEWARE.append('config.db_routers.PrimaryStickinessMiddleware')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -1,13 +1,133 @@
-from django.contrib import admin
-from .models import Job
+import os
+import re
+from pathlib import Path
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.html import format_html
+from config.pagination import ApproximateCountPaginator
+from users.models import User
+from .models import Application, Job, JobEventConsumer
+from .tasks import import_job_feed
 
 # Register your models here.
 
+# Feeds saved by JobAdmin.import_view
+IMPORT_NAME = re.compile(r"\d{8}-\d{6}-[A-Za-z0-9]+\.(csv|jsonl)")
+
+
+class JobImportForm(forms.Form):
+    feed = forms.FileField(help_text="CSV or JSONL job feed")
+    employer_email = forms.EmailField(help_text="Jobs are posted as this user")
+
+    def clean_employer_email(self):
+        email = self.cleaned_data["employer_email"]
+        try:
+            return User.objects.with_email(email).get()
+        except User.DoesNotExist:
+            raise forms.ValidationError("No user with this email")
+
+    def clean_feed(self):
+        feed = self.cleaned_data["feed"]
+        if os.path.splitext(feed.name)[1].lower() not in (".csv", ".jsonl"):
+            raise forms.ValidationError("Upload a .csv or .jsonl file")
+        return feed
+
 
 class JobAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "company", "logo", "slug", "location", "views", "applicants", "is_active")
     search_fields = ("title", "company")
     list_filter = ("location",)
     ordering = ("posted_date",)
+    change_list_template = "admin/jobs/job/change_list.html"
+    # Planner-estimated counts for large changelists, and no second
+    # unfiltered COUNT(*) for the "N total" link
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def get_urls(self):
+        urls = [
+            path("import/", self.admin_site.admin_view(self.import_view), name="jobs_job_import"),
+            path(
+                "import/<str:name>/report/",
+                self.admin_site.admin_view(self.import_report_view),
+                name="jobs_job_import_report",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Upload a partner feed and queue it for JobImporter"""
+        if not self.has_add_permission(request):
+            return redirect("admin:jobs_job_changelist")
+
+        form = JobImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            feed = form.cleaned_data["feed"]
+            fmt = os.path.splitext(feed.name)[1].lstrip(".").lower()
+
+            # The worker reads the feed from JOB_IMPORTS_ROOT, which is
+            # never served: the report quotes row contents
+            name = f"{timezone.now():%Y%m%d-%H%M%S}-{get_random_string(8)}.{fmt}"
+            root = Path(settings.JOB_IMPORTS_ROOT)
+            root.mkdir(parents=True, exist_ok=True)
+            with (root / name).open("wb") as destination:
+                for chunk in feed.chunks():
+                    destination.write(chunk)
+            import_job_feed.enqueue(name, form.cleaned_data["employer_email"].pk)
+
+            self.message_user(
+                request,
+                format_html(
+                    'Import of {} queued. Its <a href="{}">report</a> is available once it has run.',
+                    feed.name,
+                    reverse("admin:jobs_job_import_report", args=[name]),
+                ),
+                messages.SUCCESS,
+            )
+            return redirect("admin:jobs_job_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import jobs",
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/jobs/job/import_jobs.html", context)
+
+    def import_report_view(self, request, name):
+        """Download the report of a queued import"""
+        if not self.has_add_permission(request) or not IMPORT_NAME.fullmatch(name):
+            raise Http404
+        report_path = Path(settings.JOB_IMPORTS_ROOT) / f"{name}.report.jsonl"
+        if not report_path.exists():
+            self.message_user(request, "That import hasn't run yet.", messages.WARNING)
+            return redirect("admin:jobs_job_changelist")
+        return FileResponse(report_path.open("rb"), as_attachment=True, content_type="application/jsonl")
+
+
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ("id", "job", "applicant", "status", "created_at")
+    list_filter = ("status",)
+    raw_id_fields = ("job", "applicant")
+    ordering = ("-created_at",)
+    # Planner-estimated counts for large changelists, and no second
+    # unfiltered COUNT(*) for the "N total" link
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+class JobEventConsumerAdmin(admin.ModelAdmin):
+    """Checkpoints can be edited to replay or skip outbox events"""
+    list_display = ("name", "position_transaction", "position_id", "updated_at")
 
-admin.site.register(Job, JobAdmin)
\ No newline at end of file
+admin.site.register(Job, JobAdmin)
+admin.site.register(Application, ApplicationAdmin)
+admin.site.register(JobEventConsumer, JobEventConsumerAdmin)
@@ -0,0 +1,221 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from config.pagination import ApproximateCountAsyncPaginator
+from .detail_cache import cached_detail
+from .facets import facet_counts, parse_facets
+from .models import Job, Skill
+from .paginations import JobPagination
+from .serializers import JobListSerializer
+from .skills import canonical_skill
+from .stream import StreamClient, job_stream
+from .views import JobViewSet
+
+# Native async counterparts of the read-only JobViewSet actions.
+#
+# Filtering, searching and ordering are delegated to JobViewSet so both
+# read paths accept exactly the same query parameters. Building the
+# filtered queryset can query (?category= slugs, ?near= place names), so
+# it runs in a thread; the queryset itself is evaluated through the async
+# ORM.
+
+
+def build_viewset(request, action):
+    """Return a JobViewSet bound to the request without dispatching it"""
+    return JobViewSet(
+        action=action,
+        request=Request(request),
+        format_kwarg=None,
+        args=(),
+        kwargs={},
+    )
+
+
+def filtered_queryset(request):
+    """JobViewSet's list queryset with the request's filters applied"""
+    viewset = build_viewset(request, "list")
+    return viewset, viewset.filter_queryset(viewset.get_queryset())
+
+
+def list_queryset(request):
+    """The filtered list queryset and its ?facets= counts, or None"""
+    viewset = build_viewset(request, "list")
+    queryset = viewset.get_queryset()
+    facets = parse_facets(request.GET.get("facets", ""))
+    return viewset.filter_queryset(queryset), facet_counts(viewset, facets, queryset) if facets else None
+
+
+async def evaluate(queryset):
+    """Evaluate a queryset with async iteration"""
+    return [obj async for obj in queryset]
+
+
+async def paginate(request, queryset, facets=None):
+    """Async equivalent of JobPagination.paginate_queryset/get_paginated_response"""
+    pagination = JobPagination()
+    page_size = pagination.get_page_size(Request(request))
+    paginator = ApproximateCountAsyncPaginator(queryset, page_size)
+
+    page_number = request.GET.get(pagination.page_query_param) or 1
+    if page_number in pagination.last_page_strings:
+        page_number = await paginator.anum_pages()
+
+    try:
+        page = await paginator.apage(page_number)
+    except InvalidPage:
+        return JsonResponse({"detail": "Invalid page."}, status=404)
+
+    results = await page.aget_object_list()
+    url = request.build_absolute_uri()
+
+    next_link = None
+    if await page.ahas_next():
+        next_link = replace_query_param(url, pagination.page_query_param, page.number + 1)
+
+    previous_link = None
+    if await page.ahas_previous():
+        if page.number - 1 == 1:
+            previous_link = remove_query_param(url, pagination.page_query_param)
+        else:
+            previous_link = replace_query_param(url, pagination.page_query_param, page.number - 1)
+
+    data = {
+        "count": await paginator.acount(),
+        "count_is_approximate": paginator.is_approximate,
+        "next": next_link,
+        "previous": previous_link,
+        "results": JobListSerializer(results, many=True).data,
+    }
+    if facets is not None:
+        data["facets"] = facets
+    return JsonResponse(data)
+
+
+@require_GET
+async def job_list(request):
+    """Async version of JobViewSet.list"""
+    try:
+        queryset, facets = await sync_to_async(list_queryset)(request)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    return await paginate(request, queryset, facets)
+
+
+@require_GET
+async def job_detail(request, pk):
+    """Async version of JobViewSet.retrieve"""
+    body = await sync_to_async(cached_detail)(Job.objects.filter(is_active=True), job_id=pk)
+    if body is None:
+        return JsonResponse({"detail": "No Job matches the given query."}, status=404)
+    return HttpResponse(body, content_type="application/json")
+
+
+@require_GET
+async def featured(request):
+    """Async version of JobViewSet.featured"""
+    featured_jobs = Job.objects.filter(
+        is_active=True,
+        posted_date__gte=timezone.now() - timedelta(days=30)
+    ).order_by("-views", "-posted_date")[:10]
+
+    jobs = await evaluate(featured_jobs)
+    return JsonResponse(JobListSerializer(jobs, many=True).data, safe=False)
+
+
+@require_GET
+async def recent(request):
+    """Async version of JobViewSet.recent"""
+    recent_jobs = Job.objects.filter(is_active=True).order_by("-posted_date")[:20]
+
+    jobs = await evaluate(recent_jobs)
+    return JsonResponse(JobListSerializer(jobs, many=True).data, safe=False)
+
+
+@require_GET
+async def urgent(request):
+    """Async version of JobViewSet.urgent"""
+    now = timezone.now()
+    urgent_jobs = Job.objects.filter(
+        is_active=True,
+        expiry_date__isnull=False,
+        expiry_date__lte=now + timedelta(days=7),
+        expiry_date__gt=now
+    ).order_by("expiry_date")[:10]
+
+    jobs = await evaluate(urgent_jobs)
+    return JsonResponse(JobListSerializer(jobs, many=True).data, safe=False)
+
+
+async def skill_suggestions(query):
+    """Up to 10 skills of active jobs containing the query"""
+    skills = Skill.objects.filter(
+        canonical_name__contains=canonical_skill(query),
+        jobs__is_active=True,
+    ).values_list("name", flat=True).distinct()[:10]
+    return [name async for name in skills]
+
+
+@require_GET
+async def search_suggestions(request):
+    """Async version of JobViewSet.search_suggestions
+
+    The lookups are awaited one after another: the async ORM runs every
+    query on the same thread-sensitive executor, so gathering them would
+    not overlap them.
+    """
+    query = request.GET.get("q", "").strip()
+
+    if not query or len(query) < 2:
+        return JsonResponse({"suggestions": []})
+
+    active_jobs = Job.objects.filter(is_active=True)
+
+    suggestions = {}
+    for key, field in [("titles", "title"), ("companies", "company"), ("locations", "location")]:
+        values = active_jobs.filter(**{f"{field}__icontains": query}).values_list(field, flat=True)
+        suggestions[key] = await evaluate(values.distinct()[:10])
+    suggestions["skills"] = await skill_suggestions(query)
+
+    return JsonResponse(suggestions)
+
+
+@require_GET
+async def job_stream_events(request):
+    """Server-sent events for the job listing, replacing polling of recent/
+
+    Accepts the same filters as the job list; see jobs.stream.JobStream
+    for the events sent. Under WSGI each open stream would hold a worker
+    thread for as long as the client stays connected, so it is only served
+    through config.asgi.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "The job stream is only served over ASGI."}, status=501)
+
+    try:
+        _, queryset = await sync_to_async(filtered_queryset)(request)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    key = "&".join(sorted(f"{name}={value}" for name, values in request.GET.lists() for value in values))
+    client = StreamClient(key, queryset)
+
+    async def events():
+        job_stream.subscribe(client)
+        try:
+            async for message in client.messages():
+                yield message
+        finally:
+            job_stream.unsubscribe(client)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,162 @@
+import math
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from .models import Job
+from .serializers import JobDetailSerializer, JobListSerializer
+
+# Counters bumped on every view/apply; never cached, read per request
+VOLATILE_FIELDS = ("views", "applicants")
+
+# JobListSerializer fields computed per response, never cached
+TIME_FIELDS = ("days_ago", "is_new", "distance")
+
+# Bump when JobDetailSerializer's or JobListSerializer's output changes
+CACHE_VERSION = 1
+
+
+def detail_cache():
+    return caches[settings.JOB_DETAIL_CACHE]
+
+
+def id_key(job_id):
+    return f"job-detail:{job_id}"
+
+
+def slug_key(slug):
+    return f"job-detail-slug:{slug}"
+
+
+def list_key(job_id):
+    return f"job-list-item:{job_id}"
+
+
+def render_detail(job):
+    """JobDetailSerializer JSON bytes without the volatile counters"""
+    data = dict(JobDetailSerializer(job).data)
+    for field in VOLATILE_FIELDS:
+        data.pop(field, None)
+    return JSONRenderer().render(data)
+
+
+def splice_counters(body, counters):
+    """Put the current counters at the front of a cached JSON object"""
+    prefix = JSONRenderer().render({field: counters[field] for field in VOLATILE_FIELDS})
+    return prefix[:-1] + b"," + body[1:]
+
+
+def detail_timeout(job):
+    """JOB_DETAIL_CACHE_TIMEOUT, cut short at the job's expiry
+
+    The cached body carries is_expired, so it mustn't outlive the moment
+    that flips.
+    """
+    timeout = settings.JOB_DETAIL_CACHE_TIMEOUT
+    if job.expiry_date is not None:
+        remaining = (job.expiry_date - timezone.now()).total_seconds()
+        if remaining > 0:
+            timeout = min(timeout, math.ceil(remaining))
+    return timeout
+
+
+def cached_detail(queryset, job_id=None, slug=None):
+    """Rendered detail bytes of the job in ``queryset`` with this id or slug
+
+    Returns None when no such job exists. A hit costs one primary key
+    lookup for the counters, which also confirms the job still matches
+    ``queryset``. Misses render from the primary database so a lagging
+    replica can't put stale data in the cache.
+    """
+    cache = detail_cache()
+    if job_id is None:
+        job_id = cache.get(slug_key(slug), version=CACHE_VERSION)
+
+    entry = cache.get(id_key(job_id), version=CACHE_VERSION) if job_id is not None else None
+    if entry is not None and (slug is None or entry["slug"] == slug):
+        counters = queryset.filter(pk=job_id).values(*VOLATILE_FIELDS).first()
+        return splice_counters(entry["body"], counters) if counters is not None else None
+
+    lookup = {"pk": job_id} if slug is None else {"slug": slug}
+    job = queryset.using(router.db_for_write(Job)).filter(**lookup).first()
+    if job is None:
+        return None
+    body = render_detail(job)
+    cache.set_many(
+        {id_key(job.pk): {"slug": job.slug, "body": body}, slug_key(job.slug): job.pk},
+        detail_timeout(job),
+        version=CACHE_VERSION,
+    )
+    return splice_counters(body, {field: getattr(job, field) for field in VOLATILE_FIELDS})
+
+
+def list_item(entry):
+    """JobListSerializer data from a cached entry, time fields recomputed"""
+    stub = SimpleNamespace(posted_date=entry["posted_date"])
+    serializer = JobListSerializer()
+    return {
+        **entry["data"],
+        "days_ago": serializer.get_days_ago(stub),
+        "is_new": serializer.get_is_new(stub),
+        "distance": None,
+    }
+
+
+def cached_list_items(queryset, job_ids=(), slugs=()):
+    """JobListSerializer data of the jobs in ``queryset``, by id and by slug
+
+    Returns ({id: data}, {slug: id}). Jobs with a cached list entry cost a
+    single IN query confirming they are still in ``queryset``; the rest
+    are loaded with another and cached. Unknown ids and slugs are absent.
+    """
+    cache = detail_cache()
+    slug_ids = {
+        key.removeprefix(slug_key("")): job_id
+        for key, job_id in cache.get_many([slug_key(slug) for slug in slugs], version=CACHE_VERSION).items()
+    }
+    wanted = set(job_ids) | set(slug_ids.values())
+    entries = {
+        int(key.removeprefix(list_key(""))): entry
+        for key, entry in cache.get_many([list_key(job_id) for job_id in wanted], version=CACHE_VERSION).items()
+    }
+    # Slugs without a cached entry carrying that same slug are looked up
+    unresolved = [slug for slug in slugs if entries.get(slug_ids.get(slug), {}).get("slug") != slug]
+
+    items = {}
+    if entries:
+        for job_id in queryset.filter(pk__in=entries).values_list("pk", flat=True):
+            items[job_id] = list_item(entries[job_id])
+
+    missing = wanted - set(entries)
+    fresh = {}
+    if missing or unresolved:
+        jobs = queryset.using(router.db_for_write(Job)).filter(Q(pk__in=missing) | Q(slug__in=unresolved))
+        for job in jobs:
+            data = dict(JobListSerializer(job).data)
+            for field in TIME_FIELDS:
+                data.pop(field, None)
+            entry = {"data": data, "slug": job.slug, "posted_date": job.posted_date}
+            fresh[list_key(job.pk)] = entry
+            fresh[slug_key(job.slug)] = job.pk
+            items[job.pk] = list_item(entry)
+            slug_ids[job.slug] = job.pk
+        if fresh:
+            cache.set_many(fresh, settings.JOB_DETAIL_CACHE_TIMEOUT, version=CACHE_VERSION)
+
+    found = {slug: job_id for slug, job_id in slug_ids.items() if job_id in items and items[job_id]["slug"] == slug}
+    return items, found
+
+
+def invalidate_job_details(job_ids, slugs=()):
+    """Drop cached details and list entries; a stale slug -> id entry alone is harmless"""
+    keys = (
+        [id_key(job_id) for job_id in job_ids]
+        + [list_key(job_id) for job_id in job_ids]
+        + [slug_key(slug) for slug in slugs]
+    )
+    if keys:
+        detail_cache().delete_many(keys, version=CACHE_VERSION)
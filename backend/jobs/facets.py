@@ -0,0 +1,126 @@
+from django.db import connections
+from django.db.models import BooleanField, Case, Count, Q, Value, When
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter
+from .models import Job
+
+FACET_FIELDS = ["job_type", "employement_type", "experience_level", "location"]
+
+# Facets listed with every choice, zero counts included
+CHOICE_FACETS = {
+    "job_type": Job.JOB_TYPES,
+    "employement_type": Job.EMPLOYMENT_TYPES,
+    "experience_level": Job.EXPERIENCE_LEVELS,
+}
+
+TOP_LOCATIONS = 10
+
+
+def parse_facets(value):
+    """?facets=all (or 1/true) or a comma separated subset of FACET_FIELDS"""
+    if value.lower() in ["all", "1", "true"]:
+        return list(FACET_FIELDS)
+    return [name for name in FACET_FIELDS if name in {part.strip() for part in value.split(",")}]
+
+
+def facet_counts(view, names, queryset):
+    """Counts per value of each facet in ``names`` for the view's current filters
+
+    ``queryset`` is the view's queryset before its filter backends run.
+    Each facet is counted with every filter applied except its own, so the
+    UI can show how many results each alternative value would give. All
+    facets come from one extra query.
+    """
+    request = view.request
+    params = request.query_params
+    filterset_class = DjangoFilterBackend().get_filterset_class(view, queryset)
+    filterset = filterset_class(data=params, queryset=Job.objects.none(), request=request)
+    filterset.form.is_valid()
+
+    # The facet filters become per-row predicates instead of WHERE clauses
+    predicates = {name: Q() for name in names}
+    stripped = params.copy()
+    for filter_name, facet_filter in filterset.filters.items():
+        if facet_filter.field_name not in predicates or filter_name not in params:
+            continue
+        stripped.pop(filter_name)
+        value = filterset.form.cleaned_data.get(filter_name)
+        if value not in (None, "", []):
+            predicates[facet_filter.field_name] &= Q(**{f"{facet_filter.field_name}__{facet_filter.lookup_expr}": value})
+
+    # The view's filter backends, with the other filters read from the
+    # stripped parameters; ordering doesn't matter for counts
+    base = filterset_class(data=stripped, queryset=queryset, request=request).qs
+    for backend in view.filter_backends:
+        if not issubclass(backend, (DjangoFilterBackend, OrderingFilter)):
+            base = backend().filter_queryset(request, base, view)
+    base = base.order_by()
+
+    others = {
+        name: Q(*[predicates[other] for other in names if other != name])
+        for name in names
+    }
+    if connections[base.db].vendor == "postgresql":
+        rows = grouping_sets_counts(base, names, predicates)
+    else:
+        rows = grouped_counts(base, names, others)
+
+    return {name: format_facet(name, rows[name]) for name in names}
+
+
+def grouping_sets_counts(base, names, predicates):
+    """One GROUP BY GROUPING SETS ((f1), (f2), ...) over the filtered jobs"""
+    connection = connections[base.db]
+    quote = connection.ops.quote_name
+    matches = {
+        f"facet_match_{name}": Case(
+            When(predicates[name], then=Value(True)), default=Value(False), output_field=BooleanField()
+        ) if predicates[name] else Value(True, output_field=BooleanField())
+        for name in names
+    }
+    sql, params = base.annotate(**matches).values(*names, *matches).query.sql_with_params()
+
+    columns = []
+    for name in names:
+        others = " AND ".join(quote(f"facet_match_{other}") for other in names if other != name) or "TRUE"
+        columns.append(f"GROUPING({quote(name)}) AS {quote(f'grouping_{name}')}")
+        columns.append(f"COUNT(*) FILTER (WHERE {others}) AS {quote(f'count_{name}')}")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {', '.join(quote(name) for name in names)}, {', '.join(columns)} "
+            f"FROM ({sql}) AS facet_base "
+            f"GROUP BY GROUPING SETS ({', '.join(f'({quote(name)})' for name in names)})",
+            params,
+        )
+        result_columns = [column[0] for column in cursor.description]
+        results = [dict(zip(result_columns, row)) for row in cursor.fetchall()]
+
+    rows = {name: {} for name in names}
+    for row in results:
+        for name in names:
+            # GROUPING() is 0 for the column the row is grouped by
+            if row[f"grouping_{name}"] == 0:
+                rows[name][row[name]] = row[f"count_{name}"]
+    return rows
+
+
+def grouped_counts(base, names, others):
+    """Same counts from one plain GROUP BY over all facet columns"""
+    rows = {name: {} for name in names}
+    counts = base.values(*names).annotate(
+        **{f"count_{name}": Count("pk", filter=others[name] or None) for name in names}
+    )
+    for row in counts:
+        for name in names:
+            rows[name][row[name]] = rows[name].get(row[name], 0) + row[f"count_{name}"]
+    return rows
+
+
+def format_facet(name, counts):
+    if name in CHOICE_FACETS:
+        values = [{"value": value, "label": label, "count": counts.get(value, 0)} for value, label in CHOICE_FACETS[name]]
+    else:
+        values = [{"value": value, "count": count} for value, count in counts.items() if count and value]
+    values.sort(key=lambda item: -item["count"])
+    return values if name in CHOICE_FACETS else values[:TOP_LOCATIONS]
@@ -0,0 +1,238 @@
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+from django.utils.xmlutils import SimplerXMLGenerator
+from .models import Job
+
+# Jobs are sharded by id range; 50,000 URLs is the sitemaps.org per-file limit
+SHARD_SIZE = 50_000
+
+MANIFEST = "manifest.json"
+
+FEED_FIELDS = [
+    "id", "slug", "title", "company", "location", "description", "category_id",
+    "employement_type", "job_type", "experience_level", "skills",
+    "salary_min", "salary_max", "salary_currency", "posted_date", "updated_at", "expiry_date",
+]
+
+
+def live_filter(now):
+    """Jobs the public listing shows: active and not expired"""
+    return Q(is_active=True) & (Q(expiry_date__isnull=True) | Q(expiry_date__gt=now))
+
+
+def job_url(slug):
+    return f"{settings.SITE_URL.rstrip('/')}/jobs/{slug}"
+
+
+def feed_url(name):
+    return f"{settings.FEEDS_URL.rstrip('/')}/{name}"
+
+
+def shard_fingerprints(now):
+    """shard -> fingerprint of its id range, from one grouped query
+
+    Counting every row (not only live ones) and taking the newest
+    updated_at catches inserts, edits, deactivations and deletions; the
+    live count also changes when a job expires.
+    """
+    rows = (
+        Job.objects.annotate(shard=F("id") / SHARD_SIZE)
+        .values("shard")
+        .annotate(
+            total=Count("id"),
+            live=Count("id", filter=live_filter(now)),
+            updated=Max("updated_at"),
+        )
+        .order_by()
+    )
+    return {
+        row["shard"]: {
+            "fingerprint": f"{row['total']}:{row['live']}:{row['updated'].isoformat()}",
+            "live": row["live"],
+            "updated": row["updated"].isoformat(),
+        }
+        for row in rows
+    }
+
+
+def shard_jobs(shard, now):
+    """Stream the shard's live jobs; a server-side cursor on PostgreSQL"""
+    return (
+        Job.objects.filter(live_filter(now), id__gte=shard * SHARD_SIZE, id__lt=(shard + 1) * SHARD_SIZE)
+        .order_by("id")
+        .values(*FEED_FIELDS)
+        .iterator(chunk_size=2000)
+    )
+
+
+class ShardWriter:
+    """Write one shard's sitemap, Atom and JSON feed files in a single pass"""
+
+    def __init__(self, root, shard, updated):
+        self.root = root
+        self.shard = shard
+        self.updated = updated
+        self.files = {}
+
+    def open(self, name):
+        """gzip stream to a temporary file, moved into place by close()"""
+        handle, temporary = tempfile.mkstemp(dir=self.root, prefix=f".{name}.")
+        stream = gzip.open(os.fdopen(handle, "wb"), "wt", encoding="utf-8")
+        self.files[name] = (stream, temporary)
+        return stream
+
+    def write(self, jobs):
+        sitemap = self.open(f"sitemap-jobs-{self.shard}.xml.gz")
+        sitemap.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        sitemap.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+
+        atom_stream = self.open(f"jobs-{self.shard}.atom.gz")
+        atom = SimplerXMLGenerator(atom_stream, "utf-8")
+        atom.startDocument()
+        atom.startElement("feed", {"xmlns": "http://www.w3.org/2005/Atom"})
+        atom.addQuickElement("title", f"Jobs, part {self.shard}")
+        atom.addQuickElement("id", feed_url(f"jobs-{self.shard}.atom.gz"))
+        atom.addQuickElement("link", "", {"rel": "self", "href": feed_url(f"jobs-{self.shard}.atom.gz")})
+        atom.addQuickElement("updated", self.updated)
+
+        json_feed = self.open(f"jobs-{self.shard}.json.gz")
+        json_feed.write(json.dumps({
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": f"Jobs, part {self.shard}",
+            "feed_url": feed_url(f"jobs-{self.shard}.json.gz"),
+        })[:-1] + ', "items": [')
+
+        for number, job in enumerate(jobs):
+            url = job_url(job["slug"])
+            sitemap.write(
+                f"<url><loc>{escape(url)}</loc><lastmod>{job['updated_at'].isoformat()}</lastmod></url>\n"
+            )
+
+            atom.startElement("entry", {})
+            atom.addQuickElement("title", f"{job['title']} at {job['company']}")
+            atom.addQuickElement("link", "", {"href": url})
+            atom.addQuickElement("id", url)
+            atom.addQuickElement("published", job["posted_date"].isoformat())
+            atom.addQuickElement("updated", job["updated_at"].isoformat())
+            atom.addQuickElement("summary", job["description"])
+            for skill in job["skills"] or []:
+                atom.addQuickElement("category", "", {"term": str(skill)})
+            atom.endElement("entry")
+
+            json_feed.write(("," if number else "") + json.dumps({
+                "id": str(job["id"]),
+                "url": url,
+                "title": job["title"],
+                "content_text": job["description"],
+                "date_published": job["posted_date"].isoformat(),
+                "date_modified": job["updated_at"].isoformat(),
+                "tags": job["skills"] or [],
+                "_job": {
+                    key: job[key] for key in FEED_FIELDS
+                    if key not in ("id", "title", "description", "skills", "posted_date", "updated_at")
+                },
+            }, default=str))
+
+        sitemap.write("</urlset>\n")
+        atom.endElement("feed")
+        atom.endDocument()
+        json_feed.write("]}")
+
+    def close(self, commit=True):
+        for name, (stream, temporary) in self.files.items():
+            stream.close()
+            if commit:
+                os.chmod(temporary, 0o644)
+                os.replace(temporary, self.root / name)
+            else:
+                os.unlink(temporary)
+
+
+def shard_files(shard):
+    return [f"sitemap-jobs-{shard}.xml.gz", f"jobs-{shard}.atom.gz", f"jobs-{shard}.json.gz"]
+
+
+def generate_feeds(root=None, force=False):
+    """Bring the sitemap and feed files in FEEDS_ROOT up to date
+
+    Only shards whose fingerprint differs from the last run's manifest
+    are rewritten; shards with no jobs left are removed. The sitemap
+    index and feeds.json are always rewritten. Returns (written, removed)
+    shard numbers.
+    """
+    root = Path(root or settings.FEEDS_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+
+    try:
+        previous = json.loads((root / MANIFEST).read_text())["shards"]
+    except (FileNotFoundError, ValueError, KeyError):
+        previous = {}
+
+    shards = {shard: info for shard, info in shard_fingerprints(now).items() if info["live"]}
+    written = []
+    for shard, info in sorted(shards.items()):
+        if not force and previous.get(str(shard)) == info["fingerprint"]:
+            continue
+        writer = ShardWriter(root, shard, info["updated"])
+        try:
+            writer.write(shard_jobs(shard, now))
+        except BaseException:
+            writer.close(commit=False)
+            raise
+        writer.close()
+        written.append(shard)
+
+    removed = [int(shard) for shard in previous if int(shard) not in shards]
+    for shard in removed:
+        for name in shard_files(shard):
+            (root / name).unlink(missing_ok=True)
+
+    write_indexes(root, shards)
+    write_atomically(root / MANIFEST, json.dumps({
+        "generated_at": now.isoformat(),
+        "shards": {str(shard): info["fingerprint"] for shard, info in shards.items()},
+    }))
+    return written, removed
+
+
+def write_indexes(root, shards):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for shard, info in sorted(shards.items()):
+        lines.append(
+            f"<sitemap><loc>{escape(feed_url(f'sitemap-jobs-{shard}.xml.gz'))}</loc>"
+            f"<lastmod>{info['updated']}</lastmod></sitemap>"
+        )
+    lines.append("</sitemapindex>")
+    write_atomically(root / "sitemap.xml", "\n".join(lines) + "\n")
+
+    write_atomically(root / "feeds.json", json.dumps({
+        "feeds": [
+            {
+                "atom": feed_url(f"jobs-{shard}.atom.gz"),
+                "json": feed_url(f"jobs-{shard}.json.gz"),
+                "jobs": info["live"],
+                "updated": info["updated"],
+            }
+            for shard, info in sorted(shards.items())
+        ],
+    }))
+
+
+def write_atomically(path, text):
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(handle, "w", encoding="utf-8") as stream:
+        stream.write(text)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
@@ -0,0 +1,294 @@
+import csv
+import json
+import re
+from collections import namedtuple
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from locations.geocoding import geocode
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from .detail_cache import invalidate_job_details
+from .models import Job, JobEvent
+from .salary import parse_salary
+from .serializers import JobCreateSerializer
+from .skills import sync_job_skills
+from .tasks import rebuild_category_counts, regenerate_feeds
+
+# Columns written through COPY; everything else keeps its database default
+IMPORT_COLUMNS = [
+    "employer_id", "title", "slug", "description", "company", "location",
+    "employement_type", "salary_range", "expiry_date", "skills", "experience",
+    "experience_level", "job_type", "requirements", "benefits", "status",
+    "is_active", "posted_date", "views", "applicants",
+    "salary_min", "salary_max", "salary_currency", "place_id", "latitude", "longitude",
+    "category_id", "updated_at",
+]
+
+# Columns refreshed when a feed row matches an existing slug. Counters,
+# ownership and the original posting date are left alone.
+UPDATE_COLUMNS = [
+    "title", "description", "company", "location", "employement_type",
+    "salary_range", "expiry_date", "skills", "experience", "experience_level",
+    "job_type", "requirements", "benefits", "status",
+    "salary_min", "salary_max", "salary_currency", "place_id", "latitude", "longitude",
+    "category_id", "updated_at",
+]
+
+LIST_FIELDS = ["skills", "requirements", "benefits"]
+
+# Bytes that aren't UTF-8, as decoded with errors="surrogateescape"
+_UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+# A feed row that couldn't be parsed; rejected like an invalid row
+UnreadableRow = namedtuple("UnreadableRow", ["error", "raw"])
+
+
+def read_rows(fileobj, fmt):
+    """Stream feed rows as dicts from a CSV or JSONL text file
+
+    CSV list columns may hold a JSON array or a ";" separated string. Open
+    the file with errors="surrogateescape": rows that aren't UTF-8, aren't
+    a JSON object or hold malformed JSON are yielded as UnreadableRow, so
+    one bad row doesn't abort the import.
+    """
+    if fmt == "jsonl":
+        for line in fileobj:
+            if line.strip():
+                yield parse_json_line(line)
+        return
+
+    reader = csv.DictReader(fileobj)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield UnreadableRow(f"Malformed CSV: {exc}", None)
+            continue
+        yield parse_csv_row(row)
+
+
+def parse_json_line(line):
+    if _UNDECODABLE.search(line):
+        return UnreadableRow("Not valid UTF-8", line)
+    try:
+        row = json.loads(line)
+    except ValueError as exc:
+        return UnreadableRow(f"Malformed JSON: {exc}", line)
+    if not isinstance(row, dict):
+        return UnreadableRow("Each line must be a JSON object", line)
+    return row
+
+
+def parse_csv_row(row):
+    # Cells past the header are collected under the None key
+    if any(_UNDECODABLE.search(str(value)) for value in [*row, *row.values()] if value is not None):
+        return UnreadableRow("Not valid UTF-8", row)
+    for field in LIST_FIELDS:
+        value = (row.get(field) or "").strip()
+        if value.startswith("["):
+            try:
+                row[field] = json.loads(value)
+            except ValueError as exc:
+                return UnreadableRow(f"{field}: malformed JSON list: {exc}", row)
+        elif field in row:
+            row[field] = [item.strip() for item in value.split(";") if item.strip()]
+    # Empty CSV cells mean "not provided"
+    return {key: value for key, value in row.items() if value not in ("", None)}
+
+
+class JobImporter:
+    """Validate feed rows in chunks and upsert them into jobs_job by slug
+
+    Rows go through the same validation as JobCreateSerializer. Valid rows
+    are loaded with COPY into a temporary staging table and merged with
+    INSERT ... ON CONFLICT (slug) DO UPDATE. Only the employer's own jobs
+    are updated; a row whose slug belongs to another employer's job is
+    reported as a conflict. Progress and rejected rows are written to
+    ``report`` as JSON lines.
+    """
+
+    def __init__(self, employer, report, chunk_size=5000):
+        self.employer = employer
+        self.report = report
+        self.chunk_size = chunk_size
+        self.serializer = JobCreateSerializer()
+        self.totals = {"rows": 0, "valid": 0, "invalid": 0, "inserted": 0, "updated": 0, "conflicts": 0}
+
+    def run(self, rows):
+        rows = enumerate(rows, start=1)
+        while chunk := list(islice(rows, self.chunk_size)):
+            jobs, invalid = self.validate(chunk)
+            inserted, updated = self.load(jobs)
+            conflicts = len(jobs) - inserted - updated
+
+            self.totals["rows"] += len(chunk)
+            self.totals["valid"] += len(chunk) - invalid
+            self.totals["invalid"] += invalid
+            self.totals["inserted"] += inserted
+            self.totals["updated"] += updated
+            self.totals["conflicts"] += conflicts
+            self.write({"type": "progress", **self.totals})
+
+        # COPY and bulk_create bypass the Job signals that keep category
+        # counts current; they and the feeds are rebuilt by a task worker
+        if self.totals["inserted"] or self.totals["updated"]:
+            rebuild_category_counts.enqueue()
+            regenerate_feeds.enqueue()
+        self.write({"type": "summary", **self.totals})
+        return self.totals
+
+    def validate(self, chunk):
+        """Return the chunk's valid rows and its number of rejected rows
+
+        A slug can only be upserted once per statement, so when a chunk holds
+        the same slug twice the last row wins.
+        """
+        now = timezone.now()
+        defaults = {
+            field.attname: field.get_default()
+            for field in Job._meta.concrete_fields
+            if field.attname in IMPORT_COLUMNS
+        }
+        valid = {}
+        invalid = 0
+
+        for line, row in chunk:
+            if isinstance(row, UnreadableRow):
+                errors = {api_settings.NON_FIELD_ERRORS_KEY: [row.error]}
+                self.write({"type": "error", "line": line, "errors": errors, "row": row.raw})
+                invalid += 1
+                continue
+            row.pop("logo", None)
+            try:
+                data = self.serializer.run_validation(row)
+            except ValidationError as exc:
+                self.write({"type": "error", "line": line, "errors": exc.detail, "row": row})
+                invalid += 1
+                continue
+
+            slug = slugify(row.get("slug") or f"{data['title']}-{data['company']}")
+            salary_min, salary_max, salary_currency = parse_salary(data.get("salary_range"))
+            place = geocode(data.get("location"))
+            valid[slug] = {
+                **defaults,
+                **data,
+                "salary_min": salary_min,
+                "salary_max": salary_max,
+                "salary_currency": salary_currency,
+                "place_id": place.id if place else None,
+                "latitude": place.latitude if place else None,
+                "longitude": place.longitude if place else None,
+                "category_id": data["category"].pk if data.get("category") else None,
+                "employer_id": self.employer.pk,
+                "slug": slug,
+                "line": line,
+                "posted_date": now,
+                "updated_at": now,
+                "views": 0,
+                "applicants": 0,
+                "is_active": True,
+            }
+
+        return list(valid.values()), invalid
+
+    def load(self, jobs):
+        if not jobs:
+            return 0, 0
+        if connection.vendor != "postgresql":
+            return self.load_with_orm(jobs)
+
+        columns = ", ".join(IMPORT_COLUMNS)
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE jobs_job_import ON COMMIT DROP AS "
+                f"SELECT {columns} FROM jobs_job WITH NO DATA"
+            )
+            with cursor.copy(f"COPY jobs_job_import ({columns}) FROM STDIN") as copy:
+                for job in jobs:
+                    copy.write_row([self.copy_value(column, job[column]) for column in IMPORT_COLUMNS])
+
+            # xmax is 0 only for freshly inserted rows. Rows the WHERE
+            # skips (another employer's job) aren't returned.
+            cursor.execute(
+                f"INSERT INTO jobs_job ({columns}) SELECT {columns} FROM jobs_job_import "
+                f"ON CONFLICT (slug) DO UPDATE SET {updates} "
+                f"WHERE jobs_job.employer_id = EXCLUDED.employer_id "
+                f"RETURNING (xmax = 0), id, skills, slug, is_active, status"
+            )
+            results = cursor.fetchall()
+            self.report_conflicts(jobs, {slug for _, _, _, slug, *_ in results})
+            # COPY bypasses Job.save(), which normally keeps JobSkill in sync
+            # and writes the outbox events
+            sync_job_skills(
+                (job_id, json.loads(skills) if isinstance(skills, str) else skills)
+                for _, job_id, skills, *_ in results
+            )
+            JobEvent.objects.record([
+                (job_id, "created" if inserted else "updated", self.event_payload(slug, is_active, status))
+                for inserted, job_id, _, slug, is_active, status in results
+            ])
+
+        invalidate_job_details([job_id for _, job_id, *_ in results])
+        inserted = sum(inserted for inserted, *_ in results)
+        return inserted, len(results) - inserted
+
+    def load_with_orm(self, jobs):
+        """Same upsert through bulk_create, for databases without COPY"""
+        with transaction.atomic():
+            owners = dict(
+                Job.objects.select_for_update()
+                .filter(slug__in=[job["slug"] for job in jobs])
+                .values_list("slug", "employer_id")
+            )
+            existing = {slug for slug, owner in owners.items() if owner == self.employer.pk}
+            allowed = {job["slug"] for job in jobs if owners.get(job["slug"], self.employer.pk) == self.employer.pk}
+            self.report_conflicts(jobs, allowed)
+            jobs = [job for job in jobs if job["slug"] in allowed]
+            if not jobs:
+                return 0, 0
+
+            Job.objects.bulk_create(
+                [Job(**{column: job[column] for column in IMPORT_COLUMNS}) for job in jobs],
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=UPDATE_COLUMNS,
+            )
+            loaded = list(
+                Job.objects.filter(slug__in=[job["slug"] for job in jobs])
+                .values_list("id", "skills", "slug", "is_active", "status")
+            )
+            sync_job_skills((job_id, skills) for job_id, skills, *_ in loaded)
+            JobEvent.objects.record([
+                (job_id, "updated" if slug in existing else "created", self.event_payload(slug, is_active, status))
+                for job_id, _, slug, is_active, status in loaded
+            ])
+        invalidate_job_details([job_id for job_id, *_ in loaded])
+        return len(jobs) - len(existing), len(existing)
+
+    def report_conflicts(self, jobs, loaded_slugs):
+        for job in jobs:
+            if job["slug"] not in loaded_slugs:
+                self.write({
+                    "type": "conflict",
+                    "line": job["line"],
+                    "slug": job["slug"],
+                    "errors": {"slug": ["Belongs to another employer's job"]},
+                })
+
+    def event_payload(self, slug, is_active, status):
+        return {"slug": slug, "is_active": is_active, "status": status, "fields": None}
+
+    def copy_value(self, column, value):
+        if column in LIST_FIELDS:
+            return json.dumps(value)
+        return value
+
+    def write(self, entry):
+        self.report.write(json.dumps(entry, default=str) + "\n")
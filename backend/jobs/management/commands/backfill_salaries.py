@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.salary import backfill_salaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-parse Job.salary_range into salary_min, salary_max and "
+        "salary_currency in primary key batches, e.g. after the parser changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--only-missing", action="store_true", help="Skip jobs that already have parsed amounts")
+
+    def handle(self, *args, **options):
+        updated = backfill_salaries(Job, batch_size=options["batch_size"], only_missing=options["only_missing"])
+        self.stdout.write(self.style.SUCCESS(f"{updated} jobs updated"))
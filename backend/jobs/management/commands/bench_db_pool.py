@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure requests per second with and without connection pooling. "
+        "Each mode runs in a fresh process (DB_POOL=0 / DB_POOL=1) that replays "
+        "the connection lifecycle of a request: open or check out a connection, "
+        "run the /jobs/ page query, release the connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--threads", type=int, default=settings.DB_POOL_WORKER_THREADS)
+        parser.add_argument("--child", action="store_true", help="Internal: run one mode in this process")
+
+    def handle(self, *args, **options):
+        if options["child"]:
+            result = self.run_mode(options["requests"], options["threads"])
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = {}
+        for label, flag in (("without pooling", "0"), ("with pooling", "1")):
+            env = dict(os.environ, DB_POOL=flag, DB_POOL_WORKER_THREADS=str(options["threads"]))
+            completed = subprocess.run(
+                [
+                    sys.executable, sys.argv[0], "bench_db_pool", "--child",
+                    "--requests", str(options["requests"]),
+                    "--threads", str(options["threads"]),
+                ],
+                env=env, capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                raise CommandError(f"{label} run failed:\n{completed.stderr}")
+            results[label] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label}: {result['rps']:.1f} req/s "
+                f"({result['requests']} requests, {result['threads']} threads)"
+            )
+
+        baseline = results["without pooling"]["rps"]
+        if baseline:
+            speedup = results["with pooling"]["rps"] / baseline
+            self.stdout.write(self.style.SUCCESS(f"pooling speedup: {speedup:.2f}x"))
+
+    def run_mode(self, total, threads):
+        def simulated_request(_):
+            # Django runs close_old_connections on request_started and
+            # request_finished; without a pool that means a new connection
+            # per request, with a pool a checkout and a return.
+            close_old_connections()
+            list(Job.objects.filter(is_active=True).order_by("-posted_date")[:20])
+            close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(simulated_request, range(total)))
+        elapsed = time.perf_counter() - started
+
+        return {
+            "pooled": settings.DB_POOL,
+            "requests": total,
+            "threads": threads,
+            "rps": total / elapsed,
+        }
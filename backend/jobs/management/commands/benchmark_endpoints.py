@@ -0,0 +1,226 @@
+import json
+import statistics
+import time
+from contextlib import ExitStack
+from itertools import count
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from jobs.models import Job
+from users.models import User
+
+
+BENCH_PASSWORD = "bench-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every JobViewSet action and the users endpoints through the "
+        "Django test client. Reports p50/p95/p99 latency, queries per request "
+        "and throughput, and saves the run as JSON for later comparison."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--only", nargs="*", help="Run only these endpoint names")
+        parser.add_argument("--output", default=None, help="Defaults to benchmarks/<timestamp>.json")
+        parser.add_argument("--compare", default=None, help="A previous result file to diff against")
+
+    def handle(self, *args, **options):
+        self.sequence = count()
+        employer = self.bench_user("bench-employer@example.com", "bench-employer", role="employer")
+        admin = self.bench_user("bench-admin@example.com", "bench-admin", role="admin", is_staff=True)
+        jobseeker = self.bench_user("bench-jobseeker@example.com", "bench-jobseeker", role="jobseeker")
+        self.job = Job.objects.filter(is_active=True).order_by("-id").first() or self.create_job(employer)
+
+        with override_settings(ALLOWED_HOSTS=["testserver"], SQL_REPEAT_RAISE=False):
+            # Server errors are recorded as status codes instead of aborting the run
+            self.anonymous = Client(raise_request_exception=False)
+            self.employer = self.token_client(employer)
+            self.admin = self.token_client(admin)
+            self.jobseeker = self.token_client(jobseeker)
+
+            results = {}
+            for name, run, *setup in self.endpoints():
+                if options["only"] and name not in options["only"]:
+                    continue
+                results[name] = self.measure(run, options["iterations"], options["warmup"], *setup)
+                self.print_result(name, results[name])
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "iterations": options["iterations"],
+            "database": connections["default"].vendor,
+            "jobs": Job.objects.count(),
+            "users": User.objects.count(),
+            "results": results,
+        }
+
+        output = Path(options["output"] or f"benchmarks/{timezone.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"saved {output}"))
+
+        if options["compare"]:
+            self.compare(json.loads(Path(options["compare"]).read_text()), report)
+
+    def bench_user(self, email, username, **extra_fields):
+        user = User.objects.with_email(email).first()
+        if user is None:
+            user = User.objects.create_user(email, BENCH_PASSWORD, username=username, **extra_fields)
+        return user
+
+    def token_client(self, user):
+        client = Client()
+        response = client.post("/login/", {"email": user.email, "password": BENCH_PASSWORD})
+        if response.status_code != 200:
+            raise CommandError(f"Could not log in {user.email}: {response.content!r}")
+        access = json.loads(response.content)["token"]["access"]
+        return Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def create_job(self, employer):
+        number = next(self.sequence)
+        return Job.objects.create(
+            employer=employer,
+            title=f"Benchmark Job {time.time_ns()}-{number}",
+            company="Benchmark Co",
+            location="Lahore",
+            description="Created by benchmark_endpoints",
+            skills=["Python", "Django"],
+            experience_level="mid",
+            job_type="remote",
+        )
+
+    def endpoints(self):
+        """(name, run[, setup]) entries
+
+        ``run`` performs one request. When ``setup`` is given it is called
+        outside the measurement and its return value is passed to ``run``.
+        """
+        job = self.job
+        anonymous, employer, admin, jobseeker = self.anonymous, self.employer, self.admin, self.jobseeker
+
+        def create():
+            return employer.post("/jobs/", {
+                "title": f"Benchmark Create {time.time_ns()}",
+                "company": "Benchmark Co",
+                "location": "Lahore",
+                "description": "Created by benchmark_endpoints",
+                "skills": ["Python"],
+                "experience_level": "mid",
+                "job_type": "remote",
+            }, content_type="application/json")
+
+        def new_job():
+            return self.create_job(job.employer).pk
+
+        def new_inactive_job():
+            pk = new_job()
+            Job.objects.filter(pk=pk).update(is_active=False)
+            return pk
+
+        batch_ids = ",".join(map(str, Job.objects.filter(is_active=True).values_list("pk", flat=True)[:50]))
+
+        return [
+            ("jobs.list", lambda: anonymous.get("/jobs/")),
+            ("jobs.list.filtered", lambda: anonymous.get("/jobs/?job_type=remote&experience_level=mid&skills=Python")),
+            ("jobs.list.search", lambda: anonymous.get("/jobs/?search=developer")),
+            ("jobs.list.ordered", lambda: anonymous.get("/jobs/?ordering=-views")),
+            ("jobs.list.salary", lambda: anonymous.get("/jobs/?min_salary=100000&ordering=-salary_max")),
+            ("jobs.list.near", lambda: anonymous.get("/jobs/?near=Lahore&radius=50&ordering=distance")),
+            ("jobs.list.category", lambda: anonymous.get("/jobs/?category=engineering")),
+            ("categories.tree", lambda: anonymous.get("/categories/")),
+            ("jobs.list.deep_page", lambda: anonymous.get("/jobs/?page=50")),
+            ("jobs.retrieve", lambda: anonymous.get(f"/jobs/{job.pk}/")),
+            ("jobs.retrieve.slug", lambda: anonymous.get(f"/jobs/slug/{job.slug}/")),
+            ("jobs.batch", lambda: anonymous.get(f"/jobs/batch/?ids={batch_ids}")),
+            ("jobs.featured", lambda: anonymous.get("/jobs/featured/")),
+            ("jobs.recent", lambda: anonymous.get("/jobs/recent/")),
+            ("jobs.urgent", lambda: anonymous.get("/jobs/urgent/")),
+            ("jobs.search_suggestions", lambda: anonymous.get("/jobs/search_suggestions/?q=dev")),
+            ("jobs.stats", lambda: anonymous.get("/jobs/stats/")),
+            ("jobs.analytics", lambda: employer.get("/jobs/analytics/")),
+            ("jobs.employer", lambda: employer.get("/jobs/employer-jobs/")),
+            ("jobs.increment_views", lambda: anonymous.post(f"/jobs/{job.pk}/increment_views/")),
+            ("jobs.apply", lambda pk: jobseeker.post(f"/jobs/{pk}/apply/"), new_job),
+            ("jobs.apply.repeat", lambda: jobseeker.post(f"/jobs/{job.pk}/apply/")),
+            ("jobs.create", create),
+            ("jobs.partial_update", lambda: employer.patch(
+                f"/jobs/{job.pk}/", {"description": "Updated by benchmark_endpoints"},
+                content_type="application/json",
+            )),
+            ("jobs.deactivate", lambda pk: employer.post(f"/jobs/{pk}/deactivate/"), new_job),
+            ("jobs.activate", lambda pk: employer.post(f"/jobs/{pk}/activate/"), new_inactive_job),
+            ("jobs.destroy", lambda pk: admin.delete(f"/jobs/{pk}/"), new_job),
+            ("users.register", lambda: anonymous.post("/register/", {
+                "username": f"bench-{time.time_ns()}",
+                "email": f"bench-{time.time_ns()}@example.com",
+                "password": BENCH_PASSWORD,
+                "password2": BENCH_PASSWORD,
+                "role": "jobseeker",
+            })),
+            ("users.login", lambda: anonymous.post("/login/", {
+                "email": "bench-employer@example.com", "password": BENCH_PASSWORD,
+            })),
+            ("users.profile", lambda: employer.get("/profile/")),
+            ("users.profile_update", lambda: employer.put(
+                "/profile-update/", {"first_name": "Bench"}, content_type="application/json",
+            )),
+        ]
+
+    def measure(self, run, iterations, warmup, setup=None):
+        prepare = setup or (lambda: None)
+        call = run if setup else (lambda _: run())
+
+        for _ in range(warmup):
+            call(prepare())
+
+        latencies = []
+        queries = []
+        statuses = {}
+        for _ in range(iterations):
+            argument = prepare()
+            # Reads may be routed to the replicas
+            with ExitStack() as stack:
+                captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                request_started = time.perf_counter()
+                response = call(argument)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            queries.append(sum(len(context) for context in captured))
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        return {
+            "p50_ms": round(cuts[49], 3),
+            "p95_ms": round(cuts[94], 3),
+            "p99_ms": round(cuts[98], 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "queries_per_request": round(statistics.fmean(queries), 2),
+            "throughput_rps": round(1000 * iterations / sum(latencies), 2),
+            "status_codes": statuses,
+        }
+
+    def print_result(self, name, result):
+        self.stdout.write(
+            f"{name:<28} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['queries_per_request']:>6.1f} q/req  "
+            f"{result['throughput_rps']:>8.1f} req/s  {result['status_codes']}"
+        )
+
+    def compare(self, previous, current):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"compared with run from {previous['created_at']}"))
+        for name, result in current["results"].items():
+            before = previous["results"].get(name)
+            if not before:
+                continue
+            change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0
+            style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+            self.stdout.write(style(
+                f"{name:<28} p50 {before['p50_ms']:.2f} -> {result['p50_ms']:.2f} ms ({change:+.1f}%)  "
+                f"q/req {before['queries_per_request']} -> {result['queries_per_request']}"
+            ))
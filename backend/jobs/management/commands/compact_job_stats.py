@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+from jobs.models import JobDailyStats
+from jobs.stats import COUNTERS, upsert_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Retention for JobDailyStats: daily rows older than --keep-days are "
+        "summed into one weekly row per job (keyed by the Monday of the week)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["keep_days"] < 7:
+            raise CommandError("--keep-days must be at least 7")
+
+        # Only whole weeks are compacted, so the cutoff is moved back to a Monday
+        cutoff = timezone.localdate() - timedelta(days=options["keep_days"])
+        cutoff -= timedelta(days=cutoff.weekday())
+
+        old_days = JobDailyStats.objects.filter(period="day", day__lt=cutoff)
+        with transaction.atomic():
+            weeks = list(
+                old_days.annotate(week=TruncWeek("day"))
+                .values("job_id", "week")
+                .annotate(**{f"total_{name}": Sum(name) for name in COUNTERS})
+                .order_by()
+                .values_list("job_id", "week", *(f"total_{name}" for name in COUNTERS))
+            )
+            deleted, _ = old_days.delete()
+
+            # Upserting adds onto weekly rows left by an earlier run
+            batch_size = options["batch_size"]
+            for start in range(0, len(weeks), batch_size):
+                upsert_daily_stats(weeks[start:start + batch_size], period="week")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {deleted} daily rows before {cutoff} into {len(weeks)} weekly rows"
+        ))
@@ -0,0 +1,76 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+READ_PATHS = [
+    "jobs/",
+    "jobs/featured/",
+    "jobs/recent/",
+    "jobs/urgent/",
+    "jobs/search_suggestions/?q=de",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync (WSGI) and async (ASGI) job read paths under load. "
+        "Start both servers with the same worker count first, e.g. "
+        "`gunicorn config.wsgi -w 4 -b :8000` and "
+        "`uvicorn config.asgi:application --workers 4 --port 8001`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi-url", default="http://127.0.0.1:8000/")
+        parser.add_argument("--asgi-url", default="http://127.0.0.1:8001/async/")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--timeout", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        for path in READ_PATHS:
+            self.stdout.write(self.style.MIGRATE_HEADING(path))
+            for label, base_url in (("wsgi", options["wsgi_url"]), ("asgi", options["asgi_url"])):
+                result = self.run_load(
+                    base_url + path,
+                    options["requests"],
+                    options["concurrency"],
+                    options["timeout"],
+                )
+                self.stdout.write(
+                    f"  {label}: {result['rps']:.1f} req/s, "
+                    f"p50 {result['p50']:.1f} ms, p95 {result['p95']:.1f} ms, "
+                    f"errors {result['errors']}"
+                )
+
+    def run_load(self, url, total, concurrency, timeout):
+        def fetch(_):
+            start = time.perf_counter()
+            try:
+                with urlopen(url, timeout=timeout) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (URLError, OSError):
+                ok = False
+            return ok, (time.perf_counter() - start) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for ok, latency in results if ok]
+        if not latencies:
+            raise CommandError(f"Every request to {url} failed; is the server running?")
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": cuts[49],
+            "p95": cuts[94],
+            "errors": total - len(latencies),
+        }
@@ -0,0 +1,52 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+from jobs.outbox import claim_batch
+
+
+def print_events(events, stdout):
+    for event in events:
+        stdout.write(json.dumps({
+            "id": event.id,
+            "job_id": event.job_id,
+            "event_type": event.event_type,
+            "payload": event.payload,
+            "created_at": event.created_at.isoformat(),
+        }))
+
+
+class Command(BaseCommand):
+    help = (
+        "Feed Job outbox events to a consumer in batches, checkpointing after "
+        "each one. --handler is a dotted path to a callable taking "
+        "(events, stdout); by default events are written as JSON lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("consumer", help="Checkpoint name, e.g. search or alerts")
+        parser.add_argument("--handler", default=None)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--follow", action="store_true", help="Keep polling for new events")
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        handler = import_string(options["handler"]) if options["handler"] else print_events
+        total = 0
+        while True:
+            with claim_batch(options["consumer"], limit=options["batch_size"]) as events:
+                if events is None:
+                    self.stderr.write(f"{options['consumer']} is being consumed by another worker")
+                elif events:
+                    handler(events, self.stdout)
+                    total += len(events)
+
+            # A full batch means there are probably more waiting
+            if events and len(events) == options["batch_size"]:
+                continue
+            if not options["follow"]:
+                break
+            time.sleep(options["poll_interval"])
+
+        self.stderr.write(self.style.SUCCESS(f"{total} events consumed"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from jobs.feeds import generate_feeds
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the sitemap index, 50k-URL gzipped sitemap shards and Atom/JSON "
+        "job feeds to FEEDS_ROOT. Only shards whose jobs changed since the "
+        "last run are rewritten; schedule it e.g. every 15 minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--root", default=None, help="Output directory, FEEDS_ROOT by default")
+        parser.add_argument("--force", action="store_true", help="Rewrite every shard")
+
+    def handle(self, *args, **options):
+        written, removed = generate_feeds(root=options["root"], force=options["force"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(written)} shards written, {len(removed)} removed"
+        ))
@@ -0,0 +1,235 @@
+import random
+import secrets
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from categories.models import Category
+from jobs.models import Job, JobEvent, SavedJob
+from jobs.salary import parse_salary
+from jobs.skills import sync_job_skills
+from locations.geocoding import apply_geocode, geocode
+from users.models import User, AdminProfile, JobseekerProfile, EmployerProfile
+
+
+TITLES = [
+    "Backend Developer", "Frontend Developer", "Full Stack Engineer", "Data Analyst",
+    "Data Scientist", "DevOps Engineer", "QA Engineer", "Product Manager",
+    "UI/UX Designer", "Mobile Developer", "Machine Learning Engineer", "Accountant",
+    "Sales Executive", "HR Officer", "Customer Support Agent", "Content Writer",
+]
+# Category tree the titles are filed under: root -> subcategories
+CATEGORIES = {
+    "Engineering": ["Software Development", "Data & AI", "DevOps & QA"],
+    "Product & Design": [],
+    "Business": ["Finance", "Sales", "Human Resources", "Customer Support"],
+    "Marketing & Content": [],
+}
+TITLE_CATEGORIES = {
+    "Backend Developer": "Software Development",
+    "Frontend Developer": "Software Development",
+    "Full Stack Engineer": "Software Development",
+    "Mobile Developer": "Software Development",
+    "Data Analyst": "Data & AI",
+    "Data Scientist": "Data & AI",
+    "Machine Learning Engineer": "Data & AI",
+    "DevOps Engineer": "DevOps & QA",
+    "QA Engineer": "DevOps & QA",
+    "Product Manager": "Product & Design",
+    "UI/UX Designer": "Product & Design",
+    "Accountant": "Finance",
+    "Sales Executive": "Sales",
+    "HR Officer": "Human Resources",
+    "Customer Support Agent": "Customer Support",
+    "Content Writer": "Marketing & Content",
+}
+COMPANIES = [
+    "Systems Ltd", "Arbisoft", "Netsol", "10Pearls", "Folio3", "Tkxel", "Contour",
+    "Careem", "Daraz", "Jazz", "Telenor", "Engro", "HBL", "Meezan Bank", "K-Electric",
+]
+LOCATIONS = [
+    "Lahore", "Karachi", "Islamabad", "Rawalpindi", "Faisalabad", "Multan",
+    "Peshawar", "Quetta", "Sialkot", "Hyderabad", "Remote",
+]
+SKILLS = [
+    "Python", "Django", "JavaScript", "React", "Node.js", "SQL", "PostgreSQL",
+    "Docker", "Kubernetes", "AWS", "Excel", "Communication", "Figma", "Java",
+    "Kotlin", "Swift", "Go", "Machine Learning", "Pandas", "Git",
+]
+SALARIES = ["50k-80k", "80k-120k", "120k-200k", "200k-350k", "Up to 60k", "150k+", "Negotiable", None]
+
+# Share of generated users per role
+ROLE_WEIGHTS = {"jobseeker": 0.8, "employer": 0.18, "admin": 0.02}
+
+
+def chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate realistic synthetic users, role profiles, jobs and saved jobs "
+        "with chunked bulk inserts, for load testing and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500_000)
+        parser.add_argument("--jobs", type=int, default=1_000_000)
+        parser.add_argument("--saved-jobs", type=int, default=200_000)
+        parser.add_argument("--chunk-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        # Unique per run, so repeated runs never collide on email/slug
+        self.run_token = secrets.token_hex(3)
+        chunk_size = options["chunk_size"]
+
+        employer_ids, jobseeker_ids = self.create_users(options["users"], chunk_size)
+        if not employer_ids:
+            employer_ids = list(User.objects.filter(role="employer").values_list("id", flat=True)[:1000])
+
+        category_ids = self.create_categories()
+        job_ids = self.create_jobs(options["jobs"], chunk_size, employer_ids, category_ids)
+        # bulk_create skips the Job signals that keep the counts current
+        Category.objects.rebuild_job_counts()
+        self.create_saved_jobs(options["saved_jobs"], chunk_size, jobseeker_ids, job_ids)
+
+    def create_users(self, total, chunk_size):
+        # Hashing is deliberately slow; every synthetic user shares one hash
+        password = make_password("synthetic-password")
+        roles = list(ROLE_WEIGHTS)
+        weights = list(ROLE_WEIGHTS.values())
+        now = timezone.now()
+        created = {role: [] for role in roles}
+
+        for start, size in chunks(total, chunk_size):
+            users = []
+            for number in range(start, start + size):
+                username = f"synth-{self.run_token}-{number}"
+                users.append(User(
+                    username=username,
+                    slug=username,
+                    email=f"{username}@example.com",
+                    password=password,
+                    role=self.random.choices(roles, weights)[0],
+                    gender=self.random.choice(["male", "female", "other"]),
+                    date_joined=now,
+                ))
+
+            with transaction.atomic():
+                # bulk_create skips User.save() and post_save, so the role
+                # profiles users.signals would add are created here.
+                User.objects.bulk_create(users)
+                profiles = [
+                    JobseekerProfile(
+                        user=user,
+                        experience=self.random.randint(0, 15),
+                        location=self.random.choice(LOCATIONS),
+                        skills=", ".join(self.random.sample(SKILLS, 4)),
+                    )
+                    for user in users if user.role == "jobseeker"
+                ]
+                for profile in profiles:
+                    apply_geocode(profile)
+                JobseekerProfile.objects.bulk_create(profiles)
+                EmployerProfile.objects.bulk_create([
+                    EmployerProfile(user=user, company=self.random.choice(COMPANIES))
+                    for user in users if user.role == "employer"
+                ])
+                AdminProfile.objects.bulk_create([
+                    AdminProfile(user=user) for user in users if user.role == "admin"
+                ])
+
+            for user in users:
+                created[user.role].append(user.id)
+            self.stdout.write(f"users: {start + size}/{total}")
+
+        return created["employer"], created["jobseeker"]
+
+    def create_categories(self):
+        """Get or create the CATEGORIES tree; returns name -> id"""
+        category_ids = {}
+        for root_name, children in CATEGORIES.items():
+            root, _ = Category.objects.get_or_create(name=root_name, parent=None)
+            category_ids[root_name] = root.pk
+            for name in children:
+                category_ids[name] = Category.objects.get_or_create(name=name, parent=root)[0].pk
+        return category_ids
+
+    def create_jobs(self, total, chunk_size, employer_ids, category_ids):
+        now = timezone.now()
+        job_ids = []
+
+        for start, size in chunks(total, chunk_size):
+            jobs = []
+            posted_dates = []
+            for number in range(start, start + size):
+                title = self.random.choice(TITLES)
+                company = self.random.choice(COMPANIES)
+                salary_range = self.random.choice(SALARIES)
+                salary_min, salary_max, salary_currency = parse_salary(salary_range)
+                location = self.random.choice(LOCATIONS)
+                place = geocode(location)
+                posted = now - timedelta(minutes=self.random.randint(0, 365 * 24 * 60))
+                posted_dates.append(posted)
+                jobs.append(Job(
+                    employer_id=self.random.choice(employer_ids),
+                    title=title,
+                    slug=slugify(f"{title}-{company}-{self.run_token}-{number}"),
+                    description=f"{title} position at {company}.",
+                    company=company,
+                    category_id=category_ids[TITLE_CATEGORIES[title]],
+                    location=location,
+                    place_id=place.id if place else None,
+                    latitude=place.latitude if place else None,
+                    longitude=place.longitude if place else None,
+                    employement_type=self.random.choice(Job.EMPLOYMENT_TYPES)[0],
+                    salary_range=salary_range,
+                    salary_min=salary_min,
+                    salary_max=salary_max,
+                    salary_currency=salary_currency,
+                    views=self.random.randint(0, 5000),
+                    applicants=self.random.randint(0, 200),
+                    expiry_date=posted + timedelta(days=self.random.randint(7, 90)),
+                    skills=self.random.sample(SKILLS, self.random.randint(2, 6)),
+                    experience=self.random.randint(0, 12),
+                    experience_level=self.random.choice(Job.EXPERIENCE_LEVELS)[0],
+                    job_type=self.random.choice(Job.JOB_TYPES)[0],
+                    requirements=["Relevant degree", "Good communication"],
+                    benefits=["Health insurance"],
+                    status=self.random.choice(["published"] * 9 + ["draft"]),
+                    is_active=self.random.random() < 0.9,
+                ))
+
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+                # posted_date is auto_now_add; spread it over the last year instead
+                for job, posted in zip(jobs, posted_dates):
+                    job.posted_date = posted
+                Job.objects.bulk_update(jobs, ["posted_date"])
+                # bulk_create skips the post_save signal that fills JobSkill
+                # and Job.save(), which writes the outbox events
+                sync_job_skills((job.id, job.skills) for job in jobs)
+                JobEvent.objects.record([job.change_event(adding=True) for job in jobs])
+            job_ids.extend(job.id for job in jobs)
+            self.stdout.write(f"jobs: {start + size}/{total}")
+
+        return job_ids
+
+    def create_saved_jobs(self, total, chunk_size, user_ids, job_ids):
+        if not user_ids or not job_ids:
+            return
+
+        for start, size in chunks(total, chunk_size):
+            saved = [
+                SavedJob(user_id=self.random.choice(user_ids), job_id=self.random.choice(job_ids))
+                for _ in range(size)
+            ]
+            # Random pairs can repeat; the unique (user, job) constraint drops them
+            SavedJob.objects.bulk_create(saved, ignore_conflicts=True)
+            self.stdout.write(f"saved jobs: {start + size}/{total}")
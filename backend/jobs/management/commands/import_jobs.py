@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from jobs.importers import JobImporter, read_rows
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import a partner job feed (CSV or JSONL). Rows are validated in "
+        "chunks, loaded with COPY and upserted by slug."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--employer", required=True, help="Email of the user the jobs are posted as")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="Defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--report", default=None, help="Defaults to <path>.report.jsonl")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt not in ("csv", "jsonl"):
+            raise CommandError("Use --format csv or --format jsonl")
+
+        try:
+            employer = User.objects.with_email(options["employer"]).get()
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['employer']}")
+
+        report_path = Path(options["report"] or f"{path}.report.jsonl")
+        with path.open(newline="", encoding="utf-8", errors="surrogateescape") as feed, report_path.open("w") as report:
+            importer = JobImporter(employer, report, chunk_size=options["chunk_size"])
+            totals = importer.run(read_rows(feed, fmt))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['rows']} rows: {totals['inserted']} inserted, {totals['updated']} updated, "
+            f"{totals['invalid']} rejected, {totals['conflicts']} conflicts (see {report_path})"
+        ))
@@ -0,0 +1,135 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: boot Django the way a WSGI worker does and
+# serve one request, timing each phase
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+from wsgiref.util import setup_testing_defaults
+application = get_wsgi_application()
+ready = time.perf_counter()
+settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+path, _, query = sys.argv[1].partition("?")
+environ = {"PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": "testserver"}
+setup_testing_defaults(environ)
+statuses = []
+b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+served = time.perf_counter()
+print(json.dumps({
+    "setup": setup - started,
+    "application": ready - setup,
+    "first_request": served - ready,
+    "served_at": time.time(),
+    "status": statuses[0],
+}))
+"""
+
+PHASES = ["interpreter", "setup", "application", "first_request", "total"]
+
+
+def parse_importtime(stderr):
+    """Self time in seconds per top-level package from ``-X importtime`` output"""
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line.removeprefix("import time:").split("|")
+        packages[name.strip().split(".")[0]] += int(own) / 1_000_000
+    return packages
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: boot Django in fresh interpreters as a WSGI "
+        "worker would and serve one request. Reports the time to first "
+        "response split into phases, and import cost per top-level package "
+        "from python -X importtime. Give several --settings-module values "
+        "to compare startup profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module", nargs="+", default=None,
+            help="Defaults to the current DJANGO_SETTINGS_MODULE",
+        )
+        parser.add_argument("--path", default="/jobs/recent/", help="The first request")
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15, help="Packages to list")
+        parser.add_argument("--output", default=None, help="Save the results as JSON")
+
+    def handle(self, *args, **options):
+        modules = options["settings_module"] or [os.environ["DJANGO_SETTINGS_MODULE"]]
+        results = {}
+        for module in modules:
+            # One discarded run so every profile starts with compiled bytecode
+            self.probe(module, options["path"])
+            runs = [self.probe(module, options["path"]) for _ in range(options["runs"])]
+            results[module] = {
+                "status": runs[-1]["status"],
+                "phases": {phase: statistics.median(run[phase] for run in runs) for phase in PHASES},
+                "packages": {
+                    package: statistics.median(run["packages"].get(package, 0) for run in runs)
+                    for package in set().union(*(run["packages"] for run in runs))
+                },
+            }
+            self.print_result(module, results[module], options["top"])
+
+        if len(modules) > 1:
+            self.print_comparison(results, modules)
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"saved {options['output']}"))
+
+    def probe(self, module, path):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": module}
+        spawned_at = time.time()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if process.returncode != 0:
+            raise CommandError(f"{module} failed to start:\n{process.stderr[-2000:]}")
+        run = json.loads(process.stdout.strip().splitlines()[-1])
+        run["total"] = run.pop("served_at") - spawned_at
+        run["interpreter"] = run["total"] - run["setup"] - run["application"] - run["first_request"]
+        run["packages"] = parse_importtime(process.stderr)
+        return run
+
+    def print_result(self, module, result, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{module} (first request: {result['status']})"))
+        for phase in PHASES:
+            self.stdout.write(f"  {phase:<28} {result['phases'][phase] * 1000:8.1f} ms")
+        self.stdout.write("  import cost by package (self time, all phases)")
+        packages = sorted(result["packages"].items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in packages[:top]:
+            self.stdout.write(f"    {package:<26} {seconds * 1000:8.1f} ms")
+
+    def print_comparison(self, results, modules):
+        base = results[modules[0]]
+        for module in modules[1:]:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{module} vs {modules[0]}"))
+            for phase in PHASES:
+                delta = results[module]["phases"][phase] - base["phases"][phase]
+                self.stdout.write(f"  {phase:<28} {delta * 1000:+8.1f} ms")
+            deltas = {
+                package: results[module]["packages"].get(package, 0) - seconds
+                for package, seconds in base["packages"].items()
+            }
+            for package, delta in sorted(deltas.items(), key=lambda item: item[1])[:8]:
+                if delta < 0:
+                    self.stdout.write(f"    {package:<26} {delta * 1000:+8.1f} ms")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from jobs.outbox import prune_events
+
+
+class Command(BaseCommand):
+    help = "Delete Job outbox events older than --keep-days that every consumer has processed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        deleted = prune_events(keep_days=options["keep_days"])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} events deleted"))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from jobs.models import Application, Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Reset Job.applicants to the number of Application rows. The "
+        "jobs_application triggers keep them equal; run this after loading "
+        "data with the triggers disabled or to repair drift. Counts bumped "
+        "before applications were recorded are overwritten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--dry-run", action="store_true", help="Only report jobs whose count is off")
+
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                Application.objects.filter(job=OuterRef("pk"))
+                .order_by()
+                .values("job")
+                .annotate(total=Count("id"))
+                .values("total"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+        fixed = 0
+        last_id = 0
+        batch_size = options["batch_size"]
+        # Walk the table in primary key ranges to keep each UPDATE short
+        while True:
+            ids = list(
+                Job.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            drifted = (
+                Job.objects.filter(pk__gte=ids[0], pk__lte=last_id)
+                .annotate(actual=actual)
+                .exclude(applicants=F("actual"))
+            )
+            if options["dry_run"]:
+                for job_id, stored, counted in drifted.values_list("pk", "applicants", "actual"):
+                    self.stdout.write(f"job {job_id}: applicants={stored}, applications={counted}")
+                    fixed += 1
+            else:
+                fixed += Job.objects.filter(pk__in=drifted.values("pk")).update(applicants=actual)
+
+        verb = "would be reset" if options["dry_run"] else "reset"
+        self.stdout.write(self.style.SUCCESS(f"{fixed} job counts {verb}"))
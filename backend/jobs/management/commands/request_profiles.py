@@ -0,0 +1,109 @@
+import statistics
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from config.profiling import read_captures, read_stacks
+
+
+class Command(BaseCommand):
+    help = (
+        "List the request profiles captured by config.profiling.ProfilingMiddleware, "
+        "summarize them per endpoint, or merge their collapsed stacks into one "
+        "file for flamegraph.pl / speedscope."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", default=None, help="Only captures of this view name")
+        parser.add_argument("--hours", type=float, default=None, help="Only captures from the last N hours")
+        parser.add_argument("--min-ms", type=float, default=0, help="Only requests at least this slow")
+        parser.add_argument("--limit", type=int, default=30, help="Captures to list, newest first")
+        parser.add_argument("--summary", action="store_true", help="Per endpoint counts and timings")
+        parser.add_argument(
+            "--aggregate", default=None, metavar="PATH",
+            help="Merge the stacks of every matching capture into PATH",
+        )
+        parser.add_argument("--top", type=int, default=15, help="Functions to list with --aggregate")
+
+    def handle(self, *args, **options):
+        captures = read_captures()
+        if options["endpoint"]:
+            captures = [capture for capture in captures if capture["endpoint"] == options["endpoint"]]
+        if options["hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["hours"])
+            captures = [
+                capture for capture in captures
+                if datetime.fromisoformat(capture["started_at"]) >= since
+            ]
+        captures = [capture for capture in captures if capture["duration_ms"] >= options["min_ms"]]
+        if not captures:
+            raise CommandError("No matching captures")
+
+        if options["summary"]:
+            self.summarize(captures)
+        elif options["aggregate"]:
+            self.aggregate(captures, options["aggregate"], options["top"])
+        else:
+            self.list_captures(captures[-options["limit"]:][::-1])
+
+    def list_captures(self, captures):
+        self.stdout.write(
+            f"{'started':<19} {'endpoint':<28} {'status':>6} {'ms':>9} {'samples':>7} {'peak KiB':>9}  file"
+        )
+        for capture in captures:
+            started = timezone.localtime(datetime.fromisoformat(capture["started_at"]))
+            self.stdout.write(
+                f"{started:%Y-%m-%d %H:%M:%S} {capture['endpoint'][:28]:<28} {capture['status']:>6} "
+                f"{capture['duration_ms']:>9.1f} {capture['samples']:>7} {kib(capture['peak_memory_bytes']):>9}  "
+                f"{capture['file']}"
+            )
+
+    def summarize(self, captures):
+        by_endpoint = defaultdict(list)
+        for capture in captures:
+            by_endpoint[capture["endpoint"]].append(capture)
+        self.stdout.write(
+            f"{'endpoint':<32} {'captures':>8} {'p50 ms':>9} {'max ms':>9} {'max peak KiB':>13}"
+        )
+        for endpoint, group in sorted(by_endpoint.items(), key=lambda item: -len(item[1])):
+            durations = [capture["duration_ms"] for capture in group]
+            peaks = [capture["peak_memory_bytes"] for capture in group if capture["peak_memory_bytes"] is not None]
+            self.stdout.write(
+                f"{endpoint[:32]:<32} {len(group):>8} {statistics.median(durations):>9.1f} "
+                f"{max(durations):>9.1f} {kib(max(peaks) if peaks else None):>13}"
+            )
+
+    def aggregate(self, captures, path, top):
+        stacks = Counter()
+        for capture in captures:
+            try:
+                stacks.update(read_stacks(capture))
+            except FileNotFoundError:
+                self.stderr.write(f"missing {capture['file']}, skipped")
+        Path(path).write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+
+        total = sum(stacks.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"merged {len(captures)} captures, {total} samples into {path}"
+        ))
+        if not total:
+            return
+        own, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            # A recursive function counts once per sample
+            for frame in set(frames):
+                inclusive[frame] += count
+        self.stdout.write(self.style.MIGRATE_HEADING("self time"))
+        for frame, count in own.most_common(top):
+            self.stdout.write(f"  {count / total:6.1%}  {frame}")
+        self.stdout.write(self.style.MIGRATE_HEADING("total time"))
+        for frame, count in inclusive.most_common(top):
+            self.stdout.write(f"  {count / total:6.1%}  {frame}")
+
+
+def kib(size):
+    return "-" if size is None else f"{size / 1024:.0f}"
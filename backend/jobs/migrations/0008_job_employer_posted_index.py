@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 09:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobdailystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', '-posted_date'], name='jobs_job_employer_posted_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# jobs_job.applicants is kept equal to the job's number of applications by
+# triggers, in the same transaction as the insert or delete.
+#
+# There are no SQLite triggers: SQLite rebuilds a table to add most
+# columns, and a rebuild of jobs_job fails while a trigger on
+# jobs_application references it. There the count is kept by
+# ApplicationManager instead: apply increments it and deleting an
+# application decrements it (jobs.signals).
+POSTGRES_FORWARD = """
+CREATE OR REPLACE FUNCTION jobs_application_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE jobs_job SET applicants = applicants + 1 WHERE id = NEW.job_id;
+    ELSE
+        UPDATE jobs_job SET applicants = GREATEST(applicants - 1, 0) WHERE id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_application_count
+AFTER INSERT OR DELETE ON jobs_application
+FOR EACH ROW EXECUTE FUNCTION jobs_application_count();
+"""
+
+POSTGRES_REVERSE = """
+DROP TRIGGER IF EXISTS jobs_application_count ON jobs_application;
+DROP FUNCTION IF EXISTS jobs_application_count();
+"""
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_FORWARD)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_application'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
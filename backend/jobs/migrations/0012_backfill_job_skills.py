@@ -0,0 +1,51 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def canonical_skill(name):
+    # Frozen copy of jobs.skills.canonical_skill
+    return " ".join(str(name).split()).casefold()[:100]
+
+
+def backfill_job_skills(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Skill = apps.get_model('jobs', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    skill_ids = {}
+    last_id = 0
+    while True:
+        batch = list(Job.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'skills')[:BATCH_SIZE])
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        pairs = set()
+        for job_id, skills in batch:
+            for name in skills or []:
+                canonical = canonical_skill(name)
+                if not canonical:
+                    continue
+                if canonical not in skill_ids:
+                    skill, _ = Skill.objects.get_or_create(
+                        canonical_name=canonical, defaults={'name': " ".join(str(name).split())[:100]},
+                    )
+                    skill_ids[canonical] = skill.pk
+                pairs.add((job_id, skill_ids[canonical]))
+
+        JobSkill.objects.bulk_create(
+            [JobSkill(job_id=job_id, skill_id=skill_id) for job_id, skill_id in pairs],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_skills, migrations.RunPython.noop),
+    ]
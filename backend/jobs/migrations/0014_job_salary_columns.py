@@ -0,0 +1,132 @@
+# Generated by Django 6.0 on 2026-10-19 09:30
+
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of the jobs.salary parser as of this migration
+
+BATCH_SIZE = 2000
+DEFAULT_CURRENCY = 'PKR'
+MAX_AMOUNT = 2_147_483_647
+
+CURRENCIES = [
+    (re.compile(r'\$|\busd\b|\bdollars?\b'), 'USD'),
+    (re.compile(r'€|\beur\b|\beuros?\b'), 'EUR'),
+    (re.compile(r'£|\bgbp\b'), 'GBP'),
+    (re.compile(r'\baed\b|\bdirhams?\b'), 'AED'),
+    (re.compile(r'\bsar\b|\briyals?\b'), 'SAR'),
+    (re.compile(r'₨|\bpkr\b|\brs\.?|\brupees?\b'), 'PKR'),
+]
+
+MULTIPLIERS = {
+    'k': 1_000,
+    'thousand': 1_000,
+    'l': 100_000,
+    'lac': 100_000,
+    'lacs': 100_000,
+    'lakh': 100_000,
+    'lakhs': 100_000,
+    'm': 1_000_000,
+    'mn': 1_000_000,
+    'million': 1_000_000,
+    'cr': 10_000_000,
+    'crore': 10_000_000,
+}
+
+AMOUNT = re.compile(
+    r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*(' + '|'.join(sorted(MULTIPLIERS, key=len, reverse=True)) + r')?\b'
+)
+
+UP_TO = re.compile(r'\b(up\s*to|upto|max(?:imum)?|below|under)\b')
+AT_LEAST = re.compile(r'\+|\b(from|min(?:imum)?|at\s*least|starting|above)\b')
+
+
+def parse_salary(text):
+    if not text:
+        return None, None, DEFAULT_CURRENCY
+
+    lowered = text.lower()
+    currency = next((code for pattern, code in CURRENCIES if pattern.search(lowered)), DEFAULT_CURRENCY)
+
+    amounts = []
+    for number, unit in AMOUNT.findall(lowered):
+        try:
+            amounts.append([Decimal(number.replace(',', '')), unit])
+        except InvalidOperation:
+            continue
+    if not amounts:
+        return None, None, currency
+
+    amounts = amounts[:2]
+    if len(amounts) == 2 and not amounts[0][1] and amounts[1][1] and amounts[0][0] <= amounts[1][0]:
+        amounts[0][1] = amounts[1][1]
+    values = sorted(int(number * MULTIPLIERS.get(unit, 1)) for number, unit in amounts)
+    if values[-1] > MAX_AMOUNT:
+        return None, None, currency
+
+    if len(values) == 2:
+        return values[0], values[1], currency
+    if UP_TO.search(lowered):
+        return 0, values[0], currency
+    if AT_LEAST.search(lowered):
+        return values[0], None, currency
+    return values[0], values[0], currency
+
+
+def parse_salary_ranges(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    queryset = Job.objects.exclude(salary_range__isnull=True).exclude(salary_range='')
+
+    last_id = 0
+    while True:
+        jobs = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by('pk')
+            .only('pk', 'salary_range', 'salary_min', 'salary_max', 'salary_currency')[:BATCH_SIZE]
+        )
+        if not jobs:
+            break
+        last_id = jobs[-1].pk
+
+        for job in jobs:
+            job.salary_min, job.salary_max, job.salary_currency = parse_salary(job.salary_range)
+        Job.objects.bulk_update(jobs, ['salary_min', 'salary_max', 'salary_currency'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_backfill_job_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(default='PKR', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        # Before the indexes, so the backfill doesn't maintain them row by row
+        migrations.RunPython(parse_salary_ranges, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_min'], name='jobs_job_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_max'], name='jobs_job_salary_max_idx'),
+        ),
+    ]
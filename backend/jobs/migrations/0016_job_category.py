@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 09:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('jobs', '0015_geocoded_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='categories.category'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['category', 'is_active'], name='jobs_job_category_active_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+def start_from_posted_date(apps, schema_editor):
+    # Existing rows would otherwise all claim the migration time as their
+    # last modification in the sitemaps
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.update(updated_at=models.F('posted_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_job_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(start_from_posted_date, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,72 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import connections, models, router, transaction
+from django.utils import timezone
 from django.utils.text import slugify
+from categories.models import Category, CategoryClosure
+from locations.geocoding import apply_geocode
+from locations.models import Location
 from users.models import User
+from .salary import DEFAULT_CURRENCY, parse_salary
 
 # Create your models here.
 
 
+class DaysUntil(models.Func):
+    """Whole days from ``now`` until a datetime expression (truncated)"""
+    output_field = models.IntegerField()
+    
+    def __init__(self, expression, now, **extra):
+        super().__init__(expression, models.Value(now, output_field=models.DateTimeField()), **extra)
+    
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template="TRUNC(EXTRACT(EPOCH FROM (%(expressions)s)) / 86400)::integer",
+            arg_joiner=" - ",
+            **extra_context
+        )
+    
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context
+        )
+
+
+class JobQuerySet(models.QuerySet):
+    def with_dashboard_metrics(self):
+        """Annotate conversion_rate, days_remaining and is_expiring_soon in SQL"""
+        now = timezone.now()
+        return self.annotate(
+            conversion_rate=models.Case(
+                models.When(views__gt=0, then=models.F("applicants") * 100.0 / models.F("views")),
+                default=models.Value(0.0),
+                output_field=models.FloatField(),
+            ),
+            days_remaining=models.Case(
+                models.When(expiry_date__isnull=True, then=None),
+                models.When(expiry_date__lte=now, then=models.Value(0)),
+                default=DaysUntil("expiry_date", now),
+                output_field=models.IntegerField(),
+            ),
+            # days_remaining <= 7, expired jobs included
+            is_expiring_soon=models.Case(
+                models.When(expiry_date__lt=now + timedelta(days=8), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+    
+    def in_category(self, category):
+        """Jobs in ``category`` or any of its descendants, via the closure table"""
+        return self.filter(
+            category__in=CategoryClosure.objects.filter(ancestor=category).values("descendant")
+        )
+
+
 class Job(models.Model):
     EMPLOYMENT_TYPES = [
         ("full_time", "Full_Time"),
@@ -45,14 +107,30 @@ class Job(models.Model):
     description = models.TextField()
     logo = models.ImageField(blank=True, null=True)
     company = models.CharField(max_length=255)
+    # Indexed together with is_active in Meta
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs", db_index=False
+    )
     location = models.CharField(max_length=255)
+    # Geocoded from location on save; see locations.geocoding
+    place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs")
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     employement_type = models.CharField(max_length=25, choices=EMPLOYMENT_TYPES, default="full_time")
     salary_range = models.CharField(max_length=50, blank=True, null=True)
+    # Parsed from salary_range on save; see jobs.salary.parse_salary
+    salary_min = models.PositiveIntegerField(blank=True, null=True)
+    salary_max = models.PositiveIntegerField(blank=True, null=True)
+    salary_currency = models.CharField(max_length=3, default=DEFAULT_CURRENCY)
     posted_date = models.DateTimeField(auto_now_add=True)
+    # Bumped by save(); counter increments go through update() and leave it
+    updated_at = models.DateTimeField(auto_now=True)
     views = models.IntegerField(default=0)
     applicants = models.IntegerField(default=0)
     expiry_date = models.DateTimeField(blank=True, null=True)
     skills = models.JSONField(default=list)
+    # Normalized copy of ``skills``, kept in sync by jobs.skills.sync_job_skills
+    skill_set = models.ManyToManyField("Skill", through="JobSkill", related_name="jobs", blank=True)
     experience = models.IntegerField(default=0)
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_LEVELS)
     job_type = models.CharField(max_length=20, choices=JOB_TYPES)
@@ -61,15 +139,106 @@ class Job(models.Model):
     status = models.CharField(max_length=25, choices=STATUS_CHOICES, default="draft")
     is_active = models.BooleanField(default=True)
     
+    objects = JobQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Employer dashboard: one employer's jobs, newest first
+            models.Index(fields=["employer", "-posted_date"], name="jobs_job_employer_posted_idx"),
+            # Salary range overlap filters and numeric ordering
+            models.Index(fields=["salary_min"], name="jobs_job_salary_min_idx"),
+            models.Index(fields=["salary_max"], name="jobs_job_salary_max_idx"),
+            # Category browsing: active jobs under a set of category ids
+            models.Index(fields=["category", "is_active"], name="jobs_job_category_active_idx"),
+            # Bounding box prefilter of ?near= radius searches
+            models.Index(fields=["latitude", "longitude"], name="jobs_job_lat_lon_idx"),
+        ]
+    
     def __str__(self):
         return f"{self.title} at {self.company}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored is_active, to tell activations apart from other edits
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        return instance
+    
+    def change_event(self, adding, update_fields=None):
+        """(job_id, event_type, payload) describing this save for the outbox"""
+        loaded_is_active = getattr(self, "_loaded_is_active", None)
+        if adding:
+            event_type = "created"
+        elif loaded_is_active is not None and loaded_is_active != self.is_active:
+            event_type = "activated" if self.is_active else "deactivated"
+        else:
+            event_type = "updated"
+        payload = {
+            "slug": self.slug,
+            "is_active": self.is_active,
+            "status": self.status,
+            "fields": sorted(update_fields) if update_fields is not None else None,
+        }
+        return self.pk, event_type, payload
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(f"{self.title}-{self.company}")
-        super().save(*args, **kwargs)
+        
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "salary_range" in update_fields:
+            self.salary_min, self.salary_max, self.salary_currency = parse_salary(self.salary_range)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "salary_min", "salary_max", "salary_currency"}
+        if update_fields is None or "location" in update_fields:
+            apply_geocode(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "place", "latitude", "longitude"}
+        
+        adding = self._state.adding
+        changed_fields = kwargs.get("update_fields")
+        if not adding and update_fields is None:
+            # views and applicants only change through relative UPDATEs (and
+            # the applications trigger); never write back the possibly stale
+            # copy held by this instance
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ("views", "applicants")
+                and field.attname not in deferred
+            ]
+        
+        using = kwargs.get("using") or router.db_for_write(Job, instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            # Counter bumps aren't changes downstream consumers care about
+            if update_fields is None or not set(update_fields) <= {"views", "applicants"}:
+                JobEvent.objects.record([self.change_event(adding, changed_fields)], using=using)
+        self._loaded_is_active = self.is_active
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=100)
+    # Case-folded, whitespace-collapsed name; see jobs.skills.canonical_skill
+    canonical_name = models.CharField(max_length=100, unique=True)
+    
+    def __str__(self):
+        return self.name
 
 
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="job_skills")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="job_skills")
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "skill"], name="jobs_jobskill_job_skill_uniq"),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} {self.skill_id}"
+
 
 class SavedJob(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -77,4 +246,172 @@ class SavedJob(models.Model):
     saved_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ("user", "job")
\ No newline at end of file
+        unique_together = ("user", "job")
+
+
+class JobDailyStats(models.Model):
+    """Per-job activity rollup, one row per day (or per week once compacted)"""
+    PERIOD_CHOICES = [
+        ("day", "Day"),
+        ("week", "Week"),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="daily_stats")
+    day = models.DateField()
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES, default="day")
+    views = models.PositiveIntegerField(default=0)
+    applicants = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            # Also the index behind per-job range scans over days
+            models.UniqueConstraint(fields=["job", "day"], name="jobs_dailystats_job_day_uniq"),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} {self.period} {self.day}"
+
+
+class ApplicationManager(models.Manager):
+    def apply(self, job, applicant, resume=""):
+        """Create the application unless one exists; return (id, created)
+
+        A single INSERT ... ON CONFLICT DO NOTHING, so concurrent or repeated
+        requests can't create duplicates or fail on the unique constraint.
+        On PostgreSQL Job.applicants is updated by the jobs_application
+        trigger; elsewhere it is incremented in the same transaction, and
+        decremented by uncount_deleted when an application is deleted.
+        """
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (job_id, applicant_id, resume, status, created_at) "
+                f"VALUES (%s, %s, %s, %s, %s) "
+                f"ON CONFLICT (job_id, applicant_id) DO NOTHING RETURNING id",
+                [job.pk, applicant.pk, resume, "submitted", timezone.now()],
+            )
+            row = cursor.fetchone()
+            if row and connection.vendor != "postgresql":
+                Job.objects.using(using).filter(pk=job.pk).update(applicants=models.F("applicants") + 1)
+        if row:
+            return row[0], True
+        
+        existing = self.using(using).filter(job=job, applicant=applicant).values_list("id", flat=True).get()
+        return existing, False
+    
+    def uncount_deleted(self, application, using):
+        """Decrement Job.applicants for a deleted application, off PostgreSQL
+        
+        Called from post_delete, so admin, queryset and cascading deletes
+        are all counted; the PostgreSQL trigger covers them there.
+        """
+        if connections[using].vendor == "postgresql":
+            return
+        Job.objects.using(using).filter(pk=application.job_id, applicants__gt=0).update(
+            applicants=models.F("applicants") - 1
+        )
+
+
+class Application(models.Model):
+    STATUS_CHOICES = [
+        ("submitted", "Submitted"),
+        ("reviewed", "Reviewed"),
+        ("shortlisted", "Shortlisted"),
+        ("rejected", "Rejected"),
+        ("hired", "Hired"),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="applications")
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name="applications")
+    # Path of the applicant's resume when they applied; later uploads don't change it
+    resume = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="submitted")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = ApplicationManager()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "applicant"], name="jobs_application_job_applicant_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["applicant", "-created_at"], name="jobs_app_applicant_created_idx"),
+        ]
+    
+    def __str__(self):
+        return f"{self.applicant_id} -> {self.job_id} ({self.status})"
+
+
+# NOTIFY channel announcing new outbox rows
+JOB_EVENTS_CHANNEL = "job_events"
+
+
+class JobEventManager(models.Manager):
+    def record(self, events, using=None):
+        """Append (job_id, event_type, payload) rows to the outbox
+
+        Call inside the transaction making the change, so the events commit
+        or roll back with it. On PostgreSQL each row carries the writing
+        transaction's id; consumers use it to never skip a row that
+        commits after a later-numbered one.
+        """
+        if not events:
+            return
+        using = using or router.db_for_write(self.model)
+        transaction_id = 0
+        if connections[using].vendor == "postgresql":
+            # The NOTIFY is delivered when the transaction commits; it wakes
+            # the job stream readers (jobs.stream)
+            with connections[using].cursor() as cursor:
+                cursor.execute("SELECT txid_current(), pg_notify(%s, '')", [JOB_EVENTS_CHANNEL])
+                transaction_id = cursor.fetchone()[0]
+        self.using(using).bulk_create([
+            self.model(job_id=job_id, event_type=event_type, payload=payload, transaction_id=transaction_id)
+            for job_id, event_type, payload in events
+        ], batch_size=5000)
+
+
+class JobEvent(models.Model):
+    """Transactional outbox of Job changes, read in order by jobs.outbox"""
+    EVENT_TYPES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("activated", "Activated"),
+        ("deactivated", "Deactivated"),
+        ("deleted", "Deleted"),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    # Not a foreign key: events outlive deleted jobs
+    job_id = models.BigIntegerField()
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    payload = models.JSONField(default=dict)
+    # txid_current() of the writing transaction on PostgreSQL, else 0
+    transaction_id = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = JobEventManager()
+    
+    class Meta:
+        indexes = [
+            # Consumers page through (transaction_id, id)
+            models.Index(fields=["transaction_id", "id"], name="jobs_jobevent_position_idx"),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} {self.job_id}"
+
+
+class JobEventConsumer(models.Model):
+    """Checkpoint of one outbox consumer: the last event it processed"""
+    name = models.CharField(max_length=100, unique=True)
+    position_transaction = models.BigIntegerField(default=0)
+    position_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.position_transaction}:{self.position_id}"
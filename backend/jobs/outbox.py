@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from .models import JobEvent, JobEventConsumer
+
+
+def visible_events(using):
+    """Events no still-running transaction can get ahead of
+
+    On PostgreSQL only rows written by transactions older than the oldest
+    one in progress are returned: any event a running transaction adds
+    later sorts after them, so advancing past them never skips a row.
+    """
+    events = JobEvent.objects.using(using)
+    if connections[using].vendor == "postgresql":
+        events = events.filter(transaction_id__lt=RawSQL("txid_snapshot_xmin(txid_current_snapshot())", []))
+    return events
+
+
+def events_after(position_transaction, position_id, limit, using):
+    return list(
+        visible_events(using)
+        .filter(
+            Q(transaction_id__gt=position_transaction)
+            | Q(transaction_id=position_transaction, id__gt=position_id)
+        )
+        .order_by("transaction_id", "id")[:limit]
+    )
+
+
+@contextmanager
+def claim_batch(consumer, limit=500):
+    """Claim the next batch of events for ``consumer``
+
+    Yields the events after the consumer's checkpoint, or None while
+    another worker of the same consumer holds its checkpoint row
+    (SELECT ... FOR UPDATE SKIP LOCKED). The checkpoint moves past the
+    batch when the block exits cleanly; an exception leaves it where it
+    was, so delivery is at least once.
+
+        with claim_batch("search") as events:
+            for event in events or []:
+                index(event)
+    """
+    using = router.db_for_write(JobEventConsumer)
+    JobEventConsumer.objects.using(using).get_or_create(name=consumer)
+    with transaction.atomic(using=using):
+        checkpoint = (
+            JobEventConsumer.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(name=consumer)
+            .first()
+        )
+        if checkpoint is None:
+            yield None
+            return
+
+        events = events_after(checkpoint.position_transaction, checkpoint.position_id, limit, using)
+        yield events
+        if events:
+            checkpoint.position_transaction = events[-1].transaction_id
+            checkpoint.position_id = events[-1].id
+            checkpoint.save(update_fields=["position_transaction", "position_id", "updated_at"])
+
+
+def prune_events(keep_days=7):
+    """Delete events older than ``keep_days`` that every consumer has passed"""
+    using = router.db_for_write(JobEvent)
+    events = JobEvent.objects.using(using).filter(created_at__lt=timezone.now() - timedelta(days=keep_days))
+    slowest = (
+        JobEventConsumer.objects.using(using)
+        .order_by("position_transaction", "position_id")
+        .values_list("position_transaction", "position_id")
+        .first()
+    )
+    if slowest is not None:
+        events = events.filter(
+            Q(transaction_id__lt=slowest[0]) | Q(transaction_id=slowest[0], id__lte=slowest[1])
+        )
+    deleted, _ = events.delete()
+    return deleted
@@ -1,7 +1,28 @@
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from config.pagination import ApproximateCountPaginator
 
 class JobPagination(PageNumberPagination):
-    """Custom pagination for jobs"""
+    """Custom pagination for jobs
+
+    ``count`` is a planner estimate for large result sets; see
+    config.pagination. ``count_is_approximate`` says when it is.
+    """
     page_size = 20
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+    django_paginator_class = ApproximateCountPaginator
+    
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_approximate": self.page.paginator.is_approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {"type": "boolean", "example": False}
+        return response_schema
@@ -0,0 +1,112 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+DEFAULT_CURRENCY = "PKR"
+
+# Largest value the salary_min/salary_max integer columns hold
+MAX_AMOUNT = 2_147_483_647
+
+CURRENCIES = [
+    (re.compile(r"\$|\busd\b|\bdollars?\b"), "USD"),
+    (re.compile(r"€|\beur\b|\beuros?\b"), "EUR"),
+    (re.compile(r"£|\bgbp\b"), "GBP"),
+    (re.compile(r"\baed\b|\bdirhams?\b"), "AED"),
+    (re.compile(r"\bsar\b|\briyals?\b"), "SAR"),
+    (re.compile(r"₨|\bpkr\b|\brs\.?|\brupees?\b"), "PKR"),
+]
+
+MULTIPLIERS = {
+    "k": 1_000,
+    "thousand": 1_000,
+    "l": 100_000,
+    "lac": 100_000,
+    "lacs": 100_000,
+    "lakh": 100_000,
+    "lakhs": 100_000,
+    "m": 1_000_000,
+    "mn": 1_000_000,
+    "million": 1_000_000,
+    "cr": 10_000_000,
+    "crore": 10_000_000,
+}
+
+# A number with optional thousands separators and an optional unit, e.g.
+# "80,000", "1.5 lac", "120k"
+AMOUNT = re.compile(
+    r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*(" + "|".join(sorted(MULTIPLIERS, key=len, reverse=True)) + r")?\b"
+)
+
+UP_TO = re.compile(r"\b(up\s*to|upto|max(?:imum)?|below|under)\b")
+AT_LEAST = re.compile(r"\+|\b(from|min(?:imum)?|at\s*least|starting|above)\b")
+
+
+def parse_salary(text):
+    """Parse a free-text salary into (salary_min, salary_max, currency)
+
+    Handles ranges ("50k-80k", "80,000 - 1.2 lac"), single amounts, "up to"
+    and open-ended ("100k+") values. Amounts are whole units of the stated
+    currency; the pay period is not normalized. Unparseable text such as
+    "Negotiable" gives (None, None, currency).
+    """
+    if not text:
+        return None, None, DEFAULT_CURRENCY
+
+    lowered = text.lower()
+    currency = next((code for pattern, code in CURRENCIES if pattern.search(lowered)), DEFAULT_CURRENCY)
+
+    amounts = []
+    for number, unit in AMOUNT.findall(lowered):
+        try:
+            amounts.append([Decimal(number.replace(",", "")), unit])
+        except InvalidOperation:
+            continue
+    if not amounts:
+        return None, None, currency
+
+    amounts = amounts[:2]
+    # "50-80k": a unit on the upper bound applies to a smaller bare lower bound
+    if len(amounts) == 2 and not amounts[0][1] and amounts[1][1] and amounts[0][0] <= amounts[1][0]:
+        amounts[0][1] = amounts[1][1]
+    values = sorted(int(number * MULTIPLIERS.get(unit, 1)) for number, unit in amounts)
+    if values[-1] > MAX_AMOUNT:
+        return None, None, currency
+
+    if len(values) == 2:
+        return values[0], values[1], currency
+    if UP_TO.search(lowered):
+        return 0, values[0], currency
+    if AT_LEAST.search(lowered):
+        return values[0], None, currency
+    return values[0], values[0], currency
+
+
+def backfill_salaries(job_model, batch_size=2000, only_missing=False):
+    """Parse salary_range into the numeric columns, one primary key range at a time
+
+    Used by the backfill_salaries command; migration 0014 keeps its own
+    frozen copy. Returns the number of jobs updated.
+    """
+    queryset = job_model.objects.exclude(salary_range__isnull=True).exclude(salary_range="")
+    if only_missing:
+        queryset = queryset.filter(salary_min__isnull=True, salary_max__isnull=True)
+
+    updated = 0
+    last_id = 0
+    while True:
+        jobs = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by("pk")
+            .only("pk", "salary_range", "salary_min", "salary_max", "salary_currency")[:batch_size]
+        )
+        if not jobs:
+            return updated
+        last_id = jobs[-1].pk
+
+        changed = []
+        for job in jobs:
+            parsed = parse_salary(job.salary_range)
+            if parsed != (job.salary_min, job.salary_max, job.salary_currency):
+                job.salary_min, job.salary_max, job.salary_currency = parsed
+                changed.append(job)
+        job_model.objects.bulk_update(changed, ["salary_min", "salary_max", "salary_currency"])
+        updated += len(changed)
@@ -6,11 +6,12 @@ from .models import Job
 class JobListSerializer(serializers.ModelSerializer):
     days_ago = serializers.SerializerMethodField()
     is_new = serializers.SerializerMethodField()
+    distance = serializers.SerializerMethodField()
     
     class Meta:
         model = Job
-        fields = ["id", "title", "slug", "description", "requirements", "skills", "benefits", "experience", "company", "location", "job_type", "employement_type", "experience_level", "salary_range", "posted_date", "days_ago", "is_new", "status"]
-        read_only_fields = ["slug", "posted_date"]
+        fields = ["id", "title", "slug", "description", "requirements", "skills", "benefits", "experience", "company", "category", "location", "job_type", "employement_type", "experience_level", "salary_range", "salary_min", "salary_max", "salary_currency", "latitude", "longitude", "distance", "posted_date", "days_ago", "is_new", "status"]
+        read_only_fields = ["slug", "posted_date", "salary_min", "salary_max", "salary_currency", "latitude", "longitude"]
     
     def get_days_ago(self, obj):
         """Calculate how many days ago the job was posted"""
@@ -27,6 +28,11 @@ class JobListSerializer(serializers.ModelSerializer):
             delta = timezone.now() - obj.posted_date
             return delta.days <= 7
         return False 
+    
+    def get_distance(self, obj):
+        """Distance in km, only set for ?near= searches"""
+        distance = getattr(obj, "distance", None)
+        return round(distance, 2) if distance is not None else None
 
 
 class JobDetailSerializer(serializers.ModelSerializer):
@@ -38,8 +44,8 @@ class JobDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
-        fields = ["id", "title", "slug", "description", "company", "skills", "experience", "experience_level", "experience_level_display", "location", "job_type", "job_type_display", "employement_type", "employement_type_display", "views", "applicants", "requirements", "benefits", "salary_range", "posted_date", "expiry_date", "is_expired", "status", "is_active"]
-        read_only_fields = ["slug", "posted_date", "views", "applicants"]
+        fields = ["id", "title", "slug", "description", "company", "skills", "experience", "experience_level", "experience_level_display", "category", "location", "job_type", "job_type_display", "employement_type", "employement_type_display", "views", "applicants", "requirements", "benefits", "salary_range", "salary_min", "salary_max", "salary_currency", "latitude", "longitude", "posted_date", "expiry_date", "is_expired", "status", "is_active"]
+        read_only_fields = ["slug", "posted_date", "views", "applicants", "salary_min", "salary_max", "salary_currency", "latitude", "longitude"]
         
     def get_is_expired(self, obj):
         """Check if job posting has expired"""
@@ -55,7 +61,7 @@ class JobCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
-        fields = ["title", "slug", "description", "company", "logo", "skills", "experience", "experience_level", "location", "job_type", "employement_type", "requirements", "benefits", "salary_range", "expiry_date", "status", "is_active"]
+        fields = ["title", "slug", "description", "company", "logo", "skills", "experience", "experience_level", "category", "location", "job_type", "employement_type", "requirements", "benefits", "salary_range", "expiry_date", "status", "is_active"]
         read_only_fields = ["is_active","slug"]
     
     def validate(self, data):
@@ -104,8 +110,8 @@ class JobUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = [
-            "title", "description", "company", "skills", 
-            "experience", "location", "job_type", 
+            "title", "slug", "description", "company", "skills", 
+            "experience", "category", "location", "job_type", 
             "employement_type", "experience_level", 
             "requirements", "benefits", "salary_range", 
             "expiry_date", "status", "is_active"
@@ -117,34 +123,18 @@ class JobUpdateSerializer(serializers.ModelSerializer):
         
 
 class EmployerJobListSerializer(serializers.ModelSerializer):
+    """Expects a queryset from Job.objects.with_dashboard_metrics()"""
     conversion_rate = serializers.SerializerMethodField()
-    days_remainig = serializers.SerializerMethodField()
-    is_expiring_soon = serializers.SerializerMethodField()
+    days_remaining = serializers.IntegerField(read_only=True)
+    is_expiring_soon = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Job
-        fields = ["id", "title", "slug", "company", "location", "views", "applicants", "job_type", "employement_type", "experience_level", "salary_range", "conversion_rate", "days_remainig", "is_expiring_soon", "posted_date", "status"]
+        fields = ["id", "title", "slug", "company", "location", "views", "applicants", "job_type", "employement_type", "experience_level", "salary_range", "conversion_rate", "days_remaining", "is_expiring_soon", "posted_date", "expiry_date", "status", "is_active"]
         
     def get_conversion_rate(self, obj):
-        """Calculate view to application conversion rate"""
-       
-        if obj.views > 0:
-            return round((obj.applicants / obj.views) * 100, 2)
-        return 0
-    
-    def get_days_remaining(self, obj):
-        """Calculate days until expiry"""
-        
-        if obj.expiry_date:
-            delta = obj.expiry_date - timezone.now()
-            return max(delta.days, 0)
-        return None
-    
-    def get_is_expiring_soon(self, obj):
-        """Check if job expires within 7 days"""
-        
-        days_remaining = self.get_days_remaining(obj)
-        return days_remaining is not None and days_remaining <= 7
+        """View to application conversion rate, annotated in SQL"""
+        return round(obj.conversion_rate, 2)
 
 
 class AdminJobSerializer(serializers.ModelSerializer):
@@ -0,0 +1,101 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from categories.models import Category
+from .detail_cache import VOLATILE_FIELDS, invalidate_job_details
+from .models import Application, Job, JobEvent, SavedJob
+from .skills import sync_job_skills
+from .stats import stats_buffer
+
+
+@receiver(post_save, sender=SavedJob)
+def count_saved_job(sender, instance, created, **kwargs):
+    if created:
+        stats_buffer.add(instance.job_id, saves=1)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_deleted_application(sender, instance, using, **kwargs):
+    Application.objects.uncount_deleted(instance, using)
+
+
+@receiver(post_save, sender=Job)
+def sync_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "skills" in update_fields:
+        sync_job_skills([(instance.pk, instance.skills)])
+
+
+def counted_category(job):
+    """Category whose job_count includes ``job``: None unless it is active"""
+    return job.category_id if job.is_active else None
+
+
+@receiver(pre_save, sender=Job)
+def remember_counted_category(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {"category", "category_id", "is_active"} & set(update_fields):
+        # Neither column is written, so the count can't change
+        instance._counted_category = counted_category(instance)
+        return
+    previous = None
+    if not instance._state.adding:
+        previous = Job.objects.filter(pk=instance.pk).values_list("category_id", "is_active").first()
+    instance._counted_category = previous[0] if previous and previous[1] else None
+
+
+@receiver(post_save, sender=Job)
+def update_category_counts(sender, instance, raw=False, **kwargs):
+    before = getattr(instance, "_counted_category", None)
+    after = counted_category(instance)
+    if before != after:
+        Category.objects.adjust_job_counts({before: -1, after: 1})
+
+
+@receiver(post_delete, sender=Job)
+def uncount_deleted_job(sender, instance, **kwargs):
+    Category.objects.adjust_job_counts({counted_category(instance): -1})
+
+
+# Cache entries are dropped after the commit: dropped earlier, a concurrent
+# miss could cache the row as it was before the change
+
+@receiver(post_save, sender=Job)
+def invalidate_cached_detail(sender, instance, using, update_fields=None, **kwargs):
+    # Counter-only saves don't touch the cached body; counters are read live
+    if update_fields is not None and set(update_fields) <= set(VOLATILE_FIELDS):
+        return
+    transaction.on_commit(partial(invalidate_job_details, [instance.pk], [instance.slug]), using=using)
+
+
+@receiver(post_delete, sender=Job)
+def drop_cached_detail(sender, instance, using, **kwargs):
+    transaction.on_commit(partial(invalidate_job_details, [instance.pk], [instance.slug]), using=using)
+
+
+@receiver(post_delete, sender=Job)
+def record_deleted_job(sender, instance, using, **kwargs):
+    # Runs inside the deletion's transaction
+    JobEvent.objects.record(
+        [(instance.pk, "deleted", {"slug": instance.slug, "is_active": instance.is_active, "status": instance.status})],
+        using=using,
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def uncount_deleted_category(sender, instance, using, **kwargs):
+    # Its jobs become uncategorized; the surviving ancestors stop counting
+    # them. Deleted descendants get their own signal.
+    # Their category is about to be cleared
+    jobs = list(Job.objects.filter(category=instance).values_list("pk", "slug", "is_active", "status"))
+    transaction.on_commit(partial(invalidate_job_details, [job_id for job_id, *_ in jobs]), using=using)
+    JobEvent.objects.record([
+        (job_id, "updated", {"slug": slug, "is_active": is_active, "status": status, "fields": ["category"]})
+        for job_id, slug, is_active, status in jobs
+    ])
+    direct = Job.objects.filter(category=instance, is_active=True).count()
+    if direct:
+        Category.objects.filter(descendant_links__descendant=instance).exclude(pk=instance.pk).update(
+            job_count=F("job_count") - direct
+        )
@@ -0,0 +1,62 @@
+from django.db.models import Count
+from .models import JobSkill, Skill
+
+
+def canonical_skill(name):
+    """Case-folded, whitespace-collapsed form used to match skills"""
+    return " ".join(str(name).split()).casefold()[:100]
+
+
+def sync_job_skills(jobs):
+    """Make JobSkill match the ``skills`` list of each (job_id, skills) pair
+
+    Missing Skill rows are created, first spelling wins for the display name.
+    Used by Job saves and by the bulk paths that bypass Job.save().
+    """
+    wanted = {}
+    names = {}
+    for job_id, skills in jobs:
+        wanted[job_id] = set()
+        for name in skills or []:
+            canonical = canonical_skill(name)
+            if canonical:
+                wanted[job_id].add(canonical)
+                names.setdefault(canonical, " ".join(str(name).split())[:100])
+    if not wanted:
+        return
+
+    Skill.objects.bulk_create(
+        [Skill(name=name, canonical_name=canonical) for canonical, name in names.items()],
+        ignore_conflicts=True,
+    )
+    skill_ids = dict(Skill.objects.filter(canonical_name__in=names).values_list("canonical_name", "id"))
+
+    wanted_ids = {
+        (job_id, skill_ids[canonical]) for job_id, canonicals in wanted.items() for canonical in canonicals
+    }
+    existing = {
+        (job_id, skill_id): pk
+        for pk, job_id, skill_id in JobSkill.objects.filter(job_id__in=wanted).values_list("pk", "job_id", "skill_id")
+    }
+
+    stale = [pk for pair, pk in existing.items() if pair not in wanted_ids]
+    if stale:
+        JobSkill.objects.filter(pk__in=stale).delete()
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=job_id, skill_id=skill_id) for job_id, skill_id in wanted_ids - existing.keys()],
+        ignore_conflicts=True,
+    )
+
+
+def filter_by_skills(queryset, skills, mode="all"):
+    """Filter jobs having all (or, with mode="any", at least one) of ``skills``
+
+    Matched through JobSkill on canonical names, so ``?skills=python``
+    finds jobs listing "Python". Job.skills keeps the spellings as posted,
+    which is why JSON containment on it isn't used.
+    """
+    canonicals = {canonical_skill(skill) for skill in skills}
+    matches = JobSkill.objects.filter(skill__canonical_name__in=canonicals)
+    if mode != "any":
+        matches = matches.values("job").annotate(matched=Count("skill")).filter(matched=len(canonicals))
+    return queryset.filter(pk__in=matches.values("job"))
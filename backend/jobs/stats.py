@@ -0,0 +1,128 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router
+from django.utils import timezone
+from .models import Job, JobDailyStats
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("views", "applicants", "saves")
+
+
+def upsert_daily_stats(rows, period="day", using=None):
+    """Add (job_id, day, views, applicants, saves) rows onto JobDailyStats
+
+    One INSERT ... ON CONFLICT (job_id, day) DO UPDATE per call, so existing
+    rows are incremented instead of overwritten. Works on PostgreSQL and SQLite.
+    """
+    if not rows:
+        return
+    using = using or router.db_for_write(JobDailyStats)
+    connection = connections[using]
+    table = connection.ops.quote_name(JobDailyStats._meta.db_table)
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows))
+    updates = ", ".join(f"{name} = {table}.{name} + EXCLUDED.{name}" for name in COUNTERS)
+    params = [value for row in rows for value in (row[0], row[1], period, *row[2:])]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (job_id, day, period, views, applicants, saves) "
+            f"VALUES {placeholders} "
+            f"ON CONFLICT (job_id, day) DO UPDATE SET {updates}",
+            params,
+        )
+
+
+class DailyStatsBuffer:
+    """Collect counter increments in memory and write them in batches
+
+    Increments are summed per (job, day) and flushed with a single upsert once
+    JOB_STATS_BATCH_SIZE distinct rows are pending. A timer started by the
+    first pending increment flushes the rest after JOB_STATS_FLUSH_INTERVAL
+    seconds, so nothing waits longer than that for more traffic. Whatever is
+    left is flushed when the process exits.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.timer = None
+
+    def add(self, job_id, **counts):
+        day = timezone.localdate()
+        with self.lock:
+            self.pending.setdefault((job_id, day), Counter()).update(counts)
+            due = len(self.pending) >= settings.JOB_STATS_BATCH_SIZE
+            if not due and self.timer is None:
+                self.timer = threading.Timer(settings.JOB_STATS_FLUSH_INTERVAL, self.flush_on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+        if due:
+            self.flush()
+
+    def flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Connections are per thread; the timer's would be left open
+            connections.close_all()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return
+
+        # Jobs deleted since their increment was buffered would fail the FK
+        existing = set(
+            Job.objects.filter(pk__in={job_id for job_id, _ in pending}).values_list("pk", flat=True)
+        )
+        rows = [
+            (job_id, day, *(counts[name] for name in COUNTERS))
+            for (job_id, day), counts in pending.items()
+            if job_id in existing
+        ]
+        try:
+            upsert_daily_stats(rows)
+        except Exception:
+            logger.exception("Dropped %s daily stats rows", len(rows))
+
+
+stats_buffer = DailyStatsBuffer()
+atexit.register(stats_buffer.flush)
+
+
+def daily_series(rows, start, end):
+    """Turn rollup rows into a dense series from ``start`` to ``end``
+
+    ``rows`` are dicts with day, period and the counters, and should reach
+    back six days before ``start`` so a compacted week overlapping it is
+    found. Days without a row are zero-filled. A compacted week is emitted
+    once, on its first day, and covers the following six days.
+    """
+    by_day = {}
+    for row in rows:
+        point = by_day.setdefault(row["day"], {"day": row["day"], "period": row["period"], **{name: 0 for name in COUNTERS}})
+        for name in COUNTERS:
+            point[name] += row[name] or 0
+
+    day = start
+    for offset in range(1, 7):
+        earlier = by_day.get(start - timedelta(days=offset))
+        if earlier and earlier["period"] == "week":
+            day = earlier["day"]
+
+    series = []
+    while day <= end:
+        point = by_day.get(day) or {"day": day, "period": "day", **{name: 0 for name in COUNTERS}}
+        series.append(point)
+        day += timedelta(days=7 if point["period"] == "week" else 1)
+    return series
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router
+from django.utils import timezone
+from .models import JOB_EVENTS_CHANNEL, Job
+from .outbox import events_after, visible_events
+from .serializers import JobListSerializer
+
+logger = logging.getLogger(__name__)
+
+# Events after which a job may appear in, or change within, a listing
+LIVE_EVENTS = {"created", "updated", "activated"}
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class StreamClient:
+    """One connected browser: its listing filter and a bounded buffer
+
+    ``key`` identifies the filter (the normalized query string) so clients
+    with the same filter share one match query per batch. A client that
+    falls ``JOB_STREAM_BUFFER`` messages behind is sent a single "reset"
+    event and disconnected; it should reload the listing and reconnect.
+    """
+
+    def __init__(self, key, queryset):
+        self.key = key
+        self.queryset = queryset
+        self.queue = asyncio.Queue(maxsize=settings.JOB_STREAM_BUFFER)
+        self.closed = False
+
+    def push(self, message):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(sse("reset", {"reason": "buffer_full"}))
+            self.closed = True
+
+    async def messages(self):
+        """SSE chunks for the response, with a comment line as heartbeat"""
+        yield f"retry: {settings.JOB_STREAM_HEARTBEAT * 1000}\n\n"
+        while not (self.closed and self.queue.empty()):
+            try:
+                yield await asyncio.wait_for(self.queue.get(), settings.JOB_STREAM_HEARTBEAT)
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+
+
+class JobStream:
+    """Per-process fan-out of Job outbox events to StreamClients
+
+    A single reader follows the outbox while anyone is connected. On
+    PostgreSQL it holds one LISTEN connection and wakes on the NOTIFY sent
+    by JobEventManager.record at commit; it also polls every
+    JOB_STREAM_POLL_INTERVAL seconds, which is all it does elsewhere. Each
+    batch costs one query for the jobs plus one per distinct client filter.
+
+        job: a created/updated/activated job matching the client's filter
+        removed: {"id", "reason"}, sent to everyone, for jobs deactivated,
+            deleted, expired, or updated out of the client's filter
+    """
+
+    def __init__(self):
+        self.clients = set()
+        self.reader = None
+
+    def subscribe(self, client):
+        self.clients.add(client)
+        if self.reader is None or self.reader.done():
+            self.reader = asyncio.get_running_loop().create_task(self.run())
+
+    def unsubscribe(self, client):
+        self.clients.discard(client)
+        if not self.clients and self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
+
+    async def run(self):
+        using = router.db_for_write(Job)
+        position = await sync_to_async(latest_position)(using)
+        expiry_checked = timezone.now()
+        listener = await open_listener(using)
+        try:
+            while True:
+                await wait_for_notify(listener, settings.JOB_STREAM_POLL_INTERVAL)
+                while True:
+                    events = await sync_to_async(events_after)(*position, 1000, using)
+                    if events:
+                        position = (events[-1].transaction_id, events[-1].id)
+                        await self.publish(events, using)
+                    if len(events) < 1000:
+                        break
+
+                now = timezone.now()
+                expired = await sync_to_async(expired_jobs)(expiry_checked, now, using)
+                expiry_checked = now
+                for job_id in expired:
+                    self.broadcast(sse("removed", {"id": job_id, "reason": "expired"}))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Job stream reader failed")
+            for client in list(self.clients):
+                client.push(sse("reset", {"reason": "error"}))
+                client.closed = True
+        finally:
+            if listener is not None:
+                await listener.close()
+
+    def broadcast(self, message):
+        for client in list(self.clients):
+            client.push(message)
+
+    async def publish(self, events, using):
+        # The latest event of a job decides what clients are told
+        latest = {event.job_id: event for event in events}
+        live = [job_id for job_id, event in latest.items() if event.event_type in LIVE_EVENTS]
+        for job_id, event in latest.items():
+            if event.event_type not in LIVE_EVENTS:
+                self.broadcast(sse("removed", {"id": job_id, "reason": event.event_type}))
+        if not live or not self.clients:
+            return
+
+        filters = {client.key: client.queryset for client in self.clients}
+        jobs, matches = await sync_to_async(match_live_jobs)(live, filters, using)
+        for client in list(self.clients):
+            if client.key not in matches:
+                # Connected while the batch was being matched
+                continue
+            for job_id in live:
+                if job_id in matches[client.key]:
+                    client.push(sse("job", {"event": latest[job_id].event_type, "job": jobs[job_id]}))
+                elif latest[job_id].event_type == "updated":
+                    client.push(sse("removed", {"id": job_id, "reason": "updated"}))
+
+
+def latest_position(using):
+    last = (
+        visible_events(using)
+        .order_by("-transaction_id", "-id")
+        .values_list("transaction_id", "id")
+        .first()
+    )
+    return last or (0, 0)
+
+
+def expired_jobs(after, until, using):
+    return list(
+        Job.objects.using(using)
+        .filter(is_active=True, expiry_date__gt=after, expiry_date__lte=until)
+        .values_list("pk", flat=True)
+    )
+
+
+def match_live_jobs(job_ids, filters, using):
+    """Serialized jobs by id, and the ids each filter's queryset admits"""
+    jobs = {
+        job.pk: JobListSerializer(job).data
+        for job in Job.objects.using(using).filter(pk__in=job_ids)
+    }
+    matches = {
+        key: set(queryset.using(using).filter(pk__in=jobs).values_list("pk", flat=True))
+        for key, queryset in filters.items()
+    }
+    return jobs, matches
+
+
+async def open_listener(using):
+    """A LISTEN connection on the job events channel, or None off PostgreSQL"""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    import psycopg
+
+    params = connection.get_connection_params()
+    params.pop("cursor_factory", None)
+    listener = await psycopg.AsyncConnection.connect(**params, autocommit=True)
+    await listener.execute(f"LISTEN {JOB_EVENTS_CHANNEL}")
+    return listener
+
+
+async def wait_for_notify(listener, timeout):
+    """Return after the next NOTIFY, or after ``timeout`` seconds
+
+    A notification missed while a batch was being published only delays
+    its events until the next poll; the outbox, not the payload, is what
+    the reader follows.
+    """
+    if listener is None:
+        await asyncio.sleep(timeout)
+        return
+    try:
+        async with asyncio.timeout(timeout):
+            async for _ in listener.notifies():
+                break
+    except TimeoutError:
+        pass
+
+
+job_stream = JobStream()
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.tasks import task
+from categories.models import Category
+from users.models import User
+from .feeds import generate_feeds
+
+
+@task(priority=-10)
+def regenerate_feeds(force=False):
+    """generate_feeds off the request path, e.g. after a bulk import"""
+    written, removed = generate_feeds(force=force)
+    return {"written": written, "removed": removed}
+
+
+@task(priority=-10)
+def rebuild_category_counts():
+    return Category.objects.rebuild_job_counts()
+
+
+@task
+def import_job_feed(name, employer_id):
+    """Run a feed uploaded through the admin (JOB_IMPORTS_ROOT/<name>)
+
+    The report is written to <name>.report.jsonl and the feed is removed
+    once it has been imported.
+    """
+    # importers enqueues the tasks above, so it can't be imported at module level
+    from .importers import JobImporter, read_rows
+
+    feed_path = Path(settings.JOB_IMPORTS_ROOT) / name
+    fmt = feed_path.suffix.lstrip(".")
+    employer = User.objects.get(pk=employer_id)
+    with (
+        feed_path.open(newline="", encoding="utf-8", errors="surrogateescape") as feed,
+        feed_path.with_name(f"{name}.report.jsonl").open("w") as report,
+    ):
+        totals = JobImporter(employer, report).run(read_rows(feed, fmt))
+    feed_path.unlink()
+    return totals
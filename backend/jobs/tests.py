@@ -1,3 +1,345 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+from pathlib import Path
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from locations import geocoding
+from users.models import User
+from .importers import UnreadableRow, read_rows
+from .models import Application, Job, JobDailyStats, JobEvent, JobEventConsumer
+from .outbox import claim_batch
+from .salary import parse_salary
+from .stats import DailyStatsBuffer
+from .tasks import import_job_feed
+
+
+def make_user(email, **fields):
+    return User.objects.create_user(email, password="x", username=email.split("@")[0], **fields)
+
+
+def make_job(employer, **fields):
+    fields = {
+        "title": "Backend Engineer",
+        "description": "Build APIs",
+        "company": "Acme",
+        "location": "Lahore",
+        "experience_level": "mid",
+        "job_type": "onsite",
+        "status": "published",
+        **fields,
+    }
+    return Job.objects.create(employer=employer, **fields)
+
+
+class ParseSalaryTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_salary("50k-80k"), (50000, 80000, "PKR"))
+        self.assertEqual(parse_salary("80,000 - 1.2 lac"), (80000, 120000, "PKR"))
+        self.assertEqual(parse_salary("$3,000 - $4,500"), (3000, 4500, "USD"))
+
+    def test_unit_on_upper_bound_applies_to_lower(self):
+        self.assertEqual(parse_salary("50-80k"), (50000, 80000, "PKR"))
+
+    def test_single_amounts(self):
+        self.assertEqual(parse_salary("Rs. 60000"), (60000, 60000, "PKR"))
+        self.assertEqual(parse_salary("€ 40000"), (40000, 40000, "EUR"))
+        self.assertEqual(parse_salary("2.5 crore"), (25000000, 25000000, "PKR"))
+
+    def test_open_ended(self):
+        self.assertEqual(parse_salary("Up to 150k"), (0, 150000, "PKR"))
+        self.assertEqual(parse_salary("100k+"), (100000, None, "PKR"))
+
+    def test_unparseable(self):
+        self.assertEqual(parse_salary("Negotiable"), (None, None, "PKR"))
+        self.assertEqual(parse_salary(""), (None, None, "PKR"))
+        self.assertEqual(parse_salary(None), (None, None, "PKR"))
+
+    def test_out_of_column_range(self):
+        self.assertEqual(parse_salary("999999999999"), (None, None, "PKR"))
+
+
+class ReadRowsTests(SimpleTestCase):
+    def read(self, content, fmt):
+        feed = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8", errors="surrogateescape", newline="")
+        return list(read_rows(feed, fmt))
+
+    def test_jsonl_bad_lines_are_rejected_one_by_one(self):
+        rows = self.read(b'{"title": "A"}\n[1, 2]\n{"title": \n\n{"title": "Caf\xe9"}\n{"title": "B"}\n', "jsonl")
+        self.assertEqual(rows[0], {"title": "A"})
+        self.assertEqual(rows[-1], {"title": "B"})
+        self.assertEqual(
+            [row.error.split(":")[0] for row in rows[1:-1]],
+            ["Each line must be a JSON object", "Malformed JSON", "Not valid UTF-8"],
+        )
+
+    def test_csv_list_cells(self):
+        rows = self.read(
+            b'title,skills,benefits\nA,"[""Go"", ""SQL""]",Lunch; Gym\nB,"[bad",\nC\xff,Go,\n', "csv"
+        )
+        self.assertEqual(rows[0], {"title": "A", "skills": ["Go", "SQL"], "benefits": ["Lunch", "Gym"]})
+        self.assertIsInstance(rows[1], UnreadableRow)
+        self.assertTrue(rows[1].error.startswith("skills: malformed JSON list"))
+        self.assertEqual(rows[2].error, "Not valid UTF-8")
+
+
+class ImportJobFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user("employer@example.com", role="employer")
+        cls.other = make_user("other@example.com", role="employer")
+        cls.taken = make_job(cls.other, title="Taken", slug="taken")
+        cls.own = make_job(cls.employer, title="Own", slug="own")
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = Path(root.name)
+        self.enterContext(override_settings(JOB_IMPORTS_ROOT=root.name))
+
+    def test_other_employers_slugs_are_conflicts(self):
+        row = {"description": "Imported", "company": "Acme", "location": "Lahore",
+               "experience_level": "mid", "job_type": "remote", "status": "published"}
+        lines = [{**row, "title": "Hijack", "slug": "taken"}, {**row, "title": "Own v2", "slug": "own"},
+                 {**row, "title": "Fresh"}]
+        (self.root / "feed.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+        totals = import_job_feed.call("feed.jsonl", self.employer.pk)
+
+        self.assertEqual((totals["inserted"], totals["updated"], totals["conflicts"]), (1, 1, 1))
+        self.assertEqual(Job.objects.get(slug="taken").title, "Taken")
+        self.assertEqual(Job.objects.get(slug="own").title, "Own v2")
+        report = [json.loads(line) for line in (self.root / "feed.jsonl.report.jsonl").read_text().splitlines()]
+        self.assertIn({"type": "conflict", "line": 1, "slug": "taken",
+                       "errors": {"slug": ["Belongs to another employer's job"]}}, report)
+        self.assertFalse((self.root / "feed.jsonl").exists())
+
+
+class ApplyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user("employer@example.com", role="employer")
+        cls.first = make_user("first@example.com")
+        cls.second = make_user("second@example.com")
+        cls.job = make_job(cls.employer)
+
+    def applicants(self):
+        return Job.objects.values_list("applicants", flat=True).get(pk=self.job.pk)
+
+    def test_apply_creates_once(self):
+        application_id, created = Application.objects.apply(self.job, self.first, resume="resumes/a.pdf")
+        self.assertTrue(created)
+        again, created = Application.objects.apply(self.job, self.first, resume="resumes/b.pdf")
+        self.assertFalse(created)
+        self.assertEqual(again, application_id)
+        self.assertEqual(Application.objects.get(pk=application_id).resume, "resumes/a.pdf")
+        self.assertEqual(self.applicants(), 1)
+
+    def test_each_applicant_is_counted(self):
+        Application.objects.apply(self.job, self.first)
+        Application.objects.apply(self.job, self.second)
+        self.assertEqual(self.applicants(), 2)
+
+    def test_delete_uncounts(self):
+        Application.objects.apply(self.job, self.first)
+        Application.objects.apply(self.job, self.second)
+        Application.objects.get(job=self.job, applicant=self.first).delete()
+        self.assertEqual(self.applicants(), 1)
+        Application.objects.filter(job=self.job).delete()
+        self.assertEqual(self.applicants(), 0)
+
+    def test_count_survives_stale_save(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        Application.objects.apply(self.job, self.first)
+        stale.title = "Senior Backend Engineer"
+        stale.save()
+        self.assertEqual(self.applicants(), 1)
+
+
+@override_settings(JOB_STATS_BATCH_SIZE=2, JOB_STATS_FLUSH_INTERVAL=60)
+class DailyStatsBufferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = make_user("employer@example.com", role="employer")
+        cls.first = make_job(employer, title="First")
+        cls.second = make_job(employer, title="Second")
+
+    def setUp(self):
+        self.buffer = DailyStatsBuffer()
+        self.addCleanup(lambda: self.buffer.timer and self.buffer.timer.cancel())
+
+    def views(self):
+        return dict(JobDailyStats.objects.values_list("job_id", "views"))
+
+    def test_first_increment_starts_the_flush_timer(self):
+        self.buffer.add(self.first.pk, views=1)
+        timer = self.buffer.timer
+        self.assertTrue(timer.is_alive())
+        self.buffer.add(self.first.pk, views=1)
+        self.assertIs(self.buffer.timer, timer)
+
+        self.buffer.flush()
+        self.assertIsNone(self.buffer.timer)
+        timer.join(1)
+        self.assertFalse(timer.is_alive())
+        self.assertEqual(self.views(), {self.first.pk: 2})
+
+    def test_full_batch_is_flushed_at_once(self):
+        self.buffer.add(self.first.pk, views=1)
+        self.buffer.add(self.second.pk, views=3)
+        self.assertEqual(self.buffer.pending, {})
+        self.assertIsNone(self.buffer.timer)
+        self.assertEqual(self.views(), {self.first.pk: 1, self.second.pk: 3})
+
+
+class ClaimBatchTests(TestCase):
+    def setUp(self):
+        JobEvent.objects.record([(job_id, "updated", {}) for job_id in (1, 2, 3)])
+
+    def claim_job_ids(self, consumer, limit=500):
+        with claim_batch(consumer, limit=limit) as events:
+            return [event.job_id for event in events]
+
+    def test_batches_follow_the_checkpoint(self):
+        self.assertEqual(self.claim_job_ids("search", limit=2), [1, 2])
+        self.assertEqual(self.claim_job_ids("search", limit=2), [3])
+        self.assertEqual(self.claim_job_ids("search", limit=2), [])
+        checkpoint = JobEventConsumer.objects.get(name="search")
+        self.assertEqual(checkpoint.position_id, JobEvent.objects.latest("id").id)
+
+    def test_failed_batch_is_redelivered(self):
+        with self.assertRaises(RuntimeError):
+            with claim_batch("search", limit=2) as events:
+                self.assertEqual([event.job_id for event in events], [1, 2])
+                raise RuntimeError
+        self.assertEqual(self.claim_job_ids("search"), [1, 2, 3])
+
+    def test_consumers_are_independent(self):
+        self.assertEqual(self.claim_job_ids("search"), [1, 2, 3])
+        self.assertEqual(self.claim_job_ids("feeds", limit=1), [1])
+        JobEvent.objects.record([(4, "deleted", {})])
+        self.assertEqual(self.claim_job_ids("search"), [4])
+
+
+class AsyncListParityTests(TestCase):
+    """/async/jobs/ answers every list query exactly like /jobs/"""
+
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Lahore and Karachi come from the gazetteer (locations.0002)
+        geocoding.clear_cache()
+        cls.engineering = Category.objects.create(name="Engineering")
+        backend = Category.objects.create(name="Backend", parent=cls.engineering)
+        employer = make_user("employer@example.com", role="employer")
+        make_job(employer, title="Django Developer", category=backend, skills=["Python", "Django"])
+        make_job(employer, title="Engineering Manager", category=cls.engineering, job_type="hybrid")
+        make_job(employer, title="Go Developer", location="Karachi", job_type="remote", skills=["Go"])
+        make_job(employer, title="Data Analyst", location="Karachi", category=backend, salary_range="100k-150k")
+        make_job(employer, title="Old Listing", is_active=False, category=backend)
+
+    def setUp(self):
+        self.addCleanup(geocoding.clear_cache)
+
+    def assertSameList(self, query):
+        sync = self.client.get(f"/jobs/?{query}")
+        native = self.client.get(f"/async/jobs/?{query}")
+        self.assertEqual(native.status_code, sync.status_code, query)
+        sync_data, native_data = sync.json(), native.json()
+        if sync.status_code == 200:
+            for link in ["next", "previous"]:
+                if native_data[link]:
+                    native_data[link] = native_data[link].replace("/async/jobs/", "/jobs/")
+            native_data.pop("count_is_approximate", None)
+            sync_data.pop("count_is_approximate", None)
+        self.assertEqual(native_data, sync_data, query)
+        return sync_data
+
+    def titles(self, data):
+        return sorted(job["title"] for job in data["results"])
+
+    def test_plain_and_paged(self):
+        self.assertEqual(self.assertSameList("")["count"], 4)
+        self.assertSameList("page_size=2&page=2")
+        self.assertSameList("page=99")
+
+    def test_filters_and_ordering(self):
+        self.assertSameList("job_type=remote")
+        self.assertSameList("search=developer&ordering=-salary_min")
+        self.assertSameList("skills=python")
+        self.assertSameList("min_salary=120000")
+
+    def test_category(self):
+        data = self.assertSameList(f"category={self.engineering.slug}")
+        self.assertEqual(self.titles(data), ["Data Analyst", "Django Developer", "Engineering Manager"])
+        self.assertSameList("category=no-such-category")
+
+    def test_near(self):
+        data = self.assertSameList("near=Lahore&radius=50")
+        self.assertEqual(self.titles(data), ["Django Developer", "Engineering Manager"])
+        self.assertSameList("near=24.86,67.00&ordering=distance")
+        self.assertSameList("near=Atlantis")
+
+    def test_facets(self):
+        data = self.assertSameList(f"facets=all&category={self.engineering.slug}")
+        self.assertIn("facets", data)
+
+
+class EmployerDashboardTests(TestCase):
+    # JobViewSet reads go to the replicas when there are any
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user("employer@example.com", role="employer")
+        cls.other = make_user("other@example.com", role="employer")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def test_created_job_is_the_posters(self):
+        response = self.client.post("/jobs/", {
+            "title": "Platform Engineer",
+            "description": "Run the platform",
+            "company": "Acme",
+            "location": "Lahore",
+            "experience_level": "senior",
+            "job_type": "remote",
+            "status": "published",
+            "skills": ["Kubernetes"],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        job = Job.objects.get(title="Platform Engineer")
+        self.assertEqual(job.employer, self.employer)
+
+        dashboard = self.client.get("/jobs/employer-jobs/").json()
+        self.assertEqual([item["title"] for item in dashboard["results"]], ["Platform Engineer"])
+        self.assertEqual(dashboard["summary"]["total_jobs"], 1)
+        self.assertEqual(self.client.get(f"/jobs/{job.pk}/daily-stats/").status_code, 200)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get("/jobs/employer-jobs/").json()["summary"]["total_jobs"], 0)
+        self.assertEqual(self.client.get(f"/jobs/{job.pk}/daily-stats/").status_code, 403)
+
+    def test_slug_is_read_only(self):
+        job = make_job(self.employer)
+        response = self.client.patch(f"/jobs/{job.pk}/", {"title": "Staff Engineer", "slug": "taken"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["slug"], job.slug)
+        job.refresh_from_db()
+        self.assertEqual((job.title, job.slug), ("Staff Engineer", "backend-engineer-acme"))
+
+    def test_stats(self):
+        make_job(self.employer, views=10)
+        make_job(self.other, title="Inactive", is_active=False, views=30)
+        data = self.client.get("/jobs/stats/").json()
+        self.assertEqual((data["total_jobs"], data["active_jobs"], data["total_views"]), (2, 1, 40))
+        self.assertEqual(data["avg_views_per_job"], 20)
+        self.assertEqual(data["jobs_by_type"], {"onsite": 2})
+        self.assertEqual(len(data["recent_jobs"]), 2)
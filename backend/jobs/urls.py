@@ -1,10 +1,25 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobViewSet
+from .views import JobViewSet, feed_file
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet, basename='job')
 
+# Native async read endpoints, best served through config.asgi
+async_urlpatterns = [
+    path('jobs/', async_views.job_list, name='async-job-list'),
+    path('jobs/featured/', async_views.featured, name='async-job-featured'),
+    path('jobs/recent/', async_views.recent, name='async-job-recent'),
+    path('jobs/urgent/', async_views.urgent, name='async-job-urgent'),
+    path('jobs/stream/', async_views.job_stream_events, name='async-job-stream'),
+    path('jobs/search_suggestions/', async_views.search_suggestions, name='async-job-search-suggestions'),
+    path('jobs/<int:pk>/', async_views.job_detail, name='async-job-detail'),
+]
+
 urlpatterns = [
+    path('async/', include(async_urlpatterns)),
+    path('sitemap.xml', feed_file, {'name': 'sitemap.xml'}, name='sitemap'),
+    path('feeds/<str:name>', feed_file, name='feed-file'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
@@ -1,13 +1,29 @@
+import re
+
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.db.models import Count, Sum, Avg, Q, F
+from django.http import Http404, HttpResponse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+from django.views.static import serve
 from datetime import timedelta
+from categories.models import Category
+from config.db_routers import ReplicaReadMixin
+from config.query_instrumentation import QueryInstrumentationMixin
+from locations.geocoding import geocode, within_radius
+from .detail_cache import cached_detail, cached_list_items
+from .facets import facet_counts, parse_facets
 from .paginations import JobPagination
-from .models import Job
+from .models import Application, Job, JobDailyStats, Skill
+from .skills import canonical_skill, filter_by_skills
+from .stats import COUNTERS, daily_series, stats_buffer
 from .serializers import (
     JobListSerializer, 
     JobDetailSerializer, 
@@ -20,10 +36,12 @@ from .serializers import (
 
 # Create your views here.
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(QueryInstrumentationMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Job.objects.filter(is_active=True)
     pagination_class = JobPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # POSTed only for id lists too long for a URL
+    read_only_actions = ("batch",)
     
 
     filterset_fields = {
@@ -42,25 +60,54 @@ class JobViewSet(viewsets.ModelViewSet):
         "skills", "requirements"
     ]
     
-    ordering_fields = [
-        "posted_date", "salary_range", "experience", 
+    public_ordering_fields = [
+        "posted_date", "salary_min", "salary_max", "experience", 
         "views", "applicants"
     ]
+    # Annotated by JobQuerySet.with_dashboard_metrics for the employer dashboard
+    dashboard_ordering_fields = ["conversion_rate", "days_remaining", "expiry_date"]
     ordering = ["-posted_date"]
     
+    @property
+    def ordering_fields(self):
+        """Read by OrderingFilter; dashboard metrics only exist on employer-jobs"""
+        if self.action == "employer":
+            return self.public_ordering_fields + self.dashboard_ordering_fields
+        if self.action == "list" and self.request.query_params.get("near"):
+            # distance is annotated by the ?near= radius filter
+            return self.public_ordering_fields + ["distance"]
+        return self.public_ordering_fields
+    
     def get_queryset(self):
         """Custom queryset based on user and actions"""
         queryset = super().get_queryset()
         
         # Handle different actions
         if self.action == "employer":
-            queryset = Job.objects.all()
+            # Only the requesting employer's own jobs, active or not
+            queryset = Job.objects.filter(employer=self.request.user).with_dashboard_metrics()
+            
+            params = self.request.query_params
+            if params.get("expiring_soon") in ["true", "1"]:
+                queryset = queryset.filter(is_expiring_soon=True)
+            elif params.get("expiring_soon") in ["false", "0"]:
+                queryset = queryset.filter(is_expiring_soon=False)
             
-            # Filter by company if provided
-            company = self.request.query_params.get("company", None)
-            if company and self.request.user.is_authenticated:
-                # You might want to check if user owns this company
-                queryset = queryset.filter(company__icontains=company)
+            for param, lookup in [
+                ("min_conversion_rate", "conversion_rate__gte"),
+                ("max_conversion_rate", "conversion_rate__lte"),
+                ("max_days_remaining", "days_remaining__lte"),
+            ]:
+                value = params.get(param)
+                if value:
+                    try:
+                        queryset = queryset.filter(**{lookup: float(value)})
+                    except ValueError:
+                        raise ValidationError({param: "Must be a number"})
+        
+        elif self.action == "daily_stats":
+            # Deactivated jobs keep their history
+            queryset = Job.objects.all()
                 
         elif self.action == "list":
             # Filter out expired jobs for public listing
@@ -69,21 +116,150 @@ class JobViewSet(viewsets.ModelViewSet):
                 Q(expiry_date__gt=timezone.now())
             )
             
-            # Filter by salary range if provided
-            min_salary = self.request.query_params.get("min_salary", None)
-            max_salary = self.request.query_params.get("max_salary", None)
+            # Filter by salary range if provided: jobs whose parsed range
+            # overlaps [min_salary, max_salary]; an open-ended "100k+" job
+            # has no salary_max
+            params = self.request.query_params
+            try:
+                min_salary = int(params["min_salary"]) if params.get("min_salary") else None
+                max_salary = int(params["max_salary"]) if params.get("max_salary") else None
+            except ValueError:
+                raise ValidationError({"salary": "min_salary and max_salary must be whole numbers"})
             
-            # Filter by skills if provided
+            if min_salary is not None:
+                queryset = queryset.filter(
+                    Q(salary_max__gte=min_salary) |
+                    Q(salary_max__isnull=True, salary_min__isnull=False)
+                )
+            if max_salary is not None:
+                queryset = queryset.filter(salary_min__lte=max_salary)
+            if params.get("salary_currency"):
+                queryset = queryset.filter(salary_currency=params["salary_currency"].upper())
+            
+            # ?category=<slug> includes the category's descendants
+            if params.get("category"):
+                category = Category.objects.filter(slug=params["category"]).first()
+                if category is None:
+                    raise ValidationError({"category": "Unknown category"})
+                queryset = queryset.in_category(category)
+            
+            # Radius search: ?near=<lat,lon> or a place name, ?radius= in km
+            if params.get("near"):
+                latitude, longitude, radius = self.parse_near(params)
+                queryset = within_radius(queryset, latitude, longitude, radius)
+            
+            # Filter by skills if provided; all of them unless ?skills_mode=any
             skills = self.request.query_params.getlist("skills", [])
             if skills:
-                # Assuming skills is a JSONField with list of strings
-                for skill in skills:
-                    queryset = queryset.filter(skills__contains=[skill])
+                mode = self.request.query_params.get("skills_mode", "all")
+                queryset = filter_by_skills(queryset, skills, mode=mode)
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """Job listing; ?facets= adds counts per facet value for the current filters"""
+        facets = parse_facets(request.query_params.get("facets", ""))
+        if not facets:
+            return super().list(request, *args, **kwargs)
+        
+        # get_queryset may look up ?category= and geocode ?near=, so the
+        # facet counts start from the same queryset as the page
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response.data["facets"] = facet_counts(self, facets, queryset)
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Job detail, served from the rendered detail cache"""
+        try:
+            job_id = int(kwargs["pk"])
+        except ValueError:
+            raise Http404
+        return self.cached_detail_response(job_id=job_id)
+    
+    @action(detail=False, methods=["get"], url_path=r"slug/(?P<slug>[-\w]+)")
+    def by_slug(self, request, slug=None):
+        """Job detail by slug, sharing the id-keyed detail cache"""
+        return self.cached_detail_response(slug=slug)
+    
+    def cached_detail_response(self, job_id=None, slug=None):
+        body = cached_detail(self.get_queryset(), job_id=job_id, slug=slug)
+        if body is None:
+            raise Http404
+        return HttpResponse(body, content_type="application/json")
+    
+    @action(detail=False, methods=["get", "post"])
+    def batch(self, request):
+        """Several jobs by id or slug, in the order asked for
+        
+        ?ids=3,1,2 or ?slugs=a,b (repeated parameters work too), or the same
+        keys as JSON lists in a POST body for long lists. Returns list
+        representations, served from the per-job cache where possible, and
+        the ids and slugs that don't exist or aren't active.
+        
+        The POST form is a read (see read_only_actions), but it is still a
+        POST to DRF: clients logged in with a session cookie must send the
+        CSRF token.
+        """
+        job_ids = self.batch_values(request, "ids")
+        slugs = [str(slug) for slug in self.batch_values(request, "slugs")]
+        try:
+            job_ids = [int(job_id) for job_id in job_ids]
+        except (TypeError, ValueError):
+            raise ValidationError({"ids": "Must be whole numbers"})
+        if not job_ids and not slugs:
+            raise ValidationError({"ids": "Pass ids or slugs"})
+        if len(job_ids) + len(slugs) > settings.JOB_BATCH_MAX_SIZE:
+            raise ValidationError({"ids": f"At most {settings.JOB_BATCH_MAX_SIZE} ids and slugs per request"})
+        
+        items, slug_ids = cached_list_items(self.get_queryset(), job_ids=job_ids, slugs=slugs)
+        results = []
+        seen = set()
+        for job_id in [*job_ids, *(slug_ids.get(slug) for slug in slugs)]:
+            if job_id in items and job_id not in seen:
+                seen.add(job_id)
+                results.append(items[job_id])
+        return Response({
+            "results": results,
+            "missing": {
+                "ids": [job_id for job_id in dict.fromkeys(job_ids) if job_id not in items],
+                "slugs": [slug for slug in dict.fromkeys(slugs) if slug not in slug_ids],
+            },
+        })
+    
+    def batch_values(self, request, name):
+        """A list from a JSON body, or comma separated/repeated query parameters"""
+        if request.method == "POST":
+            values = request.data.get(name, [])
+            if not isinstance(values, list):
+                raise ValidationError({name: "Must be a list"})
+            return values
+        return [value for param in request.query_params.getlist(name) for value in param.split(",") if value]
+    
+    def parse_near(self, params):
+        """Return (latitude, longitude, radius_km) for ?near= and ?radius="""
+        near = params["near"]
+        try:
+            latitude, longitude = (float(part) for part in near.split(","))
+        except ValueError:
+            place = geocode(near)
+            if place is None:
+                raise ValidationError({"near": "Use <latitude>,<longitude> or a known place name"})
+            latitude, longitude = place.latitude, place.longitude
+        
+        try:
+            radius = float(params.get("radius", 25))
+        except ValueError:
+            raise ValidationError({"radius": "Must be a number of kilometres"})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({"near": "Coordinates out of range"})
+        if not 0 < radius <= 500:
+            raise ValidationError({"radius": "Must be between 0 and 500 km"})
+        return latitude, longitude, radius
+    
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ["list", "batch"]:
             return JobListSerializer
         elif self.action == "retrieve":
             return JobDetailSerializer
@@ -99,20 +275,21 @@ class JobViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Custom permissions for different actions"""
-        if self.action in ["create", "update", "partial_update", "employer"]:
+        if self.action in [
+            "create", "update", "partial_update", "employer", "daily_stats", "employer_daily_stats",
+            "apply", "increment_applicants",
+        ]:
             return [permissions.IsAuthenticated()]
         elif self.action == "destroy":
             return [permissions.IsAdminUser()]
-        elif self.action in ["increment_views", "increment_applicants"]:
+        elif self.action == "increment_views":
             # Allow anyone to increment views
             return [permissions.AllowAny()]
         return [permissions.AllowAny()]
     
     def perform_create(self, serializer):
-        """Set additional fields when creating a job"""
-        # You can set the user who created the job if you have a user field
-        # serializer.save(posted_by=self.request.user)
-        serializer.save()
+        """The authenticated user posting the job owns it"""
+        serializer.save(employer=self.request.user)
     
     @action(detail=True, methods=["post"])
     def increment_views(self, request, pk=None):
@@ -121,16 +298,113 @@ class JobViewSet(viewsets.ModelViewSet):
         job.views = F("views") + 1
         job.save(update_fields=["views"])
         job.refresh_from_db()
+        stats_buffer.add(job.pk, views=1)
         return Response({"views": job.views})
     
+    @action(detail=True, methods=["post"])
+    def apply(self, request, pk=None):
+        """API endpoint to apply to a job; applying again is a no-op"""
+        job = self.get_object()
+        
+        if request.user.role != "jobseeker":
+            return Response(
+                {"detail": "Only jobseekers can apply to jobs"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if job.expiry_date and job.expiry_date < timezone.now():
+            return Response(
+                {"detail": "This job has expired"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        profile = getattr(request.user, "jobseeker_profile", None)
+        resume = profile.resume.name if profile and profile.resume else ""
+        application_id, created = Application.objects.apply(job, request.user, resume=resume)
+        if created:
+            stats_buffer.add(job.pk, applicants=1)
+        
+        job.refresh_from_db(fields=["applicants"])
+        return Response(
+            {"application": application_id, "created": created, "applicants": job.applicants},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+    
     @action(detail=True, methods=["post"])
     def increment_applicants(self, request, pk=None):
-        """API endpoint to increment job applicants count"""
+        """Deprecated alias of apply, kept for existing clients"""
+        return self.apply(request, pk=pk)
+    
+    def stats_window(self, request):
+        """Parse ?days= into the (start, end) dates of a stats series"""
+        try:
+            days = int(request.query_params.get("days", 90))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 366:
+            return None
+        end = timezone.localdate()
+        return end - timedelta(days=days - 1), end
+    
+    @action(detail=True, methods=["get"], url_path="daily-stats")
+    def daily_stats(self, request, pk=None):
+        """Daily views, applicants and saves of a job, zero-filled"""
         job = self.get_object()
-        job.applicants = F("applicants") + 1
-        job.save(update_fields=["applicants"])
-        job.refresh_from_db()
-        return Response({"applicants": job.applicants})
+        if job.employer_id != request.user.pk and not request.user.is_staff:
+            return Response(
+                {"detail": "You do not have permission to view these stats"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        window = self.stats_window(request)
+        if window is None:
+            return Response(
+                {"detail": "days must be between 1 and 366"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end = window
+        
+        # One range scan over the (job, day) unique index
+        rows = JobDailyStats.objects.filter(
+            job=job, day__gte=start - timedelta(days=6), day__lte=end
+        ).values("day", "period", *COUNTERS)
+        
+        return Response({
+            "job": job.pk,
+            "start": start,
+            "end": end,
+            "series": daily_series(rows, start, end),
+        })
+    
+    @action(detail=False, methods=["get"], url_path="employer-daily-stats")
+    def employer_daily_stats(self, request):
+        """Daily totals across all jobs of the requesting employer, zero-filled"""
+        window = self.stats_window(request)
+        if window is None:
+            return Response(
+                {"detail": "days must be between 1 and 366"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end = window
+        
+        totals = (
+            JobDailyStats.objects.filter(
+                job__employer=request.user, day__gte=start - timedelta(days=6), day__lte=end
+            )
+            .values("day", "period")
+            .annotate(**{f"total_{name}": Sum(name) for name in COUNTERS})
+            .order_by()
+        )
+        rows = [
+            {"day": row["day"], "period": row["period"], **{name: row[f"total_{name}"] for name in COUNTERS}}
+            for row in totals
+        ]
+        
+        return Response({
+            "employer": request.user.pk,
+            "start": start,
+            "end": end,
+            "series": daily_series(rows, start, end),
+        })
     
     @action(detail=False, methods=["get"])
     def featured(self, request):
@@ -165,135 +439,71 @@ class JobViewSet(viewsets.ModelViewSet):
     def employer(self, request):
         """Get jobs for employer dashboard"""
         queryset = self.filter_queryset(self.get_queryset())
+        
+        # Totals over all of the employer's jobs, in one aggregate query
+        now = timezone.now()
+        summary = Job.objects.filter(employer=request.user).aggregate(
+            total_jobs=Count("id"),
+            active_jobs=Count("id", filter=Q(is_active=True)),
+            published_jobs=Count("id", filter=Q(status="published")),
+            expired_jobs=Count("id", filter=Q(expiry_date__lt=now)),
+            total_views=Sum("views", default=0),
+            total_applicants=Sum("applicants", default=0),
+        )
+        summary["conversion_rate"] = round(
+            summary["total_applicants"] / summary["total_views"] * 100, 2
+        ) if summary["total_views"] else 0
+        
         page = self.paginate_queryset(queryset)
         
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(serializer.data)
+            response.data["summary"] = summary
+            return response
         
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response({"summary": summary, "results": serializer.data})
     
     @action(detail=False, methods=["get"])
     def stats(self, request):
         """Get job statistics"""
-        
-        # Calculate time ranges
         now = timezone.now()
-        last_week = now - timedelta(days=7)
-        last_month = now - timedelta(days=30)
-        
-        # Basic statistics
-        total_jobs = Job.objects.count()
-        active_jobs = Job.objects.filter(is_active=True).count()
-        expired_jobs = Job.objects.filter(
-            expiry_date__lt=now,
-            is_active=True
-        ).count()
-        
-        # Weekly/Monthly stats
-        weekly_jobs = Job.objects.filter(
-            posted_date__gte=last_week
-        ).count()
         
-        monthly_jobs = Job.objects.filter(
-            posted_date__gte=last_month
-        ).count()
-        
-        # Aggregated data
-        views_data = Job.objects.aggregate(
+        # Counts and totals in one pass over jobs_job
+        totals = Job.objects.aggregate(
+            total_jobs=Count("id"),
+            active_jobs=Count("id", filter=Q(is_active=True)),
+            expired_jobs=Count("id", filter=Q(is_active=True, expiry_date__lt=now)),
             total_views=Sum("views"),
-            avg_views=Avg("views"),
-            max_views=max("views")
-        )
-        
-        applicants_data = Job.objects.aggregate(
             total_applicants=Sum("applicants"),
-            avg_applicants=Avg("applicants"),
-            max_applicants=max("applicants")
-        )
-        
-        # Distribution by job type
-        jobs_by_type = dict(
-            Job.objects.values("job_type")
-            .annotate(count=Count("id"), total_views=Sum("views"))
-            .values_list("job_type", "count")
+            avg_views_per_job=Avg("views"),
+            avg_applicants_per_job=Avg("applicants"),
         )
         
-        # Top companies by job count
-        top_companies = dict(
-            Job.objects.values("company")
-            .annotate(job_count=Count("id"))
-            .order_by("-job_count")[:10]
-            .values_list("company", "job_count")
-        )
-        
-        # Top locations
-        top_locations = dict(
-            Job.objects.values("location")
-            .annotate(job_count=Count("id"))
-            .order_by("-job_count")[:10]
-            .values_list("location", "job_count")
-        )
-        
-        # Recent jobs for the stats
-        recent_jobs = Job.objects.filter(
-            posted_date__gte=last_month
-        ).order_by("-posted_date")[:5]
-        
         stats_data = {
-            "overview": {
-                "total_jobs": total_jobs,
-                "active_jobs": active_jobs,
-                "expired_jobs": expired_jobs,
-                "weekly_new_jobs": weekly_jobs,
-                "monthly_new_jobs": monthly_jobs,
-            },
-            "performance": {
-                "total_views": views_data["total_views"] or 0,
-                "avg_views_per_job": round(views_data["avg_views"] or 0, 2),
-                "max_views": views_data["max_views"] or 0,
-                "total_applicants": applicants_data["total_applicants"] or 0,
-                "avg_applicants_per_job": round(applicants_data["avg_applicants"] or 0, 2),
-                "max_applicants": applicants_data["max_applicants"] or 0,
-                "conversion_rate": round(
-                    (applicants_data["total_applicants"] or 0) / 
-                    (views_data["total_views"] or 1) * 100, 
-                    2
-                ) if views_data["total_views"] else 0,
-            },
-            "distribution": {
-                "jobs_by_type": jobs_by_type,
-                "jobs_by_employment_type": dict(
-                    Job.objects.values("employement_type")
-                    .annotate(count=Count("id"))
-                    .values_list("employement_type", "count")
-                ),
-                "jobs_by_experience_level": dict(
-                    Job.objects.values("experience_level")
-                    .annotate(count=Count("id"))
-                    .values_list("experience_level", "count")
-                ),
-            },
-            "top_lists": {
-                "top_companies": top_companies,
-                "top_locations": top_locations,
-                "most_viewed_jobs": JobListSerializer(
-                    Job.objects.order_by("-views")[:5], 
-                    many=True
-                ).data,
-                "most_applied_jobs": JobListSerializer(
-                    Job.objects.order_by("-applicants")[:5], 
-                    many=True
-                ).data,
-            },
-            "recent_activity": {
-                "recent_jobs": JobListSerializer(recent_jobs, many=True).data,
-                "recent_expired_jobs": Job.objects.filter(
-                    expiry_date__gte=last_week,
-                    expiry_date__lt=now
-                ).count(),
-            }
+            "total_jobs": totals["total_jobs"],
+            "active_jobs": totals["active_jobs"],
+            "expired_jobs": totals["expired_jobs"],
+            "total_views": totals["total_views"] or 0,
+            "total_applicants": totals["total_applicants"] or 0,
+            "avg_views_per_job": round(totals["avg_views_per_job"] or 0, 2),
+            "avg_applicants_per_job": round(totals["avg_applicants_per_job"] or 0, 2),
+            "jobs_by_type": dict(
+                Job.objects.values("job_type")
+                .annotate(count=Count("id"))
+                .order_by()
+                .values_list("job_type", "count")
+            ),
+            "jobs_by_location": dict(
+                Job.objects.values("location")
+                .annotate(job_count=Count("id"))
+                .order_by("-job_count")[:10]
+                .values_list("location", "job_count")
+            ),
+            "recent_jobs": Job.objects.filter(
+                posted_date__gte=now - timedelta(days=30)
+            ).order_by("-posted_date")[:5],
         }
         
         serializer = JobStatsSerializer(stats_data)
@@ -376,6 +586,21 @@ class JobViewSet(viewsets.ModelViewSet):
         job.save()
         return Response({"status": "Job activated successfully"})
     
+    @action(detail=False, methods=["get"], url_path="skills-count")
+    def skills_count(self, request):
+        """Active job counts per skill, for ?skills= or the most common ones"""
+        skills = Skill.objects.filter(job_skills__job__is_active=True)
+        requested = request.query_params.getlist("skills", [])
+        if requested:
+            skills = skills.filter(canonical_name__in=[canonical_skill(skill) for skill in requested])
+        
+        counts = (
+            skills.values("name")
+            .annotate(job_count=Count("job_skills"))
+            .order_by("-job_count", "name")[:50]
+        )
+        return Response({"skills": list(counts)})
+    
     @action(detail=False, methods=["get"])
     def search_suggestions(self, request):
         """Get search suggestions for autocomplete"""
@@ -402,23 +627,32 @@ class JobViewSet(viewsets.ModelViewSet):
             is_active=True
         ).values_list("location", flat=True).distinct()[:10]
         
-        # Skill suggestions (assuming skills is a JSON list field)
-        skill_suggestions = []
-        all_skills = Job.objects.filter(is_active=True).values_list("skills", flat=True)
-        
-        # Flatten and filter skills
-        flattened_skills = set()
-        for skill_list in all_skills:
-            if skill_list:
-                for skill in skill_list:
-                    if query.lower() in skill.lower():
-                        flattened_skills.add(skill)
-        
-        skill_suggestions = list(flattened_skills)[:10]
+        # Skill suggestions from the normalized skill table
+        skill_suggestions = Skill.objects.filter(
+            canonical_name__contains=canonical_skill(query),
+            jobs__is_active=True
+        ).values_list("name", flat=True).distinct()[:10]
         
         return Response({
             "titles": list(title_suggestions),
             "companies": list(company_suggestions),
             "locations": list(location_suggestions),
             "skills": list(skill_suggestions),
-        })
\ No newline at end of file
+        })
+
+# Files written by the generate_feeds command; manifest.json stays private
+FEED_FILE = re.compile(r"^(sitemap\.xml|feeds\.json|sitemap-jobs-\d+\.xml\.gz|jobs-\d+\.(atom|json)\.gz)$")
+
+
+@require_GET
+def feed_file(request, name):
+    """Serve a pre-generated sitemap or feed file with cache headers
+
+    Conditional requests get a 304 from static.serve. Put a web server
+    or CDN in front of FEEDS_ROOT in production.
+    """
+    if not FEED_FILE.match(name):
+        raise Http404
+    response = serve(request, name, document_root=settings.FEEDS_ROOT)
+    patch_cache_control(response, public=True, max_age=settings.FEEDS_CACHE_SECONDS)
+    return response
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Location, LocationAlias
+
+# Register your models here.
+
+
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+    extra = 0
+
+
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "region", "country_code", "latitude", "longitude")
+    search_fields = ("name", "aliases__alias")
+    list_filter = ("country_code",)
+    inlines = [LocationAliasInline]
+
+admin.site.register(Location, LocationAdmin)
@@ -0,0 +1,183 @@
+import csv
+import math
+import re
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+Place = namedtuple("Place", ["id", "latitude", "longitude"])
+
+_aliases = None
+_aliases_lock = threading.Lock()
+
+
+def normalize_place(text):
+    """Case-folded place text with punctuation dropped and spaces collapsed"""
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text)).split()).casefold()
+
+
+def place_candidates(text):
+    """The whole text, then each comma/slash/bracket separated part"""
+    parts = [str(text)] + re.split(r"[,/|()]|\s-\s", str(text))
+    seen = []
+    for part in parts:
+        normalized = normalize_place(part)
+        if normalized and normalized not in seen:
+            seen.append(normalized)
+    return seen
+
+
+def alias_index(alias_model=None):
+    """alias -> Place for the whole gazetteer
+
+    Cached per process for the current models. Migrations pass their
+    historical models and always get a fresh index.
+    """
+    global _aliases
+    if alias_model is not None:
+        return {
+            alias: Place(*values)
+            for alias, *values in alias_model.objects.values_list(
+                "alias", "location_id", "location__latitude", "location__longitude"
+            )
+        }
+
+    with _aliases_lock:
+        if _aliases is None:
+            from .models import LocationAlias
+            _aliases = alias_index(alias_model=LocationAlias)
+        return _aliases
+
+
+def clear_cache():
+    global _aliases
+    with _aliases_lock:
+        _aliases = None
+
+
+def geocode(text, aliases=None):
+    """Return the Place a free-text location refers to, or None"""
+    if not text:
+        return None
+    aliases = alias_index() if aliases is None else aliases
+    for candidate in place_candidates(text):
+        if candidate in aliases:
+            return aliases[candidate]
+    return None
+
+
+def apply_geocode(instance, text_field="location", aliases=None):
+    """Set place/latitude/longitude on a model instance from its text field"""
+    place = geocode(getattr(instance, text_field), aliases=aliases)
+    instance.place_id = place.id if place else None
+    instance.latitude = place.latitude if place else None
+    instance.longitude = place.longitude if place else None
+
+
+def load_gazetteer(location_model, alias_model, path=GAZETTEER_PATH):
+    """Upsert the gazetteer CSV into Location and LocationAlias
+
+    Columns: name, region, country_code, latitude, longitude and ";"
+    separated aliases. Returns (locations, aliases) written.
+    """
+    locations = 0
+    aliases = 0
+    with open(path, newline="", encoding="utf-8") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            location, _ = location_model.objects.update_or_create(
+                name=row["name"].strip(),
+                country_code=row["country_code"].strip().upper(),
+                defaults={
+                    "region": row.get("region", "").strip(),
+                    "latitude": float(row["latitude"]),
+                    "longitude": float(row["longitude"]),
+                },
+            )
+            locations += 1
+            names = [row["name"]] + (row.get("aliases") or "").split(";")
+            for name in {normalize_place(name) for name in names if normalize_place(name)}:
+                alias_model.objects.update_or_create(alias=name, defaults={"location": location})
+                aliases += 1
+    clear_cache()
+    return locations, aliases
+
+
+def backfill_places(model, alias_model, text_field="location", batch_size=2000):
+    """Geocode every row of ``model`` in primary key batches
+
+    Used by the geocode_locations command; the migrations that add the
+    geocoded columns keep their own frozen copy. Returns the number of
+    rows updated.
+    """
+    aliases = alias_index(alias_model=alias_model)
+    fields = ["place", "latitude", "longitude"]
+    updated = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_id).order_by("pk").only("pk", text_field, *fields)[:batch_size]
+        )
+        if not rows:
+            return updated
+        last_id = rows[-1].pk
+
+        changed = []
+        for row in rows:
+            before = (row.place_id, row.latitude, row.longitude)
+            apply_geocode(row, text_field, aliases=aliases)
+            if (row.place_id, row.latitude, row.longitude) != before:
+                changed.append(row)
+        model.objects.bulk_update(changed, fields)
+        updated += len(changed)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lon, max_lon) around a point; lon is None when
+    the box would wrap around the antimeridian or a pole"""
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(latitude - delta_lat, -90.0), min(latitude + delta_lat, 90.0)
+
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 0.01:
+        return min_lat, max_lat, None, None
+    delta_lon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if longitude - delta_lon < -180 or longitude + delta_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def haversine_km(latitude, longitude, lat_field="latitude", lon_field="longitude"):
+    """Great-circle distance in km from a point to the row's coordinates"""
+    lat0 = Value(math.radians(latitude), output_field=FloatField())
+    lon0 = Value(math.radians(longitude), output_field=FloatField())
+    lat = Radians(F(lat_field))
+    lon = Radians(F(lon_field))
+    a = (
+        Power(Sin((lat - lat0) / 2), 2)
+        + Cos(lat0) * Cos(lat) * Power(Sin((lon - lon0) / 2), 2)
+    )
+    # Rounding can push sqrt(a) just past 1, outside asin's domain
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0)))
+
+
+def within_radius(queryset, latitude, longitude, radius_km, lat_field="latitude", lon_field="longitude"):
+    """Rows within ``radius_km`` of a point, annotated with ``distance`` in km
+
+    A bounding box on the indexed coordinate columns narrows the rows
+    first; the exact haversine distance is then computed for those only.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(**{f"{lat_field}__range": (min_lat, max_lat)})
+    if min_lon is not None:
+        queryset = queryset.filter(**{f"{lon_field}__range": (min_lon, max_lon)})
+    return queryset.annotate(
+        distance=haversine_km(latitude, longitude, lat_field, lon_field)
+    ).filter(distance__lte=radius_km)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from locations.geocoding import backfill_places
+from locations.models import LocationAlias
+from users.models import JobseekerProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-geocode Job.location and JobseekerProfile.location against the "
+        "gazetteer in primary key batches, e.g. after loading new places."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        for model in (Job, JobseekerProfile):
+            updated = backfill_places(model, LocationAlias, batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: {updated} rows updated"))
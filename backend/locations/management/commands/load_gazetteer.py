@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from locations.geocoding import GAZETTEER_PATH, load_gazetteer
+from locations.models import Location, LocationAlias
+
+
+class Command(BaseCommand):
+    help = (
+        "Load or refresh the place gazetteer from a CSV with name, region, "
+        "country_code, latitude, longitude and ';' separated aliases. "
+        "Defaults to the bundled locations/data/gazetteer.csv."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default=str(GAZETTEER_PATH))
+
+    def handle(self, *args, **options):
+        locations, aliases = load_gazetteer(Location, LocationAlias, options["path"])
+        self.stdout.write(self.style.SUCCESS(f"{locations} locations, {aliases} aliases loaded"))
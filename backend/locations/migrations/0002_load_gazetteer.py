@@ -0,0 +1,98 @@
+import csv
+import io
+import re
+
+from django.db import migrations
+
+# Frozen copy of locations/data/gazetteer.csv and of
+# locations.geocoding.load_gazetteer as of this migration; later gazetteer
+# updates are loaded with the load_gazetteer command
+GAZETTEER = """\
+name,region,country_code,latitude,longitude,aliases
+Karachi,Sindh,PK,24.8607,67.0011,khi
+Lahore,Punjab,PK,31.5204,74.3587,lhr
+Islamabad,Islamabad Capital Territory,PK,33.6844,73.0479,isb
+Rawalpindi,Punjab,PK,33.5651,73.0169,pindi;rwp
+Faisalabad,Punjab,PK,31.4504,73.1350,lyallpur;fsd
+Multan,Punjab,PK,30.1575,71.5249,mux
+Peshawar,Khyber Pakhtunkhwa,PK,34.0151,71.5249,pew
+Quetta,Balochistan,PK,30.1798,66.9750,uet
+Sialkot,Punjab,PK,32.4945,74.5229,skt
+Hyderabad,Sindh,PK,25.3960,68.3578,hyd
+Gujranwala,Punjab,PK,32.1877,74.1945,grw
+Bahawalpur,Punjab,PK,29.3544,71.6911,bwp
+Sargodha,Punjab,PK,32.0836,72.6711,
+Sukkur,Sindh,PK,27.7052,68.8574,
+Larkana,Sindh,PK,27.5570,68.2264,
+Abbottabad,Khyber Pakhtunkhwa,PK,34.1688,73.2215,abbotabad
+Mardan,Khyber Pakhtunkhwa,PK,34.1986,72.0404,
+Gujrat,Punjab,PK,32.5731,74.0789,
+Sahiwal,Punjab,PK,30.6682,73.1114,
+Sheikhupura,Punjab,PK,31.7167,73.9850,
+Jhelum,Punjab,PK,32.9425,73.7257,
+Rahim Yar Khan,Punjab,PK,28.4202,70.2952,ryk
+Dera Ghazi Khan,Punjab,PK,30.0459,70.6403,dg khan;d g khan
+Dera Ismail Khan,Khyber Pakhtunkhwa,PK,31.8313,70.9019,di khan;d i khan
+Mirpur,Azad Kashmir,PK,33.1480,73.7510,mirpur ajk
+Muzaffarabad,Azad Kashmir,PK,34.3700,73.4711,
+Gilgit,Gilgit-Baltistan,PK,35.9208,74.3144,
+Gwadar,Balochistan,PK,25.1264,62.3225,
+Okara,Punjab,PK,30.8138,73.4534,
+Kasur,Punjab,PK,31.1187,74.4507,
+Wah Cantonment,Punjab,PK,33.7715,72.7510,wah;wah cantt
+Taxila,Punjab,PK,33.7463,72.8397,
+Nawabshah,Sindh,PK,26.2442,68.4100,shaheed benazirabad
+Mingora,Khyber Pakhtunkhwa,PK,34.7717,72.3602,swat
+Chiniot,Punjab,PK,31.7200,72.9789,
+Kohat,Khyber Pakhtunkhwa,PK,33.5869,71.4429,
+Mandi Bahauddin,Punjab,PK,32.5861,73.4917,
+Hafizabad,Punjab,PK,32.0709,73.6880,
+Khanewal,Punjab,PK,30.3017,71.9321,
+Vehari,Punjab,PK,30.0445,72.3556,
+Dubai,Dubai,AE,25.2048,55.2708,dxb
+Abu Dhabi,Abu Dhabi,AE,24.4539,54.3773,
+Riyadh,Riyadh,SA,24.7136,46.6753,
+Jeddah,Makkah,SA,21.4858,39.1925,jeddah ksa
+Doha,Doha,QA,25.2854,51.5310,
+London,England,GB,51.5072,-0.1276,
+New York,New York,US,40.7128,-74.0060,nyc;new york city
+San Francisco,California,US,37.7749,-122.4194,sf
+Toronto,Ontario,CA,43.6532,-79.3832,
+Berlin,Berlin,DE,52.5200,13.4050,
+Singapore,Singapore,SG,1.3521,103.8198,
+Kuala Lumpur,Kuala Lumpur,MY,3.1390,101.6869,kl
+"""
+
+
+def normalize_place(text):
+    return ' '.join(re.sub(r'[^\w\s]', ' ', str(text)).split()).casefold()
+
+
+def load_bundled_gazetteer(apps, schema_editor):
+    Location = apps.get_model('locations', 'Location')
+    LocationAlias = apps.get_model('locations', 'LocationAlias')
+
+    for row in csv.DictReader(io.StringIO(GAZETTEER)):
+        location, _ = Location.objects.update_or_create(
+            name=row['name'].strip(),
+            country_code=row['country_code'].strip().upper(),
+            defaults={
+                'region': row.get('region', '').strip(),
+                'latitude': float(row['latitude']),
+                'longitude': float(row['longitude']),
+            },
+        )
+        names = [row['name']] + (row.get('aliases') or '').split(';')
+        for name in {normalize_place(name) for name in names if normalize_place(name)}:
+            LocationAlias.objects.update_or_create(alias=name, defaults={'location': location})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(load_bundled_gazetteer, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+
+# Create your models here.
+
+
+class Location(models.Model):
+    """A gazetteer place; city centre coordinates in decimal degrees"""
+    name = models.CharField(max_length=100)
+    region = models.CharField(max_length=100, blank=True)
+    country_code = models.CharField(max_length=2)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["name", "country_code"], name="locations_location_name_country_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="locations_lat_lon_idx"),
+        ]
+    
+    def __str__(self):
+        return f"{self.name}, {self.country_code}"
+
+
+class LocationAlias(models.Model):
+    """Normalized spellings that geocode to a location, its own name included"""
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="aliases")
+    alias = models.CharField(max_length=100, unique=True)
+    
+    def __str__(self):
+        return self.alias
@@ -0,0 +1,23 @@
+from django.contrib import admin
+from django.tasks import TaskResultStatus
+from django.utils import timezone
+from .models import QueuedTask
+
+# Register your models here.
+
+
+class QueuedTaskAdmin(admin.ModelAdmin):
+    list_display = ("id", "task_path", "queue_name", "priority", "status", "run_after", "finished_at")
+    list_filter = ("status", "queue_name", "backend")
+    search_fields = ("task_path",)
+    readonly_fields = ("enqueued_at", "started_at", "last_attempted_at", "finished_at", "worker_ids")
+    actions = ["run_again"]
+    
+    @admin.action(description="Run selected tasks again")
+    def run_again(self, request, queryset):
+        count = queryset.exclude(status=TaskResultStatus.RUNNING).update(
+            status=TaskResultStatus.READY, run_after=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f"{count} tasks queued")
+
+admin.site.register(QueuedTask, QueuedTaskAdmin)
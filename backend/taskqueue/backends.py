@@ -0,0 +1,61 @@
+from django.db import router
+from django.tasks.backends.base import BaseTaskBackend
+from django.tasks.exceptions import TaskResultDoesNotExist
+from django.tasks.signals import task_enqueued
+from django.utils import timezone
+from django.utils.json import normalize_json
+from .models import QueuedTask
+
+
+class DatabaseBackend(BaseTaskBackend):
+    """django.tasks backend storing tasks in the QueuedTask table
+
+    run_worker executes them. OPTIONS:
+
+        MAX_ATTEMPTS    runs before a failing task is left FAILED (3)
+        RETRY_BACKOFF   seconds before the first retry, doubled each time (10)
+        RETRY_BACKOFF_MAX   cap on the retry delay in seconds (3600)
+        STALE_AFTER     seconds after which a RUNNING task is presumed
+                        orphaned by a dead worker and run again (3600)
+    """
+    supports_defer = True
+    supports_async_task = True
+    supports_get_result = True
+    supports_priority = True
+
+    def __init__(self, alias, params):
+        super().__init__(alias, params)
+        self.max_attempts = self.options.get("MAX_ATTEMPTS", 3)
+        self.retry_backoff = self.options.get("RETRY_BACKOFF", 10)
+        self.retry_backoff_max = self.options.get("RETRY_BACKOFF_MAX", 3600)
+        self.stale_after = self.options.get("STALE_AFTER", 3600)
+
+    @property
+    def using(self):
+        return router.db_for_write(QueuedTask)
+
+    def enqueue(self, task, args, kwargs):
+        self.validate_task(task)
+        row = QueuedTask.objects.using(self.using).create(
+            task_path=task.module_path,
+            backend=self.alias,
+            queue_name=task.queue_name,
+            priority=task.priority,
+            args=normalize_json(args),
+            kwargs=normalize_json(kwargs),
+            run_after=task.run_after or timezone.now(),
+        )
+        result = row.to_result(task)
+        task_enqueued.send(type(self), task_result=result)
+        return result
+
+    def get_result(self, result_id):
+        try:
+            row = QueuedTask.objects.using(self.using).get(pk=int(result_id), backend=self.alias)
+        except (QueuedTask.DoesNotExist, ValueError):
+            raise TaskResultDoesNotExist(result_id)
+        return row.to_result()
+
+    def retry_delay(self, attempts):
+        """Seconds before attempt number ``attempts + 1``"""
+        return min(self.retry_backoff * 2 ** (attempts - 1), self.retry_backoff_max)
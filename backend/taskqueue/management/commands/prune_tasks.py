@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.tasks import TaskResultStatus
+from django.utils import timezone
+from taskqueue.models import QueuedTask
+
+
+class Command(BaseCommand):
+    help = "Delete finished tasks older than --keep-days"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        deleted, _ = QueuedTask.objects.filter(
+            status__in=[TaskResultStatus.SUCCESSFUL, TaskResultStatus.FAILED],
+            finished_at__lt=timezone.now() - timedelta(days=options["keep_days"]),
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} tasks deleted"))
@@ -0,0 +1,59 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from taskqueue.worker import Worker, run_process
+
+
+class Command(BaseCommand):
+    help = (
+        "Run tasks enqueued on a taskqueue.backends.DatabaseBackend. Each of "
+        "--processes worker processes runs --threads threads that claim due "
+        "tasks with SELECT ... FOR UPDATE SKIP LOCKED. SIGINT/SIGTERM let "
+        "running tasks finish before exiting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", default="default", help="TASKS alias")
+        parser.add_argument("--queue", action="append", dest="queues", help="Repeat for several; default all")
+        parser.add_argument("--processes", type=int, default=1)
+        parser.add_argument("--threads", type=int, default=1)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument("--burst", action="store_true", help="Exit once no task is due")
+
+    def handle(self, *args, **options):
+        worker_options = {
+            "backend": options["backend"],
+            "queues": options["queues"],
+            "threads": options["threads"],
+            "poll_interval": options["poll_interval"],
+            "burst": options["burst"],
+        }
+        if options["processes"] == 1:
+            stop = threading.Event()
+            self.stop_on_signals(stop)
+            Worker(stop=stop, **worker_options).run()
+            return
+
+        # Children must open their own connections
+        connections.close_all()
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        processes = [
+            context.Process(target=run_process, args=(worker_options, stop), name=f"task-worker-{number}")
+            for number in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+        self.stop_on_signals(stop)
+        for process in processes:
+            process.join()
+
+    def stop_on_signals(self, stop):
+        def handler(signum, frame):
+            self.stderr.write("Stopping once running tasks finish")
+            stop.set()
+        signal.signal(signal.SIGINT, handler)
+        signal.signal(signal.SIGTERM, handler)
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_path', models.CharField(max_length=255)),
+                ('backend', models.CharField(max_length=100)),
+                ('queue_name', models.CharField(max_length=100)),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('args', models.JSONField(default=list)),
+                ('kwargs', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('READY', 'Ready'), ('RUNNING', 'Running'), ('FAILED', 'Failed'), ('SUCCESSFUL', 'Successful')], default='READY', max_length=10)),
+                ('run_after', models.DateTimeField()),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_attempted_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('return_value', models.JSONField(blank=True, null=True)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('worker_ids', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'indexes': [models.Index(models.F('backend'), models.F('queue_name'), models.OrderBy(models.F('priority'), descending=True), models.F('run_after'), models.F('id'), condition=models.Q(('status', 'READY')), name='taskqueue_ready_idx'), models.Index(condition=models.Q(('status', 'RUNNING')), fields=['started_at'], name='taskqueue_running_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+from dataclasses import replace
+
+from django.db import models
+from django.tasks import TaskResult, TaskResultStatus
+from django.tasks.base import Task, TaskError
+from django.utils.module_loading import import_string
+
+# Create your models here.
+
+
+class QueuedTask(models.Model):
+    """One enqueued django.tasks Task and its latest result
+
+    Rows are written in the enqueuing transaction, so a task enqueued by a
+    request that rolls back never runs. Workers claim READY rows whose
+    run_after has passed, highest priority first.
+    """
+    task_path = models.CharField(max_length=255)
+    backend = models.CharField(max_length=100)
+    queue_name = models.CharField(max_length=100)
+    priority = models.SmallIntegerField(default=0)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=TaskResultStatus.choices, default=TaskResultStatus.READY)
+    run_after = models.DateTimeField()
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_attempted_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    return_value = models.JSONField(null=True, blank=True)
+    # [{"exception_class_path": ..., "traceback": ...}] per failed attempt
+    errors = models.JSONField(default=list, blank=True)
+    worker_ids = models.JSONField(default=list, blank=True)
+    
+    class Meta:
+        indexes = [
+            # The claim query: next ready task of a queue
+            models.Index(
+                "backend", "queue_name", models.F("priority").desc(), "run_after", "id",
+                condition=models.Q(status="READY"), name="taskqueue_ready_idx",
+            ),
+            # Finding tasks left RUNNING by a worker that died
+            models.Index(
+                fields=["started_at"], condition=models.Q(status="RUNNING"), name="taskqueue_running_idx"
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_path} ({self.status})"
+    
+    @property
+    def task(self):
+        """The Task this row runs, with the options it was enqueued with"""
+        task = import_string(self.task_path)
+        if not isinstance(task, Task):
+            raise TypeError(f"{self.task_path} is not a Task")
+        return replace(
+            task, priority=self.priority, queue_name=self.queue_name,
+            backend=self.backend, run_after=self.run_after,
+        )
+    
+    def to_result(self, task=None):
+        result = TaskResult(
+            task=task or self.task,
+            id=str(self.pk),
+            status=self.status,
+            enqueued_at=self.enqueued_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            last_attempted_at=self.last_attempted_at,
+            args=self.args,
+            kwargs=self.kwargs,
+            backend=self.backend,
+            errors=[TaskError(**error) for error in self.errors],
+            worker_ids=self.worker_ids,
+        )
+        object.__setattr__(result, "_return_value", self.return_value)
+        return result
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.tasks import TaskResultStatus, task, task_backends
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import QueuedTask
+from .worker import claim, execute, requeue_stale
+
+
+@task
+def add(a, b):
+    return a + b
+
+
+@task(priority=5)
+def urgent():
+    return "done"
+
+
+@task
+def flaky():
+    raise RuntimeError("flaky")
+
+
+@override_settings(TASKS={
+    "default": {
+        "BACKEND": "taskqueue.backends.DatabaseBackend",
+        "OPTIONS": {"MAX_ATTEMPTS": 3, "STALE_AFTER": 3600},
+    },
+})
+class WorkerTests(TestCase):
+    def setUp(self):
+        self.backend = task_backends["default"]
+
+    def claim(self, worker_id="worker-1"):
+        return claim(self.backend, ["default"], worker_id)
+
+    def make_due(self, result):
+        QueuedTask.objects.filter(pk=result.id).update(run_after=timezone.now())
+
+    def test_claims_by_priority_then_age(self):
+        first = add.enqueue(1, 2)
+        add.using(run_after=timezone.now() + timedelta(hours=1)).enqueue(3, 4)
+        second = urgent.enqueue()
+
+        self.assertEqual(self.claim().pk, int(second.id))
+        row = self.claim()
+        self.assertEqual(row.pk, int(first.id))
+        self.assertEqual(row.status, TaskResultStatus.RUNNING)
+        self.assertEqual(row.worker_ids, ["worker-1"])
+        # The deferred task isn't due yet
+        self.assertIsNone(self.claim())
+
+    def test_success_is_recorded(self):
+        result = add.enqueue(1, 2)
+        execute(self.backend, self.claim())
+        result.refresh()
+        self.assertEqual(result.status, TaskResultStatus.SUCCESSFUL)
+        self.assertEqual(result.return_value, 3)
+
+    def test_failures_are_retried_then_failed(self):
+        result = flaky.enqueue()
+        for attempt in range(1, self.backend.max_attempts):
+            with self.assertLogs("taskqueue.worker", "WARNING"):
+                execute(self.backend, self.claim())
+            row = QueuedTask.objects.get(pk=result.id)
+            self.assertEqual(row.status, TaskResultStatus.READY)
+            self.assertGreater(row.run_after, timezone.now())
+            self.assertEqual(len(row.errors), attempt)
+            # Not claimable until the backoff has passed
+            self.assertIsNone(self.claim())
+            self.make_due(result)
+
+        with self.assertLogs("taskqueue.worker", "ERROR"):
+            execute(self.backend, self.claim())
+        result.refresh()
+        self.assertEqual(result.status, TaskResultStatus.FAILED)
+        self.assertEqual(len(result.errors), self.backend.max_attempts)
+        self.assertEqual(result.errors[-1].exception_class_path, "builtins.RuntimeError")
+
+    def test_requeued_task_keeps_new_owners_outcome(self):
+        result = add.enqueue(1, 2)
+        stale = self.claim("worker-1")
+        QueuedTask.objects.filter(pk=result.id).update(
+            started_at=timezone.now() - timedelta(seconds=self.backend.stale_after + 1)
+        )
+        self.assertEqual(requeue_stale(self.backend), 1)
+        current = self.claim("worker-2")
+
+        with self.assertLogs("taskqueue.worker", "WARNING") as logs:
+            execute(self.backend, stale)
+        self.assertIn("outcome discarded", logs.output[0])
+        row = QueuedTask.objects.get(pk=result.id)
+        self.assertEqual(row.status, TaskResultStatus.RUNNING)
+        self.assertEqual(row.worker_ids, ["worker-1", "worker-2"])
+
+        execute(self.backend, current)
+        result.refresh()
+        self.assertEqual(result.status, TaskResultStatus.SUCCESSFUL)
@@ -0,0 +1,183 @@
+import logging
+import os
+import signal
+import socket
+import threading
+from datetime import timedelta
+from traceback import format_exception
+
+import django
+from django.apps import apps
+from django.db import DatabaseError, close_old_connections, connections, transaction
+from django.tasks import TaskContext, TaskResultStatus, task_backends
+from django.tasks.signals import task_finished, task_started
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.json import normalize_json
+from .models import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+
+def claim(backend, queues, worker_id):
+    """Mark the next due READY task RUNNING and return it, or None
+
+    FOR UPDATE SKIP LOCKED lets concurrent workers pass over each other's
+    candidates instead of queueing behind them; the status check in the
+    UPDATE keeps databases without it (SQLite) from running a task twice.
+    """
+    now = timezone.now()
+    tasks = QueuedTask.objects.using(backend.using)
+    with transaction.atomic(using=backend.using):
+        row = (
+            tasks.select_for_update(skip_locked=True)
+            .filter(backend=backend.alias, queue_name__in=queues, status=TaskResultStatus.READY, run_after__lte=now)
+            .order_by("-priority", "run_after", "id")
+            .first()
+        )
+        if row is None:
+            return None
+        row.status = TaskResultStatus.RUNNING
+        row.started_at = row.last_attempted_at = now
+        row.worker_ids = [*row.worker_ids, worker_id]
+        claimed = tasks.filter(pk=row.pk, status=TaskResultStatus.READY).update(
+            status=row.status, started_at=now, last_attempted_at=now, worker_ids=row.worker_ids
+        )
+    return row if claimed else None
+
+
+def requeue_stale(backend):
+    """Make tasks RUNNING for longer than STALE_AFTER ready again"""
+    now = timezone.now()
+    return QueuedTask.objects.using(backend.using).filter(
+        backend=backend.alias,
+        status=TaskResultStatus.RUNNING,
+        started_at__lt=now - timedelta(seconds=backend.stale_after),
+    ).update(status=TaskResultStatus.READY, run_after=now)
+
+
+def execute(backend, row):
+    """Run a claimed task and record its outcome
+
+    A failed attempt is retried after an exponential backoff until the
+    backend's MAX_ATTEMPTS runs have been used. Tasks whose function can't
+    be imported fail straight away.
+    """
+    try:
+        task = row.task
+    except (ImportError, TypeError) as e:
+        return fail(backend, row, e, retry=False)
+
+    result = row.to_result(task)
+    task_started.send(type(backend), task_result=result)
+    try:
+        if task.takes_context:
+            value = task.call(TaskContext(task_result=result), *row.args, **row.kwargs)
+        else:
+            value = task.call(*row.args, **row.kwargs)
+        value = normalize_json(value)
+    except Exception as e:
+        return fail(backend, row, e, retry=True)
+
+    row.status = TaskResultStatus.SUCCESSFUL
+    row.finished_at = timezone.now()
+    row.return_value = value
+    if record_outcome(backend, row, ["status", "finished_at", "return_value"]):
+        task_finished.send(type(backend), task_result=row.to_result(task))
+
+
+def record_outcome(backend, row, fields):
+    """Save ``fields`` of a claimed row if this worker still owns it
+
+    requeue_stale may have handed the task to another worker meanwhile.
+    Every claim stamps last_attempted_at, so a RUNNING row still carrying
+    this claim's stamp is this worker's; otherwise the outcome is dropped
+    and the current owner records its own.
+    """
+    owned = QueuedTask.objects.using(backend.using).filter(
+        pk=row.pk, status=TaskResultStatus.RUNNING, last_attempted_at=row.last_attempted_at,
+    ).update(**{field: getattr(row, field) for field in fields})
+    if not owned:
+        logger.warning("Task %s (%s) was requeued while it ran; outcome discarded", row.pk, row.task_path)
+    return bool(owned)
+
+
+def fail(backend, row, error, retry):
+    row.errors = [*row.errors, {
+        "exception_class_path": f"{type(error).__module__}.{type(error).__qualname__}",
+        "traceback": "".join(format_exception(error)),
+    }]
+    attempts = len(row.worker_ids)
+    if retry and attempts < backend.max_attempts:
+        row.status = TaskResultStatus.READY
+        row.run_after = timezone.now() + timedelta(seconds=backend.retry_delay(attempts))
+        logger.warning("Task %s (%s) failed, retrying at %s", row.pk, row.task_path, row.run_after)
+    else:
+        row.status = TaskResultStatus.FAILED
+        row.finished_at = timezone.now()
+        logger.error("Task %s (%s) failed after %s attempts", row.pk, row.task_path, attempts)
+    if not record_outcome(backend, row, ["status", "errors", "run_after", "finished_at"]):
+        return
+    # A task that can't be imported has no TaskResult to send
+    if row.status == TaskResultStatus.FAILED and retry:
+        task_finished.send(type(backend), task_result=row.to_result())
+
+
+class Worker:
+    """Threads claiming and running tasks of one backend until stopped
+
+    ``stop`` is any object with set()/is_set()/wait(), so a
+    multiprocessing.Event can stop several worker processes at once. With
+    ``burst`` a thread exits as soon as it finds no due task.
+    """
+
+    def __init__(self, backend="default", queues=None, threads=1, poll_interval=1.0, burst=False, stop=None):
+        self.backend = task_backends[backend]
+        self.queues = list(queues or self.backend.queues)
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.stop = stop or threading.Event()
+        self.id = f"{socket.gethostname()}-{os.getpid()}-{get_random_string(6)}"
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self.loop, args=(f"{self.id}-{number}",), name=f"task-worker-{number}")
+            for number in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def loop(self, worker_id):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    row = claim(self.backend, self.queues, worker_id)
+                except DatabaseError:
+                    # e.g. a dropped connection; try again after a pause
+                    logger.exception("Claiming a task failed")
+                    self.stop.wait(self.poll_interval)
+                    continue
+                if row is not None:
+                    execute(self.backend, row)
+                    continue
+                if requeue_stale(self.backend):
+                    continue
+                if self.burst:
+                    break
+                self.stop.wait(self.poll_interval)
+        finally:
+            connections.close_all()
+
+
+def run_process(options, stop):
+    """multiprocessing target: one Worker per process, stopped by the parent"""
+    if not apps.ready:
+        django.setup()
+    # The parent turns SIGINT/SIGTERM into ``stop``; tasks in progress finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    Worker(stop=stop, **options).run()
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from config.pagination import ApproximateCountPaginator
 from .models import User, AdminProfile, JobseekerProfile, EmployerProfile
 
 # Register your models here.
@@ -7,8 +8,13 @@ from .models import User, AdminProfile, JobseekerProfile, EmployerProfile
 class UserAdmin(admin.ModelAdmin):
     list_display = ("id","username", "email", "phone_number", "full_name", "role", "slug", "is_active", "is_staff", "is_superuser")
     list_filter = ("is_active", "role", "gender")
-    search_fields = ("username", "phone_number", "is_active", "role", "gender")
+    # Phone numbers are matched exactly in get_search_results
+    search_fields = ("username", "is_active", "role", "gender")
     ordering = ("created_at",)
+    # Planner-estimated counts for large changelists, and no second
+    # unfiltered COUNT(*) for the "N total" link
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     fieldsets = (
         (None, {"fields": ("username", "password")}),
         ("Personal Info", {"fields": ("first_name", "last_name", "slug", "email", "phone_number", "gender", "date_of_birth", "profile_pic")}),
@@ -22,6 +28,14 @@ class UserAdmin(admin.ModelAdmin):
         )
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        # A search that parses as a phone number also probes the E.164
+        # index, in whatever notation it was typed
+        if search_term:
+            results |= queryset.with_phone_number(search_term)
+        return results, may_have_duplicates
+
 
 
 class AdminProfileAdmin(admin.ModelAdmin):
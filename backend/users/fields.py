@@ -0,0 +1,38 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from .validators import PhoneNumberValidator, normalize_phone_number
+
+
+class PhoneNumberField(models.CharField):
+    """A phone number kept as an E.164 string
+
+    Replaces phonenumber_field's field, which imports phonenumbers with
+    users.models and parses the number every time a User is loaded. Values
+    here are plain strings; numbers are checked by the validator and
+    normalized on save, the only points where phonenumbers is imported.
+    """
+    description = _("Phone number")
+
+    def __init__(self, *args, region=None, **kwargs):
+        kwargs.setdefault("max_length", 128)
+        super().__init__(*args, **kwargs)
+        self.region = region
+        self.default_validators = [PhoneNumberValidator(region)]
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.region:
+            kwargs["region"] = self.region
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if value:
+            try:
+                value = normalize_phone_number(value, self.region)
+            except ValidationError:
+                # Stored as given, like before; forms and serializers validate
+                pass
+            setattr(model_instance, self.attname, value)
+        return value
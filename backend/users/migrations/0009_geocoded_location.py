@@ -0,0 +1,83 @@
+# Generated by Django 6.0 on 2026-10-19 09:33
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of locations.geocoding.backfill_places as of this migration
+
+BATCH_SIZE = 2000
+
+
+def normalize_place(text):
+    return ' '.join(re.sub(r'[^\w\s]', ' ', str(text)).split()).casefold()
+
+
+def place_candidates(text):
+    parts = [str(text)] + re.split(r'[,/|()]|\s-\s', str(text))
+    seen = []
+    for part in parts:
+        normalized = normalize_place(part)
+        if normalized and normalized not in seen:
+            seen.append(normalized)
+    return seen
+
+
+def backfill_places(model, alias_model):
+    aliases = {
+        alias: values
+        for alias, *values in alias_model.objects.values_list(
+            'alias', 'location_id', 'location__latitude', 'location__longitude'
+        )
+    }
+    fields = ['place', 'latitude', 'longitude']
+    last_id = 0
+    while True:
+        rows = list(model.objects.filter(pk__gt=last_id).order_by('pk').only('pk', 'location', *fields)[:BATCH_SIZE])
+        if not rows:
+            return
+        last_id = rows[-1].pk
+
+        for row in rows:
+            place = next(
+                (aliases[candidate] for candidate in place_candidates(row.location or '') if candidate in aliases),
+                (None, None, None),
+            )
+            row.place_id, row.latitude, row.longitude = place
+        model.objects.bulk_update(rows, fields)
+
+
+def geocode_locations(apps, schema_editor):
+    backfill_places(apps.get_model('users', 'JobseekerProfile'), apps.get_model('locations', 'LocationAlias'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_load_gazetteer'),
+        ('users', '0008_merge_20260119_1705'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobseekers', to='locations.location'),
+        ),
+        migrations.RunPython(geocode_locations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobseekerprofile',
+            index=models.Index(fields=['latitude', 'longitude'], name='users_jobseeker_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 09:57
+
+import users.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_geocoded_location'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='phone_number',
+            field=users.fields.PhoneNumberField(blank=True, max_length=128, region='PK'),
+        ),
+    ]
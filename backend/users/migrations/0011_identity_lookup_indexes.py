@@ -0,0 +1,85 @@
+# Generated by Django 6.0 on 2026-10-19 10:04
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def normalize_phone_number(value, region):
+    # Frozen copy of users.validators.normalize_phone_number; None when the
+    # number isn't valid
+    import phonenumbers
+
+    try:
+        number = phonenumbers.parse(str(value), region)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def check_identity_conflicts(apps, schema_editor):
+    """Refuse to migrate while emails or usernames collide ignoring case
+
+    The unique indexes below would fail anyway; this names the accounts
+    to merge or rename first.
+    """
+    User = apps.get_model('users', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+    conflicts = []
+    for field in ('email', 'username'):
+        duplicates = (
+            users.values(value=Lower(field))
+            .annotate(count=models.Count('pk'))
+            .filter(count__gt=1)
+            .order_by('value')
+        )
+        for duplicate in duplicates[:50]:
+            ids = users.alias(value=Lower(field)).filter(value=duplicate['value']).values_list('pk', flat=True)
+            conflicts.append(f"  {field} {duplicate['value']!r}: users {', '.join(map(str, ids))}")
+    if conflicts:
+        raise RuntimeError(
+            "Emails/usernames must be unique regardless of case before "
+            "users.0011 can be applied. Conflicting accounts:\n" + "\n".join(conflicts)
+        )
+
+
+def normalize_phone_numbers(apps, schema_editor):
+    # Numbers saved before PhoneNumberField normalized them; invalid ones
+    # are left as they are
+    User = apps.get_model('users', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+    changed = []
+    for user in users.exclude(phone_number='').only('pk', 'phone_number').iterator(chunk_size=2000):
+        phone_number = normalize_phone_number(user.phone_number, 'PK')
+        if phone_number and phone_number != user.phone_number:
+            user.phone_number = phone_number
+            changed.append(user)
+    users.bulk_update(changed, ['phone_number'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0010_phone_number_lazy_field'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_identity_conflicts, migrations.RunPython.noop),
+        # Before the index, so the rewrite doesn't maintain it row by row
+        migrations.RunPython(normalize_phone_numbers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['phone_number'], name='users_user_phone_number_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='users_user_email_ci_uniq', violation_error_message='A user with this email already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('username'), name='users_user_username_ci_uniq', violation_error_message='A user with this username already exists.'),
+        ),
+    ]
@@ -1,14 +1,44 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager, PermissionsMixin
-from phonenumber_field.modelfields import PhoneNumberField
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.text import slugify
-from .validators import validate_file_extension, ValidationError
+from locations.geocoding import apply_geocode
+from locations.models import Location
+from .fields import PhoneNumberField
+from .validators import normalize_phone_number, validate_file_extension, ValidationError
 
 
 # Create your models here.
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    """Identity lookups written to match the User indexes
+
+    Emails and usernames compare as LOWER(column) = lowercased value, the
+    expression of the case-insensitive unique indexes, so each lookup is
+    one index probe on PostgreSQL and SQLite alike.
+    """
+
+    def with_email(self, email):
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
+
+    def with_username(self, username):
+        return self.alias(username_lower=Lower("username")).filter(username_lower=username.lower())
+
+    def with_phone_number(self, phone_number, region="PK"):
+        """Users with this number in any notation; none if it isn't a valid number"""
+        try:
+            phone_number = normalize_phone_number(phone_number, region)
+        except ValidationError:
+            return self.none()
+        return self.filter(phone_number=phone_number)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    def get_by_natural_key(self, email):
+        # authenticate() and createsuperuser look users up through here
+        return self.with_email(email).get()
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValidationError("The Email must be set")
@@ -61,6 +91,24 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"] 
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Unique regardless of case; email also keeps its plain unique
+            # index, which the auth checks require of USERNAME_FIELD
+            models.UniqueConstraint(
+                Lower("email"), name="users_user_email_ci_uniq",
+                violation_error_message="A user with this email already exists.",
+            ),
+            models.UniqueConstraint(
+                Lower("username"), name="users_user_username_ci_uniq",
+                violation_error_message="A user with this username already exists.",
+            ),
+        ]
+        indexes = [
+            # Stored as E.164 by PhoneNumberField
+            models.Index(fields=["phone_number"], name="users_user_phone_number_idx"),
+        ]
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -104,15 +152,32 @@ class JobseekerProfile(models.Model):
     current_company = models.CharField(max_length=100, blank=True)
     expected_salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     location = models.CharField(max_length=50, blank=True)
+    # Geocoded from location on save; see locations.geocoding
+    place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobseekers")
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     education = models.TextField(blank=True)
     linkedin_profile = models.URLField(blank=True)
     github_profile = models.URLField(blank=True)
     is_active = models.BooleanField(default=True)
     profile_completed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="users_jobseeker_lat_lon_idx"),
+        ]
+
     def __str__(self):
         return f"JobSeeker: {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "location" in update_fields:
+            apply_geocode(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "place", "latitude", "longitude"}
+        super().save(*args, **kwargs)
+
 
 class EmployerProfile(models.Model):
     user = models.OneToOneField(User, related_name="employer_profile", on_delete=models.CASCADE)
@@ -4,7 +4,7 @@ from django.core.validators import validate_email
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
 from .models import User, AdminProfile, JobseekerProfile, EmployerProfile
-from .validators import validate_file_extension
+from .validators import normalize_phone_number, validate_file_extension
 
 
 
@@ -37,6 +37,11 @@ class UserSerializer(serializers.ModelSerializer):
             validate_email(value)
         except DjangoValidationError:
             raise serializers.ValidationError("Enter a valid email address.")
+        others = User.objects.with_email(value)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        if others.exists():
+            raise serializers.ValidationError("Email already exists.")
         return value
 
     def validate_date_of_birth(self, value):
@@ -87,10 +92,10 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         if attrs["password"] != attrs["password2"]:
             raise serializers.ValidationError({"password": "Password fields didn't match."})
         
-        if User.objects.filter(username=attrs["username"]).exists():
+        if User.objects.with_username(attrs["username"]).exists():
             raise serializers.ValidationError({"username": "Username already exists."})
         
-        if User.objects.filter(email=attrs["email"]).exists():
+        if User.objects.with_email(attrs["email"]).exists():
             raise serializers.ValidationError({"email": "Email already exists."})
         
         return attrs
@@ -277,6 +282,14 @@ class ProfileUpdateSerializer(serializers.Serializer):
             raise serializers.ValidationError("Date of birth cannot be in the future")
         return value
 
+    def validate_phone_number(self, value):
+        if value:
+            try:
+                return normalize_phone_number(value, "PK")
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(e.messages)
+        return value
+
     def validate_profile_pic(self, value):
         if value:
             try:
@@ -1,5 +1,6 @@
 import os
 from django.core.exceptions import ValidationError
+from django.utils.deconstruct import deconstructible
 from django.utils.translation import gettext_lazy as _
 
 
@@ -29,4 +30,33 @@ def validate_file_size(value):
     extension = os.path.splitext(value.name)[1]
     valid_extensions = ["pdf", ".jpeg", ".png"]
     if not extension.lower() in valid_extensions:
-        raise ValidationError("Unsupported file extension. Only JPG, JPEG, PNG allowed.")
\ No newline at end of file
+        raise ValidationError("Unsupported file extension. Only JPG, JPEG, PNG allowed.")
+
+def normalize_phone_number(value, region=None):
+    """Return ``value`` as an E.164 string, or raise ValidationError
+
+    phonenumbers and its metadata are imported here, on the first number
+    checked, rather than when users.models is imported.
+    """
+    import phonenumbers
+
+    try:
+        number = phonenumbers.parse(str(value), region)
+    except phonenumbers.NumberParseException:
+        number = None
+    if number is None or not phonenumbers.is_valid_number(number):
+        raise ValidationError(_("Enter a valid phone number."), code="invalid_phone_number")
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+@deconstructible
+class PhoneNumberValidator:
+    def __init__(self, region=None):
+        self.region = region
+
+    def __call__(self, value):
+        if value:
+            normalize_phone_number(value, self.region)
+
+    def __eq__(self, other):
+        return isinstance(other, PhoneNumberValidator) and self.region == other.region
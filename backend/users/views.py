@@ -4,6 +4,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate 
+from config.query_instrumentation import QueryInstrumentationMixin
 from .renderers import UserRenderer
 from .models import User, AdminProfile, JobseekerProfile, EmployerProfile
 from .serializers import (
@@ -69,17 +70,9 @@ class LoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            return Response(
-                {"detail": "Invalid email or password"},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        
-        
+        # One lookup: ModelBackend finds the user through the case-insensitive
+        # email index (UserManager.get_by_natural_key)
         user = authenticate(request, email=email, password=password)
-        token = get_tokens_for_user(user)
         
         if not user:
             return Response(
@@ -94,6 +87,8 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        token = get_tokens_for_user(user)
+
         # role based redirect
         if user.role == "admin":
             redirect_to = "/admin/dashboard"
@@ -161,7 +156,7 @@ def get_profile_and_serializer(user):
             )
         return None, None
 
-class UserProfileView(APIView):
+class UserProfileView(QueryInstrumentationMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     renderer_classes = [UserRenderer]
     
@@ -196,7 +191,7 @@ class UserProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProfileUpdateView(APIView):
+class ProfileUpdateView(QueryInstrumentationMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     renderer_classes = [UserRenderer]
     